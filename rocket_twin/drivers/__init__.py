@@ -1,5 +1,15 @@
+from rocket_twin.drivers.compiled_station import CompiledStation, StationModel
 from rocket_twin.drivers.fueling_rocket import FuelingRocket
 from rocket_twin.drivers.mission import Mission
+from rocket_twin.drivers.station_ensemble import EnsembleModel, StationEnsemble
 from rocket_twin.drivers.vertical_flying_rocket import VerticalFlyingRocket
 
-__all__ = ["FuelingRocket", "VerticalFlyingRocket", "Mission"]
+__all__ = [
+    "FuelingRocket",
+    "VerticalFlyingRocket",
+    "Mission",
+    "CompiledStation",
+    "StationModel",
+    "StationEnsemble",
+    "EnsembleModel",
+]
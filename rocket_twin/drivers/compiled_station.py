@@ -0,0 +1,632 @@
+import ast
+import builtins
+from fnmatch import fnmatchcase
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import Driver
+from cosapp.multimode.zeroCrossing import EventDirection, ZeroCrossing
+from cosapp.systems import System
+
+from rocket_twin.utils import environment_table, gravity
+
+
+class _VariableAccess(ast.NodeTransformer):
+    """Rewriting of the station variables of an expression as items of the mapping `v`.
+
+    The other names, except numpy as `np` and the built-ins, are gathered as unknown.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.unknown = set()
+
+    def visit_Name(self, node):
+        return self.access(node)
+
+    def visit_Attribute(self, node):
+        return self.access(node)
+
+    def access(self, node):
+        parts, base = [], node
+        while isinstance(base, ast.Attribute):
+            parts.append(base.attr)
+            base = base.value
+        if isinstance(base, ast.Name):
+            name = ".".join([base.id] + parts[::-1])
+            if name in self.names:
+                return ast.Subscript(
+                    value=ast.Name(id="v", ctx=ast.Load()),
+                    slice=ast.Constant(value=name),
+                    ctx=node.ctx,
+                )
+            if base.id != "np" and not hasattr(builtins, base.id):
+                self.unknown.add(base.id)
+        return self.generic_visit(node)
+
+
+class StationModel:
+    """Flattened model of the fueling and vertical flight of a station.
+
+    The transients of the station tree are gathered in a single state vector
+    [g_tank weight, stage weights, v, altitude], and the algebraic chain from the tanks to
+    the rocket acceleration is evaluated in closed form. The discrete state of the
+    controllers is held as plain attributes, updated by the transitions of the events.
+
+    The parameters are read from the station, which must have been evaluated. The structure
+    mass of each stage is taken as its current mass minus its propellant weight, the mass of
+    the stages being linear in their propellant weight in every geometry mode. The model
+    covers the vertical dynamics only, and is checked against the values of the station
+    when it is built.
+
+    The state is indexed along its last axis, so that the evaluations also apply to the
+    stacked members of an ensemble.
+
+    Inputs
+    ------
+    station: Station,
+        the evaluated station
+
+    Outputs
+    ------
+    y: numpy.ndarray,
+        state vector of the station
+    """
+
+    def __init__(self, station):
+        rocket = station.rocket
+        if "body" in rocket.children:
+            raise ValueError("The rigid-body dynamics are not covered by the model")
+        stages = [rocket[f"stage_{i}"] for i in range(1, station.n_stages + 1)]
+
+        self.n_stages = station.n_stages
+        self.names = {
+            "full": [stage.controller.full.contextual_name for stage in stages],
+            "launch": station.launch.contextual_name,
+            "drop": rocket.controller.drop.contextual_name,
+            "stop": f"{station.name}.stop",
+        }
+
+        # Parameters
+        self.w_in_g = station.g_tank.w_in
+        self.w_out_max_g = station.g_tank.fuel.w_out_max
+        self.weight_max_g = station.g_tank.weight_max
+        self.w_out_max = np.array([stage.tank.fuel.w_out_max for stage in stages])
+        self.weight_max = np.array([stage.tank.weight_max for stage in stages])
+        self.isp = np.array([stage.engine.perfo.isp for stage in stages])
+        self.g_0 = np.array([stage.engine.perfo.g_0 for stage in stages])
+        self.area_exit = np.array([stage.engine.perfo.area_exit for stage in stages])
+        self.dry = np.array([float(stage.props.mass) - stage.weight_prop for stage in stages])
+        self.time_int = station.time_int
+
+        self.environment = "env" in rocket.children
+        self.g = rocket.dyn.g
+        self.p_amb = np.array([stage.p_amb for stage in stages])
+
+        # Discrete state
+        self.fueling = bool(station.fueling)
+        self.fill_stage = station.stage
+        self.pipe = station.piped_stage()
+        self.time_lnc = station.time_lnc
+        self.flying = bool(rocket.flying)
+        self.stage = rocket.controller.stage
+        self.dropped = np.arange(1, self.n_stages + 1) < rocket.stage
+        self.is_on = np.array(
+            [bool(rocket.controller[f"is_on_{i}"]) for i in range(1, self.n_stages + 1)]
+        )
+        self.w_in = np.array([stage.w_in for stage in stages])
+        self.update()
+
+        self.y = np.array(
+            [station.g_tank.fuel.weight_p]
+            + [stage.tank.fuel.weight_p for stage in stages]
+            + [rocket.v, rocket.altitude],
+            dtype=float,
+        )
+        self.check(station)
+
+    def check(self, station):
+        """Check that the model gives the values of the station in its current state.
+
+        Inputs
+        ------
+        station: Station,
+            the evaluated station the model is built from
+        """
+        differences = []
+        for name, value in self.variables(station.time, self.y).items():
+            try:
+                expected = station[name]
+            except (AttributeError, KeyError):
+                continue
+            if not np.allclose(value, expected, rtol=1e-9, atol=1e-9):
+                differences.append(f"{name} = {value} instead of {expected}")
+        if differences:
+            raise ValueError(f"The model differs from the station: {', '.join(differences)}")
+
+    def update(self):
+        """Evaluate the flows, which only change with the discrete state."""
+        self.w_out_g = self.w_out_max_g * self.fueling
+        self.w_in[self.pipe - 1] = self.w_out_g
+        # A dropped stage is disconnected from the controller, and keeps its last command
+        self.w_out = self.w_out_max * (self.is_on | self.dropped)
+
+    def derivative(self, t, y):
+        """Time derivative of the state vector.
+
+        Inputs
+        ------
+        t [s]: float,
+            time
+        y: numpy.ndarray,
+            state vector
+
+        Outputs
+        ------
+        dy: numpy.ndarray,
+            time derivative of the state vector
+        """
+        dy = np.empty_like(y)
+        dy[..., 0] = self.w_in_g - self.w_out_g
+        dy[..., 1:-2] = self.w_in - self.w_out
+        dy[..., -2] = self.acceleration(y)[0]
+        dy[..., -1] = y[..., -2]
+        return dy
+
+    def acceleration(self, y):
+        """Acceleration of the rocket, with the total force and weight.
+
+        Inputs
+        ------
+        y: numpy.ndarray,
+            state vector
+
+        Outputs
+        ------
+        a [m/s**2]: float,
+            acceleration, zero on ground
+        force [N]: float,
+            total force
+        weight [kg]: float,
+            total weight
+        thrust [N]: numpy.ndarray,
+            thrust force of each stage, including the dropped ones
+        """
+        if self.environment:
+            g = -gravity(y[..., -1])
+            p_amb = environment_table(y[..., -1])[..., 1, None]
+        else:
+            g, p_amb = self.g, self.p_amb
+
+        thrust = self.isp * self.w_out * self.g_0 - np.where(
+            self.w_out > 0.0, p_amb * self.area_exit, 0.0
+        )
+        weight = np.sum(np.where(self.dropped, 0.0, self.dry + y[..., 1:-2]), axis=-1)
+        force = np.sum(np.where(self.dropped, 0.0, thrust), axis=-1) + weight * g
+        return force / weight * self.flying, force, weight, thrust
+
+    def variables(self, t, y):
+        """Values of the station variables covered by the model.
+
+        Inputs
+        ------
+        t [s]: float,
+            time
+        y: numpy.ndarray,
+            state vector
+
+        Outputs
+        ------
+        variables: dict[str, float],
+            values of the variables, keyed by their path in the station
+        """
+        a, force, weight, thrust = self.acceleration(y)
+        variables = {
+            "t": t,
+            "time": t,
+            "fueling": self.fueling,
+            "stage": self.fill_stage,
+            "time_lnc": self.time_lnc,
+            "g_tank.weight_prop": y[..., 0],
+            "g_tank.fuel.weight_p": y[..., 0],
+            "g_tank.weight_max": self.weight_max_g,
+            "g_tank.w_out": self.w_out_g,
+            "pipe.w_out": self.w_out_g,
+            "rocket.flying": self.flying,
+            "rocket.stage": self.stage,
+            "rocket.v": y[..., -2],
+            "rocket.altitude": y[..., -1],
+            "rocket.a": a,
+            "rocket.dyn.force": force,
+            "rocket.dyn.weight": weight,
+            "rocket.geom.weight": weight,
+        }
+        for i in range(1, self.n_stages + 1):
+            weight_prop = y[..., i]
+            for name in (
+                f"rocket.weight_prop_{i}",
+                f"rocket.stage_{i}.weight_prop",
+                f"rocket.stage_{i}.tank.weight_prop",
+                f"rocket.stage_{i}.tank.fuel.weight_p",
+            ):
+                variables[name] = weight_prop
+            variables[f"rocket.w_in_{i}"] = self.w_in[..., i - 1]
+            variables[f"rocket.stage_{i}.tank.w_in"] = self.w_in[..., i - 1]
+            variables[f"rocket.stage_{i}.tank.w_out"] = self.w_out[..., i - 1]
+            variables[f"rocket.stage_{i}.tank.weight_max"] = self.weight_max[..., i - 1]
+            variables[f"rocket.stage_{i}.thrust"] = thrust[..., i - 1]
+            variables[f"rocket.controller.is_on_{i}"] = self.is_on[..., i - 1]
+        return variables
+
+    def recorded(self, includes):
+        """Names of the variables matching the patterns of a recorder.
+
+        Inputs
+        ------
+        includes: list[str],
+            patterns of the recorded variables, all the variables if None
+
+        Outputs
+        ------
+        names: list[str],
+            sorted names of the recorded variables, including the time
+        """
+        names = set(self.variables(0.0, self.y)) - {"t"}
+        if includes is not None:
+            names = {"time"} | {
+                name for name in names if any(fnmatchcase(name, pattern) for pattern in includes)
+            }
+        return sorted(names)
+
+    def expression(self, expression):
+        """Compile an expression of the station variables.
+
+        Inputs
+        ------
+        expression: string,
+            expression in the syntax of the CoSApp evaluable strings
+
+        Outputs
+        ------
+        code: code,
+            compiled expression, to be evaluated by `evaluate`
+        """
+        access = _VariableAccess(self.variables(0.0, self.y))
+        tree = access.visit(ast.parse(expression, mode="eval"))
+        if access.unknown:
+            raise ValueError(f"Expression {expression!r} is not covered by the model")
+        return compile(ast.fix_missing_locations(tree), expression, "eval")
+
+    def evaluate(self, code, t, y):
+        """Evaluate a compiled expression of the station variables.
+
+        Inputs
+        ------
+        code: code,
+            expression compiled by `expression`
+        t [s]: float,
+            time
+        y: numpy.ndarray,
+            state vector
+
+        Outputs
+        ------
+        value: float,
+            value of the expression
+        """
+        return eval(code, {"np": np, "v": self.variables(t, y)})
+
+    def events(self, t, y):
+        """Values of the zero-crossing functions of the primitive events.
+
+        Inputs
+        ------
+        t [s]: float,
+            time
+        y: numpy.ndarray,
+            state vector
+
+        Outputs
+        ------
+        values: numpy.ndarray,
+            values of the stage full events, of the launch and of the stage drop
+        """
+        launch = np.expand_dims(t - self.time_lnc, -1)
+        drop = np.take_along_axis(y, np.expand_dims(self.stage, -1), -1)
+        return np.concatenate([y[..., 1:-2] - self.weight_max, launch, drop], axis=-1)
+
+    def transition(self, event, t):
+        """Apply the transition of an event to the discrete state.
+
+        Inputs
+        ------
+        event: int,
+            index of the event in the values returned by `events`
+        t [s]: float,
+            event time
+        """
+        if event < self.n_stages:
+            if self.fill_stage < self.n_stages:
+                self.w_in[self.fill_stage - 1] = 0.0
+                self.fill_stage += 1
+                self.pipe = self.fill_stage
+            else:
+                self.time_lnc = t + self.time_int
+                self.fueling = False
+                self.fill_stage = 1
+        elif event == self.n_stages:
+            self.flying = True
+            self.is_on[0] = True
+        else:
+            self.is_on[self.stage - 1] = False
+            if self.stage < self.n_stages:
+                self.dropped[self.stage - 1] = True
+                self.stage += 1
+                self.is_on[self.stage - 1] = True
+        self.update()
+
+    def event_name(self, event):
+        """Contextual name of an event, as recorded by CoSApp."""
+        if event < self.n_stages:
+            return self.names["full"][event]
+        return self.names["launch" if event == self.n_stages else "drop"]
+
+
+class CompiledStation(Driver):
+    """Driver that simulates a station mission on its flattened model.
+
+    The station is compiled into a `StationModel` at the start of the run, integrated with
+    a fourth-order Runge-Kutta scheme whose events are located by bisection on the cubic
+    interpolation of each step, and the final state is written back into the station. The
+    recorded variables are returned in the format of the CoSApp recorders.
+
+    Inputs
+    ------
+    name: string,
+        the name of the driver
+    owner: System,
+        the station that owns the driver
+    init: dict,
+        initial values of the station variables, set before the compilation
+    stop: string,
+        stop condition, in terms of the variables covered by the model
+    dt [s]: float,
+        integration time step and recording period
+    includes: list[str],
+        recorded variables, all the variables of the model if None
+
+    Outputs
+    ------
+    """
+
+    def __init__(
+        self,
+        name: str,
+        owner: Optional["System"] = None,
+        init: Optional[dict] = None,
+        stop: Optional[str] = None,
+        dt: float = 0.1,
+        includes: Optional[list[str]] = None,
+        **kwargs,
+    ):
+        super().__init__(name, owner, **kwargs)
+        self.init = init or {}
+        self.stop = None if stop is None else ZeroCrossing.from_comparison(stop)
+        self.dt = dt
+        self.includes = includes
+        self.time_interval = (self.owner.time, 1000000.0)
+        self.model = None
+        self._data = None
+
+    def compute(self):
+        station = self.owner
+        for key, value in self.init.items():
+            station[key] = value
+        station.run_once()
+
+        self.model = model = StationModel(station)
+        t0, t_end = self.time_interval[0], self.time_interval[1]
+
+        events = [model.events]
+        directions = [EventDirection.UPDOWN] * (model.n_stages + 2)
+        if self.stop is not None:
+            stop = model.expression(self.stop.expression)
+            events.append(lambda t, y: np.array([model.evaluate(stop, t, y)]))
+            directions.append(self.stop.direction)
+
+        def values(t, y):
+            return np.concatenate([function(t, y) for function in events])
+
+        names = model.recorded(self.includes)
+        rows = []
+
+        def record(t, y, reference=None):
+            variables = model.variables(t, y)
+            rows.append(
+                ["", "", "0", reference or f"t={float(t):.14}"]
+                + [variables[name] for name in names]
+            )
+
+        t, y = t0, model.y
+        prev = values(t, y)
+        # As in CoSApp, an event stays locked after its occurrence until its value changes; the
+        # events whose value is zero at the start are locked as if they had just occurred
+        locked = prev == 0.0
+        history = []
+        n_record = 0
+        record(t, y)
+
+        while t < t_end - 1e-3 * self.dt:
+            t_next = min(t0 + (n_record + 1) * self.dt, t_end)
+            h = t_next - t
+            dy0 = model.derivative(t, y)
+            y_next = self.step(t, y, dy0, h)
+            curr = values(t_next, y_next)
+
+            triggered = [
+                i
+                for i, direction in enumerate(directions)
+                if not locked[i] and direction.zero_detected(prev[i], curr[i])
+            ]
+            if not triggered:
+                locked &= curr == prev
+                t, y, prev = t_next, y_next, curr
+                n_record += 1
+                record(t, y)
+                continue
+
+            # Locate the first event on the cubic interpolation of the step
+            dy1 = model.derivative(t_next, y_next)
+
+            def interpolate(t_int):
+                return self.hermite(t, h, y, dy0, y_next, dy1, t_int)
+
+            roots = {
+                i: float(
+                    self.locate(
+                        lambda t_int: values(t_int, interpolate(t_int))[i],
+                        t,
+                        t_next,
+                        prev[i],
+                        curr[i],
+                    )
+                )
+                for i in triggered
+            }
+            t_event = min(roots.values())
+            # Events located at the same time occur together
+            occurred = sorted(i for i, root in roots.items() if root - t_event <= 1e-10 * h)
+
+            t, y = t_event, interpolate(t_event)
+            record(t, y)
+            final = occurred[-1] >= model.n_stages + 2
+            for event in occurred[:-1] if final else occurred:
+                model.transition(event, t)
+                history.append(event)
+            if final:
+                record(t, y, model.names["stop"])
+                break
+            record(t, y, ", ".join(model.event_name(event) for event in occurred))
+            curr = values(t, y)
+            locked &= curr == prev
+            locked[occurred] = True
+            prev = curr
+            if t == t_next:
+                n_record += 1
+                record(t, y)
+
+        model.y = y
+        self.write_back(t, history)
+        self._data = pd.DataFrame(
+            rows, columns=["Section", "Status", "Error code", "Reference"] + names
+        )
+
+    def step(self, t, y, dy, h):
+        """Fourth-order Runge-Kutta step of the model.
+
+        Inputs
+        ------
+        t [s]: float,
+            time at the start of the step
+        y: numpy.ndarray,
+            state vector at the start of the step
+        dy: numpy.ndarray,
+            derivative of the state vector at the start of the step
+        h [s]: float,
+            time step
+
+        Outputs
+        ------
+        y: numpy.ndarray,
+            state vector at the end of the step
+        """
+        derivative = self.model.derivative
+        k2 = derivative(t + h / 2, y + h / 2 * dy)
+        k3 = derivative(t + h / 2, y + h / 2 * k2)
+        k4 = derivative(t + h, y + h * k3)
+        return y + h / 6 * (dy + 2 * k2 + 2 * k3 + k4)
+
+    @staticmethod
+    def locate(function, a, b, fa, fb):
+        """Locate zero-crossings by bisection, refined by a final secant step.
+
+        Inputs
+        ------
+        function: callable,
+            function of the time, returning one value or the values of several functions
+        a, b [s]: float or numpy.ndarray,
+            bounds of the intervals bracketing the zero-crossings
+        fa, fb: float or numpy.ndarray,
+            values of the functions at the bounds
+
+        Outputs
+        ------
+        t [s]: float or numpy.ndarray,
+            times of the zero-crossings
+        """
+        tol = 1e-6 * (b - a)
+        for _ in range(64):
+            if np.all(b - a <= tol):
+                break
+            t = 0.5 * (a + b)
+            ft = function(t)
+            left = fa * ft <= 0.0
+            a, fa = np.where(left, a, t), np.where(left, fa, ft)
+            b, fb = np.where(left, t, b), np.where(left, ft, fb)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip(np.where(fb == 0.0, b, a - fa * (b - a) / (fb - fa)), a, b)
+
+        # Crossings within the rounding of the bounds, usually the recording times, occur at them
+        eps = 4 * np.finfo(float).eps
+        t = np.where(t - a <= eps * np.abs(a), a, t)
+        return np.where(b - t <= eps * np.abs(b), b, t)
+
+    @staticmethod
+    def hermite(t0, h, y0, dy0, y1, dy1, t):
+        """Cubic interpolation of a step from the values and derivatives at its ends."""
+        s = (t - t0) / h
+        h00 = (1 + 2 * s) * (1 - s) ** 2
+        h10 = s * (1 - s) ** 2
+        h01 = s**2 * (3 - 2 * s)
+        h11 = s**2 * (s - 1)
+        return h00 * y0 + h10 * h * dy0 + h01 * y1 + h11 * h * dy1
+
+    def write_back(self, t, history):
+        """Write the state of the model back into the station.
+
+        The transitions are replayed on the station, so that its structure follows the
+        events, then the transients and the discrete variables are set from the model.
+
+        Inputs
+        ------
+        t [s]: float,
+            final time
+        history: list[int],
+            indices of the events that occurred, in order
+        """
+        station, model = self.owner, self.model
+        rocket = station.rocket
+        UniversalClock().time = t
+
+        for event in history:
+            if event < model.n_stages:
+                station.end_stage_fueling()
+            elif event == model.n_stages:
+                station.launch_rocket()
+            else:
+                rocket.controller.next_stage()
+                rocket.drop_stage()
+
+        station.time_lnc = model.time_lnc
+        station.g_tank.fuel.weight_p = model.y[0]
+        for i in range(1, model.n_stages + 1):
+            rocket[f"stage_{i}"].tank.fuel.weight_p = model.y[i]
+        rocket.v, rocket.altitude = model.y[-2], model.y[-1]
+        station.run_once()
+
+    @property
+    def data(self):
+        return self._data
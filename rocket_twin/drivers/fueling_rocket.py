@@ -1,9 +1,17 @@
 from typing import Optional
 
-from cosapp.drivers import Driver, NonLinearSolver, RungeKutta
-from cosapp.recorders import DataFrameRecorder
+import numpy as np
+from cosapp.drivers import Driver, RungeKutta
 from cosapp.systems import System
 
+from rocket_twin.utils import (
+    ArrayRecorder,
+    DormandPrince,
+    LazySolver,
+    ParquetRecorder,
+    RecordingPolicy,
+)
+
 
 class FuelingRocket(Driver):
     """Driver that simulates the fueling of a rocket.
@@ -15,9 +23,20 @@ class FuelingRocket(Driver):
     w_out [kg/s]: float,
         mass flow of fuel exiting the ground tank
     dt [s]: float,
-        integration time step
+        integration time step, or recording period and first trial step of the adaptive scheme
     owner: System,
         the system that owns the driver
+    adaptive: boolean,
+        whether the time step is controlled by the Dormand-Prince error estimate
+    rtol, atol: float,
+        relative and absolute tolerances of the adaptive scheme
+    dt_min, dt_max [s]: float,
+        bounds of the adaptive time step
+    path: string,
+        directory where the records are streamed to Parquet files, or None to keep them in
+        memory
+    policy: RecordingPolicy,
+        policy selecting the periodic records kept, all of them if None
 
     Outputs
     ------
@@ -31,20 +50,35 @@ class FuelingRocket(Driver):
         stop: Optional[str] = None,
         dt: Optional[float] = 0.1,
         includes: Optional[list[str]] = None,
+        adaptive: bool = False,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        dt_min: float = 0.0,
+        dt_max: float = np.inf,
+        path: Optional[str] = None,
+        policy: Optional[RecordingPolicy] = None,
         **kwargs
     ):
         super().__init__(name, owner, **kwargs)
 
         # Fueling:
-        self.rk = self.add_driver(RungeKutta("rk", owner=owner, order=4, dt=dt))
+        if adaptive:
+            self.rk = self.add_driver(
+                DormandPrince(
+                    "rk", owner=owner, dt=dt, rtol=rtol, atol=atol, dt_min=dt_min, dt_max=dt_max
+                )
+            )
+        else:
+            self.rk = self.add_driver(RungeKutta("rk", owner=owner, order=4, dt=dt))
         self.rk.time_interval = (self.owner.time, 1000000.0)
-        self.solver = self.rk.add_child(NonLinearSolver("solver"))
+        self.solver = self.rk.add_child(LazySolver("solver"))
 
         self.rk.set_scenario(init=init, stop=stop)
-        self.rk.add_recorder(
-            DataFrameRecorder(includes=includes, hold=True),
-            period=dt,
-        )
+        if path is None:
+            recorder = ArrayRecorder(includes=includes, hold=True, policy=policy)
+        else:
+            recorder = ParquetRecorder(path, includes=includes, hold=True, policy=policy)
+        self.rk.add_recorder(recorder, period=dt)
 
     @property
     def data(self):
@@ -1,3 +1,4 @@
+import os
 from typing import Optional
 
 import pandas as pd
@@ -6,6 +7,7 @@ from cosapp.systems import System
 
 from rocket_twin.drivers.fueling_rocket import FuelingRocket
 from rocket_twin.drivers.vertical_flying_rocket import VerticalFlyingRocket
+from rocket_twin.utils import ParquetRecorder, RecordingPolicy, Trajectory
 
 
 class Mission(Driver):
@@ -20,9 +22,17 @@ class Mission(Driver):
     w_out [kg/s]: float,
         mass flow of fuel exiting the rocket tank during flight
     dt [s]: float,
-        integration time step
+        integration time step, or recording period and first trial step of the adaptive scheme
+    adaptive: boolean,
+        whether the time step is controlled by the Dormand-Prince error estimate, the events
+        being located within the steps
     owner: System,
         the system that owns the driver
+    path: string,
+        directory where the records of each phase are streamed to Parquet files, or None to
+        keep them in memory
+    policy: RecordingPolicy,
+        policy selecting the periodic records kept in both phases, all of them if None
 
     Outputs
     ------
@@ -36,6 +46,9 @@ class Mission(Driver):
         stop: Optional[str] = None,
         dt: Optional[float] = 0.1,
         includes: Optional[list[str]] = None,
+        adaptive: bool = False,
+        path: Optional[str] = None,
+        policy: Optional[RecordingPolicy] = None,
         **kwargs
     ):
         super().__init__(name, owner, **kwargs)
@@ -53,20 +66,39 @@ class Mission(Driver):
         # Fueling
         self.add_child(
             FuelingRocket(
-                "fr", owner=owner, init=init_fuel, stop=stop_fuel, includes=includes, dt=dt
+                "fr",
+                owner=owner,
+                init=init_fuel,
+                stop=stop_fuel,
+                includes=includes,
+                dt=dt,
+                adaptive=adaptive,
+                path=None if path is None else os.path.join(path, "fr"),
+                policy=policy,
             )
         )
 
         # Flying
         self.add_child(
             VerticalFlyingRocket(
-                "vfr", owner=owner, init=init_flight, stop=stop_flight, includes=includes, dt=dt
+                "vfr",
+                owner=owner,
+                init=init_flight,
+                stop=stop_flight,
+                includes=includes,
+                dt=dt,
+                adaptive=adaptive,
+                path=None if path is None else os.path.join(path, "vfr"),
+                policy=policy,
             )
         )
 
     @property
     def data(self):
-        data = None
-        for child in self.children.values():
-            data = pd.concat([data, child.rk.recorder.export_data()], ignore_index=True)
-        return data
+        """Records of the phases, lazily read from their files when they are streamed."""
+        recorders = [child.rk.recorder for child in self.children.values()]
+        if all(isinstance(recorder, ParquetRecorder) for recorder in recorders):
+            return Trajectory(
+                [file for recorder in recorders for file in recorder.trajectory().files]
+            )
+        return pd.concat([recorder.export_data() for recorder in recorders], ignore_index=True)
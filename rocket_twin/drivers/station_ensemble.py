@@ -0,0 +1,439 @@
+import copy
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from cosapp.drivers import Driver
+from cosapp.multimode.zeroCrossing import EventDirection, ZeroCrossing
+from cosapp.systems import System
+
+from rocket_twin.drivers.compiled_station import CompiledStation, StationModel
+
+
+class EnsembleModel(StationModel):
+    """Flattened model of several members of a station, integrated together.
+
+    The parameters and the discrete state of the members are stacked along a first axis, the
+    state being a 2-D array (members x states). The transitions apply to a set of members at
+    once.
+
+    Inputs
+    ------
+    models: list[StationModel],
+        models of the members, with the same number of stages and the same environment
+
+    Outputs
+    ------
+    y: numpy.ndarray,
+        state of the members
+    """
+
+    # Attributes common to all members
+    shared = ("n_stages", "names", "environment")
+
+    # Station variables held by the model, with their attribute and column
+    parameters = {
+        "time_int": ("time_int", None),
+        "g_tank.w_in": ("w_in_g", None),
+        "g_tank.fuel.w_out_max": ("w_out_max_g", None),
+        "g_tank.fuel.weight_p": ("y", 0),
+    }
+    stage_parameters = {
+        "tank.fuel.w_out_max": "w_out_max",
+        "tank.fuel.weight_p": "y",
+        "engine.perfo.isp": "isp",
+        "engine.perfo.g_0": "g_0",
+        "engine.perfo.area_exit": "area_exit",
+    }
+
+    def __init__(self, models):
+        for name, value in vars(models[0]).items():
+            if name not in self.shared:
+                value = np.array([getattr(model, name) for model in models])
+            setattr(self, name, value)
+
+    def __len__(self):
+        return len(self.y)
+
+    def subset(self, members):
+        """Model of a subset of the members.
+
+        Inputs
+        ------
+        members: numpy.ndarray,
+            indices or mask of the members
+
+        Outputs
+        ------
+        model: EnsembleModel,
+            independent model of the members
+        """
+        model = copy.copy(self)
+        for name, value in vars(self).items():
+            if name not in self.shared:
+                setattr(model, name, value[members])
+        return model
+
+    def column(self, path):
+        """Attribute and column of the model holding a station variable.
+
+        Inputs
+        ------
+        path: string,
+            path of the variable in the station
+
+        Outputs
+        ------
+        location: tuple[str, int],
+            name of the attribute and column of the variable, None if the variable is not
+            held by the model
+        """
+        match = re.fullmatch(r"rocket\.stage_(\d+)\.(.+)", path)
+        if match and match.group(2) in self.stage_parameters:
+            name, stage = self.stage_parameters[match.group(2)], int(match.group(1))
+            return name, stage if name == "y" else stage - 1
+        return self.parameters.get(path)
+
+    def set(self, path, values):
+        """Set a station variable held by the model for all members.
+
+        Inputs
+        ------
+        path: string,
+            path of the variable in the station
+        values: numpy.ndarray,
+            values of the members
+        """
+        name, column = self.column(path)
+        array = getattr(self, name)
+        if column is None:
+            array[:] = values
+        else:
+            array[:, column] = values
+        self.update()
+
+    def update(self):
+        self.w_out_g = self.w_out_max_g * self.fueling
+        self.w_in[np.arange(len(self.w_in)), self.pipe - 1] = self.w_out_g
+        # A dropped stage is disconnected from the controller, and keeps its last command
+        self.w_out = self.w_out_max * (self.is_on | self.dropped)
+
+    def transition(self, event, t, members):
+        """Apply the transition of an event to the discrete state of some members.
+
+        Inputs
+        ------
+        event: int,
+            index of the event in the values returned by `events`
+        t [s]: numpy.ndarray,
+            event time of each member
+        members: numpy.ndarray,
+            indices of the members
+        """
+        n_stages = self.n_stages
+        if event < n_stages:
+            last = self.fill_stage[members] == n_stages
+            filling, ending = members[~last], members[last]
+            self.w_in[filling, self.fill_stage[filling] - 1] = 0.0
+            self.fill_stage[filling] += 1
+            self.pipe[filling] = self.fill_stage[filling]
+            self.time_lnc[ending] = t[last] + self.time_int[ending]
+            self.fueling[ending] = False
+            self.fill_stage[ending] = 1
+        elif event == n_stages:
+            self.flying[members] = True
+            self.is_on[members, 0] = True
+        else:
+            self.is_on[members, self.stage[members] - 1] = False
+            dropping = members[self.stage[members] < n_stages]
+            self.dropped[dropping, self.stage[dropping] - 1] = True
+            self.stage[dropping] += 1
+            self.is_on[dropping, self.stage[dropping] - 1] = True
+        self.update()
+
+
+class StationEnsemble(Driver):
+    """Driver that simulates a station mission for many sets of parameters at once.
+
+    Each member of the ensemble is a copy of the station with its own parameters. The
+    members are compiled into an `EnsembleModel` and integrated together by a fourth-order
+    Runge-Kutta scheme, all the members sharing the recording grid. Their events are located
+    by bisection on the cubic interpolation of the step, for all the members of a step at
+    once, and the members which reach the stop condition are masked out.
+
+    The parameters held by the model, such as the specific impulses, the mass flows or the
+    initial propellant weights, are set directly in the stacked arrays. The other ones, such
+    as tank dimensions or densities, are set in the station, which is evaluated once per
+    distinct set of values. The station is left unchanged.
+
+    Inputs
+    ------
+    name: string,
+        the name of the driver
+    owner: System,
+        the station that owns the driver
+    parameters: dict[str, numpy.ndarray],
+        values of the station variables for each member, a DataFrame with one column per
+        variable being accepted as well
+    init: dict,
+        initial values of the station variables, common to all members
+    stop: string,
+        stop condition, in terms of the variables covered by the model
+    dt [s]: float,
+        integration time step and recording period
+    includes: list[str],
+        recorded variables, all the variables of the model if None
+
+    Outputs
+    ------
+    results: dict[str, numpy.ndarray],
+        recorded columns, sorted by member: member index, event name or empty string for the
+        samples of the recording grid, time and recorded variables
+    stopped: numpy.ndarray,
+        whether each member reached the stop condition
+    """
+
+    def __init__(
+        self,
+        name: str,
+        owner: Optional["System"] = None,
+        parameters: Optional[dict] = None,
+        init: Optional[dict] = None,
+        stop: Optional[str] = None,
+        dt: float = 0.1,
+        includes: Optional[list[str]] = None,
+        **kwargs,
+    ):
+        super().__init__(name, owner, **kwargs)
+        self.parameters = {key: np.asarray(value) for key, value in (parameters or {}).items()}
+        self.init = init or {}
+        self.stop = None if stop is None else ZeroCrossing.from_comparison(stop)
+        self.dt = dt
+        self.includes = includes
+        self.time_interval = (self.owner.time, 1000000.0)
+        self.model = None
+        self.results = None
+        self.stopped = None
+
+    def compile(self):
+        """Compile the members of the ensemble.
+
+        Outputs
+        ------
+        model: EnsembleModel,
+            stacked model of the members
+        """
+        station = self.owner
+        for key, value in self.init.items():
+            station[key] = value
+        station.run_once()
+
+        model = StationModel(station)
+        n_members = len(next(iter(self.parameters.values()))) if self.parameters else 1
+        held = EnsembleModel([model])
+        others = [key for key in self.parameters if held.column(key) is None]
+
+        if others:
+            members = list(zip(*(self.parameters[key].tolist() for key in others)))
+            original = {key: copy.copy(station[key]) for key in others}
+            models = {}
+            for values in dict.fromkeys(members):
+                for key, value in zip(others, values):
+                    station[key] = value
+                station.run_once()
+                models[values] = StationModel(station)
+
+            for key, value in original.items():
+                station[key] = value
+            station.run_once()
+            model = EnsembleModel([models[values] for values in members])
+        else:
+            model = EnsembleModel([model] * n_members)
+
+        for key, values in self.parameters.items():
+            if key not in others:
+                model.set(key, values)
+        return model
+
+    def compute(self):
+        self.model = model = self.compile()
+        n_members, n_stages = len(model), model.n_stages
+        t0, t_end = self.time_interval[0], self.time_interval[1]
+
+        directions = [EventDirection.UPDOWN] * (n_stages + 2)
+        stop = None
+        if self.stop is not None:
+            stop = model.expression(self.stop.expression)
+            directions.append(self.stop.direction)
+        up = np.array([direction is EventDirection.UP for direction in directions])
+        down = np.array([direction is EventDirection.DOWN for direction in directions])
+
+        def values(model, t, y):
+            events = model.events(t, y)
+            if stop is None:
+                return events
+            value = np.broadcast_to(model.evaluate(stop, t, y), np.shape(t))
+            return np.concatenate([events, value[:, None]], axis=1)
+
+        def crossed(prev, curr):
+            crossing = (curr != prev) & (prev * curr <= 0.0)
+            return crossing & ~(up & (curr < prev)) & ~(down & (curr > prev))
+
+        names = model.recorded(self.includes)
+        chunks = []
+
+        def record(members, variables, events=""):
+            events = np.broadcast_to(np.asarray(events, dtype=object), members.shape)
+            chunks.append([members, events] + [np.array(variables[name]) for name in names])
+
+        t, y = np.full(n_members, float(t0)), model.y.copy()
+        prev = values(model, t, y)
+        # As in CoSApp, an event stays locked after its occurrence until its value changes; the
+        # events whose value is zero at the start are locked as if they had just occurred
+        locked = prev == 0.0
+        n_record = np.zeros(n_members, dtype=int)
+        active = np.ones(n_members, dtype=bool)
+        self.stopped = np.zeros(n_members, dtype=bool)
+        record(np.arange(n_members), model.variables(t, y))
+
+        while True:
+            active &= t < t_end - 1e-3 * self.dt
+            members = np.flatnonzero(active)
+            if members.size == 0:
+                break
+
+            sub = model.subset(members)
+            t_start, y_start = t[members], y[members]
+            t_next = np.minimum(t0 + (n_record[members] + 1) * self.dt, t_end)
+            h = t_next - t_start
+            dy0 = sub.derivative(t_start, y_start)
+            y_next = self.step(sub, t_start, y_start, dy0, h)
+            curr = values(sub, t_next, y_next)
+            triggered = ~locked[members] & crossed(prev[members], curr)
+            hit = triggered.any(axis=1)
+
+            quiet = members[~hit]
+            t[quiet], y[quiet] = t_next[~hit], y_next[~hit]
+            locked[quiet] &= curr[~hit] == prev[quiet]
+            prev[quiet] = curr[~hit]
+            n_record[quiet] += 1
+            variables = sub.variables(t_next, y_next)
+            record(quiet, {name: variables[name][~hit] for name in names})
+
+            if not hit.any():
+                continue
+
+            # Locate the events on the cubic interpolation of the steps
+            rows = np.flatnonzero(hit)
+            members = members[rows]
+            sub = sub.subset(rows)
+            a, b, h = t_start[rows], t_next[rows], h[rows]
+            y_start, dy0, y_next, curr = y_start[rows], dy0[rows], y_next[rows], curr[rows]
+            dy1 = sub.derivative(b, y_next)
+
+            def interpolate(rows, t_int):
+                return CompiledStation.hermite(
+                    a[rows, None],
+                    h[rows, None],
+                    y_start[rows],
+                    dy0[rows],
+                    y_next[rows],
+                    dy1[rows],
+                    t_int[:, None],
+                )
+
+            roots = np.full(triggered[hit].shape, np.inf)
+            for event in range(roots.shape[1]):
+                event_rows = np.flatnonzero(triggered[hit][:, event])
+                if event_rows.size == 0:
+                    continue
+                event_sub = sub.subset(event_rows)
+                roots[event_rows, event] = CompiledStation.locate(
+                    lambda t_int: values(event_sub, t_int, interpolate(event_rows, t_int))[
+                        :, event
+                    ],
+                    a[event_rows],
+                    b[event_rows],
+                    prev[members[event_rows], event],
+                    curr[event_rows, event],
+                )
+
+            t_event = roots.min(axis=1)
+            # Events located at the same time occur together
+            occurred = roots - t_event[:, None] <= 1e-10 * h[:, None]
+            y_event = interpolate(np.arange(len(rows)), t_event)
+            record(members, sub.variables(t_event, y_event))
+
+            for event in range(n_stages + 2):
+                event_rows = np.flatnonzero(occurred[:, event])
+                if event_rows.size > 0:
+                    model.transition(event, t_event[event_rows], members[event_rows])
+
+            final = occurred[:, -1] if stop is not None else np.zeros(len(rows), dtype=bool)
+            labels = [
+                model.names["stop"]
+                if done
+                else ", ".join(model.event_name(event) for event in np.flatnonzero(row))
+                for row, done in zip(occurred, final)
+            ]
+            t[members], y[members] = t_event, y_event
+            sub = model.subset(members)
+            variables = sub.variables(t_event, y_event)
+            record(members, variables, labels)
+
+            curr = values(sub, t_event, y_event)
+            locked[members] &= curr == prev[members]
+            locked[members] |= occurred
+            prev[members] = curr
+            self.stopped[members[final]] = True
+            active[members[final]] = False
+
+            on_grid = (t_event == b) & ~final
+            n_record[members[on_grid]] += 1
+            record(members[on_grid], {name: variables[name][on_grid] for name in names})
+
+        model.y = y
+        columns = [np.concatenate(column) for column in zip(*chunks)]
+        order = np.argsort(columns[0], kind="stable")
+        self.results = {
+            name: column[order] for name, column in zip(["Member", "Event"] + names, columns)
+        }
+
+    @staticmethod
+    def step(model, t, y, dy, h):
+        """Fourth-order Runge-Kutta step of some members.
+
+        Inputs
+        ------
+        model: EnsembleModel,
+            model of the members
+        t [s]: numpy.ndarray,
+            time of each member at the start of the step
+        y: numpy.ndarray,
+            state of the members at the start of the step
+        dy: numpy.ndarray,
+            derivative of the state at the start of the step
+        h [s]: numpy.ndarray,
+            time step of each member
+
+        Outputs
+        ------
+        y: numpy.ndarray,
+            state of the members at the end of the step
+        """
+        k = h[:, None]
+        k2 = model.derivative(t + h / 2, y + k / 2 * dy)
+        k3 = model.derivative(t + h / 2, y + k / 2 * k2)
+        k4 = model.derivative(t + h, y + k * k3)
+        return y + k / 6 * (dy + 2 * k2 + 2 * k3 + k4)
+
+    @property
+    def data(self):
+        return pd.DataFrame(self.results)
+
+    @property
+    def final(self):
+        """Last recorded values of each member."""
+        last = np.searchsorted(self.results["Member"], np.arange(len(self.model)), "right") - 1
+        return {name: column[last] for name, column in self.results.items()}
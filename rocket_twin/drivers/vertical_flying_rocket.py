@@ -1,13 +1,33 @@
 from typing import Optional
 
-from cosapp.drivers import Driver, NonLinearSolver, RungeKutta
-from cosapp.recorders import DataFrameRecorder
+import numpy as np
+from cosapp.core.eval_str import EvalString
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import Driver, RungeKutta
+from cosapp.multimode.zeroCrossing import ZeroCrossing
 from cosapp.systems import System
+from scipy.optimize import brentq
+
+from rocket_twin.systems.physics.rigid_body import ANGULAR_RATE, ATTITUDE, POSITION, VELOCITY
+from rocket_twin.utils import (
+    ArrayRecorder,
+    ConstantGravityArc,
+    DormandPrince,
+    InverseSquareArc,
+    LazySolver,
+    ParquetRecorder,
+    RecordingPolicy,
+    spin,
+)
+from rocket_twin.utils.atmosphere import G_0
 
 
 class VerticalFlyingRocket(Driver):
     """Driver that simulates the vertical flight of a rocket.
 
+    Once all stages are empty, the flight may be propagated in closed form up to the next
+    event instead of being integrated step by step.
+
     Inputs
     ------
     name: string,
@@ -15,9 +35,29 @@ class VerticalFlyingRocket(Driver):
     w_out [kg/s]: float,
         mass flow of fuel exiting the rocket tank
     dt [s]: float,
-        integration time step
+        integration time step, or recording period and first trial step of the adaptive scheme
     owner: System,
         the system that owns the driver
+    adaptive: boolean,
+        whether the time step is controlled by the Dormand-Prince error estimate
+    rtol, atol: float,
+        relative and absolute tolerances of the adaptive scheme
+    dt_min, dt_max [s]: float,
+        bounds of the adaptive time step
+    coast: string,
+        event ending the analytic coast after burnout, "apogee" or "impact"; the whole flight
+        is integrated if None
+    gravity: string,
+        gravity model of the coast, "constant" or "inverse_square"
+    radius [m]: float,
+        radius of the planet, for the inverse-square gravity
+    rocket: string,
+        name of the rocket in the owner system
+    path: string,
+        directory where the records are streamed to Parquet files, or None to keep them in
+        memory
+    policy: RecordingPolicy,
+        policy selecting the periodic records kept, all of them if None
 
     Outputs
     ------
@@ -31,20 +71,149 @@ class VerticalFlyingRocket(Driver):
         stop: Optional[str] = None,
         dt: Optional[float] = 0.1,
         includes: Optional[list[str]] = None,
-        **kwargs
+        adaptive: bool = False,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        dt_min: float = 0.0,
+        dt_max: float = np.inf,
+        coast: Optional[str] = None,
+        gravity: str = "constant",
+        radius: float = 6.371e6,
+        rocket: str = "rocket",
+        path: Optional[str] = None,
+        policy: Optional[RecordingPolicy] = None,
+        **kwargs,
     ):
         super().__init__(name, owner, **kwargs)
 
+        if coast not in (None, "apogee", "impact"):
+            raise ValueError(f"Unknown coast end event {coast!r}")
+        if gravity not in ("constant", "inverse_square"):
+            raise ValueError(f"Unknown gravity model {gravity!r}")
+
+        self.coast = coast
+        self.gravity = gravity
+        self.radius = radius
+        self.rocket = rocket
+        self.stop = None if stop is None else ZeroCrossing.from_comparison(stop)
+
         # Fueling:
-        self.rk = self.add_driver(RungeKutta("rk", owner=owner, order=4, dt=dt))
+        if adaptive:
+            self.rk = self.add_driver(
+                DormandPrince(
+                    "rk", owner=owner, dt=dt, rtol=rtol, atol=atol, dt_min=dt_min, dt_max=dt_max
+                )
+            )
+        else:
+            self.rk = self.add_driver(RungeKutta("rk", owner=owner, order=4, dt=dt))
         self.rk.time_interval = (self.owner.time, 1000000.0)
-        self.solver = self.rk.add_child(NonLinearSolver("solver"))
+        self.solver = self.rk.add_child(LazySolver("solver"))
 
         self.rk.set_scenario(init=init, stop=stop)
-        self.rk.add_recorder(
-            DataFrameRecorder(includes=includes, hold=True),
-            period=dt,
-        )
+        if path is None:
+            recorder = ArrayRecorder(includes=includes, hold=True, policy=policy)
+        else:
+            recorder = ParquetRecorder(path, includes=includes, hold=True, policy=policy)
+        self.rk.add_recorder(recorder, period=dt)
+
+    def compute_before(self):
+        # The integration stops at burnout, the coast being propagated afterwards
+        if self.coast is not None:
+            self.owner[self.rocket].burnout.final = True
+
+    def compute(self):
+        if self.coast is None:
+            return
+
+        rocket = self.owner[self.rocket]
+        rocket.burnout.final = False
+
+        events = self.rk.recorded_events
+        if events and rocket.burnout in events[-1].events:
+            if self.rk.scenario.stop not in events[-1].events:
+                self.propagate(rocket)
+
+    def propagate(self, rocket):
+        """Propagate the unpowered flight of a rocket up to the next event.
+
+        The translation is exact in the chosen gravity field, drag being neglected, and the
+        rocket coasts up to the end of the time interval if it escapes. The attitude
+        turns at the constant burnout rate, which is exact for a rotation about a principal
+        axis of inertia. Without 6-DOF dynamics, the vertical motion is propagated alone. The
+        inverse-square gravity only propagates a radial motion, so it raises a ValueError if
+        the rocket has a horizontal velocity at burnout. The stop condition is evaluated with
+        the motion and the time, other variables keeping their burnout values.
+
+        Inputs
+        ------
+        rocket: Rocket,
+            the flying rocket
+        """
+        body = rocket.body if "body" in rocket.children else None
+        if body is None:
+            state = np.zeros(13)
+            state[ATTITUDE] = [1.0, 0.0, 0.0, 0.0]
+            state[2], state[5] = rocket.altitude, rocket.v
+            gravity = np.array([0.0, 0.0, rocket.dyn.g])
+        else:
+            state = body.state.copy()
+            gravity = body.g
+        attitude, omega = state[ATTITUDE].copy(), state[ANGULAR_RATE].copy()
+
+        t0, t_end = self.owner.time, self.rk.time_interval[1]
+        if self.gravity == "constant":
+            arc = ConstantGravityArc(t0, state[POSITION], state[VELOCITY], gravity)
+        else:
+            # The gravity of the environment is the local one, at the burnout altitude
+            g_0 = G_0 if "env" in rocket.children else np.linalg.norm(gravity)
+            arc = InverseSquareArc(t0, state[POSITION], state[VELOCITY], g_0, self.radius)
+
+        t_event = arc.apogee_time if self.coast == "apogee" else None
+        if t_event is None:
+            t_event = arc.impact_time
+        if t_event is not None:
+            t_end = min(t_end, t_event)
+
+        clock = UniversalClock()
+
+        def set_state(t):
+            position, velocity = arc.state(t)
+            state[POSITION], state[VELOCITY] = position, velocity
+            state[ATTITUDE] = spin(attitude, omega, t - t0)
+            if body is not None:
+                rocket.state = state.copy()
+                body.state = state.copy()
+                body.run_once()
+            rocket.altitude, rocket.v = position[2], velocity[2]
+
+        times = np.append(np.arange(t0, t_end, self.rk.recording_period)[1:], t_end)
+
+        if self.stop is not None:
+            expr = EvalString(self.stop.expression, self.owner)
+
+            def value(t):
+                set_state(t)
+                clock.reset(t)
+                return expr.eval()
+
+            prev = expr.eval()
+            for t_prev, t in zip(np.append(t0, times[:-1]), times):
+                curr = value(t)
+                if self.stop.direction.zero_detected(prev, curr):
+                    if curr != 0.0:
+                        t = brentq(value, t_prev, t)
+                    t_end = t
+                    times = np.append(times[times < t_end], t_end)
+                    break
+                prev = curr
+
+            set_state(t0)
+            clock.reset(t0)
+
+        for t in times:
+            set_state(t)
+            clock.time = t
+            self.rk.recorder.record_state(f"t={float(t):.14}", self.rk.status, self.rk.error_code)
 
     @property
     def data(self):
@@ -8,7 +8,7 @@ from rocket_twin.systems.control import (
 )
 from rocket_twin.systems.engine import Engine, EngineGeom, EnginePerfo
 from rocket_twin.systems.ground import Ground
-from rocket_twin.systems.physics import Dynamics
+from rocket_twin.systems.physics import Dynamics, Environment, RigidBodyDynamics, VectorDynamics
 from rocket_twin.systems.structure import NoseGeom, TubeGeom, WingsGeom
 from rocket_twin.systems.tank import Pipe, Tank, TankFuel, TankGeom
 
@@ -26,6 +26,9 @@ __all__ = [
     "Rocket",
     "Pipe",
     "Dynamics",
+    "VectorDynamics",
+    "RigidBodyDynamics",
+    "Environment",
     "Station",
     "Ground",
     "StageControllerCoSApp",
@@ -32,10 +32,14 @@ class RocketControllerCoSApp(System):
     def transition(self):
 
         if self.drop.present:
-            if self.stage < self.n_stages:
-                self[f"is_on_{self.stage}"] = False
-                self.stage += 1
-                self[f"is_on_{self.stage}"] = True
-                self.drop.trigger = f"weight_prop_{self.stage} == 0."
-            else:
-                self[f"is_on_{self.stage}"] = False
+            self.next_stage()
+
+    def next_stage(self):
+        """Switch off the current stage, and switch on the next one if any."""
+        if self.stage < self.n_stages:
+            self[f"is_on_{self.stage}"] = False
+            self.stage += 1
+            self[f"is_on_{self.stage}"] = True
+            self.drop.trigger = f"weight_prop_{self.stage} == 0."
+        else:
+            self[f"is_on_{self.stage}"] = False
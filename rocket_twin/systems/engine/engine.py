@@ -10,6 +10,8 @@ class Engine(System):
     ------
     w_out [kg/s]: float,
         fuel consumption rate
+    p_amb [Pa]: float,
+        ambient pressure
 
     Outputs
     ------
@@ -17,11 +19,11 @@ class Engine(System):
         thrust force
     shape: TopoDS_Solid,
         pyoccad model
-    props: GProp_GProps,
+    props: MassProperties,
         model properties
     """
 
     def setup(self):
 
         self.add_child(EngineGeom("geom"), pulling=["shape", "props"])
-        self.add_child(EnginePerfo("perfo"), pulling=["w_out", "force"])
+        self.add_child(EnginePerfo("perfo"), pulling=["w_out", "p_amb", "force"])
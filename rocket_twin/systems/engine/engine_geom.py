@@ -5,6 +5,8 @@ from OCC.Core.gp import gp_Pnt, gp_Vec
 from OCC.Core.GProp import GProp_GProps
 from pyoccad.create import CreateCone, CreateSphere
 
+from rocket_twin.utils import MassProperties, geometry_cache
+
 
 class EngineGeom(System):
     """Pyoccad model of an engine.
@@ -16,7 +18,7 @@ class EngineGeom(System):
     ------
     shape: TopoDS_Solid,
         pyoccad model
-    props: GProp_GProps,
+    props: MassProperties,
         model properties
     """
 
@@ -35,14 +37,49 @@ class EngineGeom(System):
 
         # Outputs
         self.add_outward("shape", CreateSphere.from_radius_and_center(1.0), desc="pyoccad model")
-        self.add_outward("props", GProp_GProps(), desc="model properties")
+        self.add_outward("props", MassProperties(), desc="model properties")
 
     def compute(self):
 
-        self.shape = CreateCone.from_base_and_dir(
-            gp_Pnt(0, 0, self.pos), gp_Vec(0, 0, self.height), self.base_radius, self.top_radius
+        self.shape, self.props = geometry_cache.get(
+            "engine",
+            self.create_engine,
+            self.base_radius,
+            self.top_radius,
+            self.height,
+            self.pos,
+            self.rho,
+        )
+
+    def create_engine(self, base_radius, top_radius, height, pos, rho):
+        """Create a pyoccad model of an engine and its properties.
+
+        Inputs
+        ------
+        base_radius: float,
+            base radius
+        top_radius: float,
+            top radius
+        height: float,
+            height
+        pos: float,
+            base center z-coordinate
+        rho: float,
+            density
+
+        Outputs
+        ------
+        shape: TopoDS_Solid,
+            pyoccad model
+        props: MassProperties,
+            model properties
+        """
+
+        shape = CreateCone.from_base_and_dir(
+            gp_Pnt(0, 0, pos), gp_Vec(0, 0, height), base_radius, top_radius
         )
         vprop = GProp_GProps()
-        brepgprop.VolumeProperties(self.shape, vprop)
-        self.props = GProp_GProps()
-        self.props.Add(vprop, self.rho)
+        brepgprop.VolumeProperties(shape, vprop)
+        props = MassProperties.from_gprops(vprop, rho)
+
+        return shape, props
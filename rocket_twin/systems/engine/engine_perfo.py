@@ -8,6 +8,8 @@ class EnginePerfo(System):
     ------
     w_out [kg/s]: float,
         fuel consumption rate
+    p_amb [Pa]: float,
+        ambient pressure
 
     Outputs
     ------
@@ -19,13 +21,19 @@ class EnginePerfo(System):
 
         # Inputs
         self.add_inward("w_out", 0.0, desc="Fuel consumption rate", unit="kg/s")
+        self.add_inward("p_amb", 0.0, desc="Ambient pressure", unit="Pa")
 
         # Parameters
         self.add_inward("isp", 20.0, desc="Specific impulsion in vacuum", unit="s")
         self.add_inward("g_0", 10.0, desc="Gravity at Earth's surface", unit="m/s**2")
+        self.add_inward("area_exit", 0.0, desc="Nozzle exit area", unit="m**2")
 
         self.add_outward("force", 1.0, desc="Thrust force", unit="N")
 
     def compute(self):
 
         self.force = self.isp * self.w_out * self.g_0
+
+        # Pressure thrust loss of the firing nozzle
+        if self.w_out > 0.0:
+            self.force -= self.p_amb * self.area_exit
@@ -1,3 +1,12 @@
 from rocket_twin.systems.physics.dynamics import Dynamics
+from rocket_twin.systems.physics.environment import Environment
+from rocket_twin.systems.physics.rigid_body import RigidBodyDynamics, rigid_body_derivative
+from rocket_twin.systems.physics.vector_dynamics import VectorDynamics
 
-__all__ = ["Dynamics"]
+__all__ = [
+    "Dynamics",
+    "VectorDynamics",
+    "RigidBodyDynamics",
+    "rigid_body_derivative",
+    "Environment",
+]
@@ -0,0 +1,49 @@
+import numpy as np
+from cosapp.base import System
+
+from rocket_twin.utils import environment_table, gravity
+
+
+class Environment(System):
+    """Gravity and standard atmosphere at the altitude of a vehicle.
+
+    The atmosphere is interpolated in a table precomputed every 10 m up to 86 km, and held
+    constant above. The gravity is evaluated in closed form at any altitude.
+
+    Inputs
+    ------
+    altitude [m]: float,
+        geometric altitude
+
+    Outputs
+    ------
+    g [m/s**2]: float,
+        vertical gravity acceleration, negative
+    g_vec [m/s**2]: numpy.ndarray,
+        gravity acceleration vector
+    T [K]: float,
+        air temperature
+    p [Pa]: float,
+        air pressure
+    rho [kg/m**3]: float,
+        air density
+    c [m/s]: float,
+        speed of sound
+    """
+
+    def setup(self):
+
+        self.add_inward("altitude", 0.0, desc="Altitude", unit="m")
+
+        self.add_outward("g", -9.80665, desc="Gravity", unit="m/s**2")
+        self.add_outward("g_vec", np.array([0.0, 0.0, -9.80665]), desc="Gravity", unit="m/s**2")
+        self.add_outward("T", 288.15, desc="Temperature", unit="K")
+        self.add_outward("p", 101325.0, desc="Pressure", unit="Pa")
+        self.add_outward("rho", 1.225, desc="Density", unit="kg/m**3")
+        self.add_outward("c", 340.29, desc="Speed of sound", unit="m/s")
+
+    def compute(self):
+
+        self.T, self.p, self.rho, self.c = environment_table(self.altitude)
+        self.g = -float(gravity(self.altitude))
+        self.g_vec = np.array([0.0, 0.0, self.g])
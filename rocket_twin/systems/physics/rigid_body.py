@@ -0,0 +1,164 @@
+import numpy as np
+from cosapp.base import System
+
+# Slices of the state vector
+POSITION = slice(0, 3)
+VELOCITY = slice(3, 6)
+ATTITUDE = slice(6, 10)
+ANGULAR_RATE = slice(10, 13)
+
+
+def rotation_matrix(q):
+    """Return the rotation matrices from the body frame to the inertial frame.
+
+    Inputs
+    ------
+    q: numpy.ndarray,
+        unit quaternions (w, x, y, z), of shape (..., 4)
+
+    Outputs
+    ------
+    rot: numpy.ndarray,
+        rotation matrices, of shape (..., 3, 3)
+    """
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack(
+        [
+            np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], -1),
+            np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], -1),
+            np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], -1),
+        ],
+        -2,
+    )
+
+
+def rigid_body_derivative(state, force, torque, mass, inertia, gravity):
+    """Evaluate the rigid-body equations of motion.
+
+    All arguments may carry the same leading batch dimensions, to evaluate several bodies in
+    a single call.
+
+    Inputs
+    ------
+    state: numpy.ndarray,
+        position [m] and velocity [m/s] of the center of gravity in the inertial frame,
+        attitude quaternion (w, x, y, z) and angular rate [rad/s] in the body frame,
+        of shape (..., 13)
+    force [N]: numpy.ndarray,
+        force applied at the center of gravity in the body frame, gravity excluded,
+        of shape (..., 3)
+    torque [N*m]: numpy.ndarray,
+        torque about the center of gravity in the body frame, of shape (..., 3)
+    mass [kg]: numpy.ndarray,
+        mass, of shape (...)
+    inertia [kg*m**2]: numpy.ndarray,
+        inertia matrix about the center of gravity in the body frame, of shape (..., 3, 3)
+    gravity [m/s**2]: numpy.ndarray,
+        gravity acceleration in the inertial frame, of shape (..., 3)
+
+    Outputs
+    ------
+    derivative: numpy.ndarray,
+        time derivative of the state, of shape (..., 13)
+    """
+    state = np.asarray(state, dtype=float)
+    q = state[..., ATTITUDE]
+    omega = state[..., ANGULAR_RATE]
+
+    derivative = np.empty_like(state)
+    derivative[..., POSITION] = state[..., VELOCITY]
+    derivative[..., VELOCITY] = (
+        np.einsum("...ij,...j->...i", rotation_matrix(q), force) / np.asarray(mass)[..., None]
+        + gravity
+    )
+
+    # Quaternion kinematics, with a restoring term keeping the quaternion unitary
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    p, r, s = np.moveaxis(omega, -1, 0)
+    dq = 0.5 * np.stack(
+        [
+            -x * p - y * r - z * s,
+            w * p + y * s - z * r,
+            w * r + z * p - x * s,
+            w * s + x * r - y * p,
+        ],
+        -1,
+    )
+    derivative[..., ATTITUDE] = dq + 0.5 * (1.0 - np.sum(q * q, -1))[..., None] * q
+
+    # Euler's equations
+    momentum = np.einsum("...ij,...j->...i", inertia, omega)
+    derivative[..., ANGULAR_RATE] = np.linalg.solve(
+        inertia, (torque - np.cross(omega, momentum))[..., None]
+    )[..., 0]
+
+    return derivative
+
+
+class RigidBodyDynamics(System):
+    """Six-degree-of-freedom dynamics of an axisymmetric vehicle.
+
+    The state is a single vector holding the position and velocity of the center of gravity
+    in the inertial frame, the attitude quaternion and the angular rate in the body frame.
+    The thrust of each engine is applied on the body z axis.
+
+    Inputs
+    ------
+    thrusts [N]: numpy.ndarray,
+        thrust of each engine
+    thrust_dir: numpy.ndarray,
+        direction of the thrust in the body frame
+    thrust_pos [m]: float,
+        z-coordinate of the thrust application point
+    torque [N*m]: numpy.ndarray,
+        external torque about the center of gravity in the body frame
+    mass [kg]: float,
+        total weight
+    cg [m]: float,
+        z-coordinate of the center of gravity
+    I [kg*m**2]: numpy.ndarray,
+        inertia matrix about the center of gravity
+    g [m/s**2]: numpy.ndarray,
+        gravity in the inertial frame
+    flying: boolean,
+        whether the vehicle is flying, the state being frozen otherwise
+    state: numpy.ndarray,
+        position [m], velocity [m/s], attitude quaternion and angular rate [rad/s]
+
+    Outputs
+    ------
+    dstate: numpy.ndarray,
+        time derivative of the state
+    """
+
+    def setup(self, n_thrusts=1):
+
+        self.add_inward("thrusts", np.zeros(n_thrusts), desc="Thrust of each engine", unit="N")
+        self.add_inward("thrust_dir", np.array([0.0, 0.0, 1.0]), desc="Thrust direction")
+        self.add_inward("thrust_pos", 0.0, desc="Thrust application point", unit="m")
+        self.add_inward("torque", np.zeros(3), desc="External torque", unit="N*m")
+        self.add_inward("mass", 1.0, desc="Weight", unit="kg")
+        self.add_inward("cg", 0.0, desc="Center of gravity", unit="m")
+        self.add_inward("I", np.eye(3), desc="Inertia matrix", unit="kg*m**2")
+        self.add_inward("g", np.array([0.0, 0.0, -10.0]), desc="Gravity", unit="m/s**2")
+        self.add_inward("flying", False, desc="Whether the vehicle is flying or not")
+
+        # Transient, initially at rest with the body axes aligned on the inertial axes
+        state = np.zeros(13)
+        state[ATTITUDE] = [1.0, 0.0, 0.0, 0.0]
+        self.add_inward("state", state, desc="Position, velocity, attitude and rate")
+        self.add_outward("dstate", np.zeros(13), desc="State derivative")
+        self.add_transient("state", der="dstate")
+
+    def compute(self):
+
+        if self.flying:
+            force = self.thrusts.sum() * self.thrust_dir
+            arm = np.array([0.0, 0.0, self.thrust_pos - self.cg])
+            torque = self.torque + np.cross(arm, force)
+
+            self.dstate = rigid_body_derivative(
+                self.state, force, torque, self.mass, self.I, self.g
+            )
+        else:
+            self.dstate = np.zeros(13)
@@ -0,0 +1,40 @@
+import numpy as np
+from cosapp.base import System
+
+
+class VectorDynamics(System):
+    """Dynamics of a physical system, with the forces and weights gathered in arrays.
+
+    Each component of the system sets one element of the arrays, for instance by index in
+    the `compute` of the parent system, or through an `ElementConnector`.
+
+    Inputs
+    ------
+    forces [N]: numpy.ndarray,
+        total force in each component of the system
+    weights [kg]: numpy.ndarray,
+        total weight of each component of the system
+
+    Outputs
+    ------
+    force [N]: float,
+        total force
+    weight [kg]: float,
+        total weight
+    a [m/s**2] : float,
+        acceleration
+    """
+
+    def setup(self, n_forces=1, n_weights=1):
+        self.add_inward("g", -10.0, desc="Gravity", unit="m/s**2")
+        self.add_inward("forces", np.zeros(n_forces), desc="Force of each component", unit="N")
+        self.add_inward("weights", np.zeros(n_weights), desc="Weight of each component", unit="kg")
+
+        self.add_outward("a", 0.0, desc="Acceleration", unit="m/s**2")
+        self.add_outward("force", 1.0, desc="Force", unit="N")
+        self.add_outward("weight", 1.0, desc="Weight", unit="kg")
+
+    def compute(self):
+        self.weight = self.weights.sum()
+        self.force = self.forces.sum() + self.weight * self.g
+        self.a = self.force / self.weight
@@ -1,10 +1,10 @@
 import numpy as np
 from cosapp.base import System
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Fuse
-from OCC.Core.GProp import GProp_GProps
 from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Solid
 from pyoccad.create import CreateSphere
 
+from rocket_twin.utils import LazyShape, MassProperties, fuse_shapes, fusion_cache, model_key
+
 
 class OCCGeometry(System):
     """Geometrical properties of a system.
@@ -13,14 +13,16 @@ class OCCGeometry(System):
     ------
     shapes: TopoDS_Solid, TopoDS_Compound,
         pyoccad models of each component of the system
-    props: GProp_GProps,
+    props: MassProperties,
         properties of each model
+    physics_only: boolean,
+        whether only the properties are aggregated, the fusion being built on demand
 
     Outputs
     ------
     shape: TopoDS_Solid, TopoDS_Compound,
         fusion of all input models
-    props: GProp_GProps,
+    props: MassProperties,
         properties of the global model
     cg [m]: float,
         center of gravity
@@ -44,46 +46,66 @@ class OCCGeometry(System):
             self.add_inward(
                 shape,
                 TopoDS_Solid(),
-                dtype=(TopoDS_Solid, TopoDS_Compound),
+                dtype=(TopoDS_Solid, TopoDS_Compound, LazyShape),
                 desc=f"shape of {shape}",
             )
         for props in properties:
-            self.add_inward(props, GProp_GProps(), desc=f"Properties of the {props}")
+            self.add_inward(props, MassProperties(), desc=f"Properties of the {props}")
+
+        self.add_inward("physics_only", False, desc="Whether the fusion is built on demand only")
 
         self.add_outward(
             "shape",
             CreateSphere.from_radius_and_center(1.0),
-            dtype=(TopoDS_Solid, TopoDS_Compound),
+            dtype=(TopoDS_Solid, TopoDS_Compound, LazyShape),
             desc="global shape",
         )
-        self.add_outward("props", GProp_GProps(), desc="global properties")
+        self.add_outward("props", MassProperties(), desc="global properties")
         self.add_outward("weight", 1.0, desc="weight", unit="kg")
         self.add_outward("cg", 1.0, desc="center of gravity", unit="m")
-        self.add_outward("I", np.empty((3, 3)), desc="Inertia matrix", unit="kg*m**2")
+        self.add_outward("I", np.zeros((3, 3)), desc="Inertia matrix", unit="kg*m**2")
 
     def compute(self):
 
-        self.props = GProp_GProps()
-        for props in self.properties:
-            self.props.Add(self[props])
+        self.props = MassProperties.combine([self[props] for props in self.properties])
 
-        try:
-            self.shape = self.fusion(self.shapes)
-        except TypeError:
-            pass
+        if self.physics_only:
+            self.shape = LazyShape(self.fuse, [self[shape] for shape in self.shapes])
+        else:
+            try:
+                self.shape = self.fusion(self.shapes)
+            except TypeError:
+                pass
 
-        self.weight = self.props.Mass()
-        self.cg = self.props.CentreOfMass().Z()
-
-        inertia = self.props.MatrixOfInertia()
-        for i, j in zip(range(3), range(3)):
-            self.I[i, j] = inertia.Value(i + 1, j + 1)
+        self.weight = float(self.props.mass)
+        self.cg = float(self.props.cg[2])
+        self.I[:] = self.props.inertia
 
     def fusion(self, shapes):
 
-        shape_list = shapes.copy()
-        fusion = self[shape_list.pop(0)]
-        for shape in shape_list:
-            fusion = BRepAlgoAPI_Fuse(fusion, self[shape]).Shape()
+        # Fusions of cached models are kept for display, and not those of models rebuilt at
+        # each step, such as the fuel columns
+        models = [self[shape] for shape in shapes]
+        keys = [model_key(model) for model in models]
+        if None in keys:
+            return self.fuse(models)
+        fusion, _ = fusion_cache.get("fusion", lambda *keys: (self.fuse(models), None), *keys)
 
         return fusion
+
+    @staticmethod
+    def fuse(shapes):
+        """Fuse a list of pyoccad models.
+
+        Inputs
+        ------
+        shapes: list[TopoDS_Shape or LazyShape],
+            models to be fused
+
+        Outputs
+        ------
+        fusion: TopoDS_Shape,
+            fusion of all models
+        """
+
+        return fuse_shapes(shapes)
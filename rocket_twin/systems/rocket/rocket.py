@@ -1,8 +1,13 @@
 from cosapp.base import System
-from OCC.Core.GProp import GProp_GProps
 
-from rocket_twin.systems import Dynamics, RocketControllerCoSApp
+from rocket_twin.systems import (
+    Environment,
+    RigidBodyDynamics,
+    RocketControllerCoSApp,
+    VectorDynamics,
+)
 from rocket_twin.systems.rocket import OCCGeometry, Stage
+from rocket_twin.utils import ElementConnector, ElementSourceConnector, MassProperties
 
 
 class Rocket(System):
@@ -14,15 +19,27 @@ class Rocket(System):
         whether the rocket is already flying or still on ground
     n_stages: int,
         how many stages the rocket has
+    physics_only: boolean,
+        whether the rocket and stage models are only built on demand
+    environment: boolean,
+        whether gravity and air pressure depend on the altitude
+    rigid_body: boolean,
+        whether the flight follows the 6-DOF dynamics instead of the vertical ones
+    v [m/s]: float,
+        rocket vertical velocity, an output of the 6-DOF dynamics
+    altitude [m]: float,
+        rocket altitude, an output of the 6-DOF dynamics
+    state: numpy.ndarray,
+        state of the 6-DOF dynamics
 
     Values
     ------
     shapes: list[TopoDS_Shape],
         pyoccad visual representation of each component
-    properties: list[GProp_Gprops],
+    properties: list[MassProperties],
         volume properties of each component's pyoccad model
-    forces [N]: list [float],
-        total force in each stage
+    stages: tuple[Stage],
+        stages of the rocket, from the first one to be released
 
     Outputs
     ------
@@ -30,14 +47,19 @@ class Rocket(System):
         rocket acceleration
     """
 
-    def setup(self, n_stages=1):
+    def setup(self, n_stages=1, environment=False, rigid_body=False):
 
-        shapes, properties, forces = ([None] * n_stages for i in range(3))
+        shapes, properties = ([None] * n_stages for i in range(2))
 
         self.add_inward("n_stages", n_stages, desc="Number of stages")
         self.add_outward("stage", 1, desc="Current stage")
         self.add_inward("flying", False, desc="Whether the rocket is flying or not")
 
+        # Vertical motion, integrated by the rocket or derived from the 6-DOF state
+        add_motion = self.add_outward if rigid_body else self.add_inward
+        add_motion("v", 0.0, desc="Vertical velocity", unit="m/s")
+        add_motion("altitude", 0.0, desc="Altitude", unit="m")
+
         for i in range(1, n_stages + 1):
             nose = False
             wings = False
@@ -55,39 +77,119 @@ class Rocket(System):
             )
             shapes[i - 1] = f"stage_{i}_s"
             properties[i - 1] = f"stage_{i}"
-            forces[i - 1] = f"thrust_{i}"
 
         self.add_child(
             RocketControllerCoSApp("controller", n_stages=n_stages),
             execution_index=0,
             pulling=["flying"],
         )
-        self.add_child(OCCGeometry("geom", shapes=shapes, properties=properties))
-        self.add_child(Dynamics("dyn", forces=forces, weights=["weight_rocket"]), pulling=["a"])
+        if environment:
+            self.add_child(Environment("env"), execution_index=1)
+        self.add_child(
+            OCCGeometry("geom", shapes=shapes, properties=properties), pulling=["physics_only"]
+        )
+        if rigid_body:
+            self.add_child(RigidBodyDynamics("body", n_thrusts=n_stages), pulling=["state"])
+        else:
+            self.add_child(VectorDynamics("dyn", n_forces=n_stages, n_weights=1))
+        self.add_outward("a", 0.0, desc="Vertical acceleration", unit="m/s**2")
+        self.add_property("stages", tuple(self[f"stage_{i}"] for i in range(1, n_stages + 1)))
 
         for i in range(1, n_stages + 1):
+            self.connect_stage(i)
+
+        if rigid_body:
             self.connect(
-                self.controller.outwards, self[f"stage_{i}"].inwards, {f"is_on_{i}": "is_on"}
+                self.geom.outwards, self.body.inwards, {"weight": "mass", "cg": "cg", "I": "I"}
             )
+            self.connect(self.inwards, self.body.inwards, ["flying"])
+            if environment:
+                self.connect(self.env.outwards, self.body.inwards, {"g_vec": "g"})
+                self.connect(
+                    self.inwards,
+                    self.env.inwards,
+                    {"state": "altitude"},
+                    cls=ElementSourceConnector,
+                    index=2,
+                )
+        else:
             self.connect(
-                self[f"stage_{i}"].outwards,
-                self.controller.inwards,
-                {"weight_prop": f"weight_prop_{i}"},
+                self.geom.outwards, self.dyn.inwards, {"weight": "weights"}, cls=ElementConnector
             )
-            self.connect(self[f"stage_{i}"].outwards, self.geom.inwards, {"props": f"stage_{i}"})
-            self.connect(self[f"stage_{i}"].outwards, self.dyn.inwards, {"thrust": f"thrust_{i}"})
+            if environment:
+                self.connect(self.env.outwards, self.dyn.inwards, ["g"])
+                self.connect(self.inwards, self.env.inwards, ["altitude"])
 
-        self.connect(self.geom.outwards, self.dyn.inwards, {"weight": "weight_rocket"})
+            self.add_transient("v", der="a")
+            self.add_transient("altitude", der="v")
+
+        self.add_event(
+            "burnout",
+            desc="All stages are empty",
+            trigger=self.controller.drop.filter("stage == n_stages"),
+        )
 
     def compute(self):
+        # Fill the thrust of each stage by index, the released ones pushing no more
+        if "body" in self.children:
+            dynamics, thrusts = self.body, self.body.thrusts
+        else:
+            dynamics, thrusts = self.dyn, self.dyn.forces
+        thrusts[:] = [stage.thrust for stage in self.stages]
+        thrusts[: self.stage - 1] = 0.0
+        dynamics.compute()
+
+        if "body" in self.children:
+            self.a = self.body.dstate[5]
+            self.altitude, self.v = self.state[2], self.state[5]
+        else:
+            self.a = self.dyn.a
         self.a *= self.flying
 
     def transition(self):
 
         if self.controller.drop.present:
-            if self.stage < self.n_stages:
-                stage = self.pop_child(f"stage_{self.stage}")
-                self.add_child(stage, execution_index=self.stage - 1)
-                self.geom[f"stage_{self.stage}"] = GProp_GProps()
-                self.dyn[f"thrust_{self.stage}"] = 0.0
-                self.stage += 1
+            self.drop_stage()
+
+    def connect_stage(self, i):
+        """Connect the i-th stage to the controller, the geometry and the dynamics."""
+        stage = self[f"stage_{i}"]
+        self.connect(self.controller.outwards, stage.inwards, {f"is_on_{i}": "is_on"})
+        self.connect(stage.outwards, self.controller.inwards, {"weight_prop": f"weight_prop_{i}"})
+        self.connect(stage.outwards, self.geom.inwards, {"props": f"stage_{i}"})
+        self.connect(self.inwards, stage.inwards, ["physics_only"])
+        if "env" in self.children:
+            self.connect(self.env.outwards, stage.inwards, {"p": "p_amb"})
+
+    def drop_stage(self):
+        """Release the current stage, unless it is the last one."""
+        if self.stage < self.n_stages:
+            self.detach_stage(self.stage)
+            self.stage += 1
+
+    def detach_stage(self, i):
+        """Disconnect the i-th stage from the rocket, and remove its mass.
+
+        Its thrust is ignored by `compute` once the current stage is past it.
+        """
+        stage = self.pop_child(f"stage_{i}")
+        self.add_child(stage, execution_index=i - 1)
+        self.geom[f"stage_{i}"] = MassProperties()
+
+    def attach_stage(self, i):
+        """Connect back the i-th stage, the previous ones being detached."""
+        stage = self.pop_child(f"stage_{i}")
+        self.add_child(
+            stage,
+            execution_index=i,
+            pulling={"w_in": f"w_in_{i}", "weight_prop": f"weight_prop_{i}"},
+        )
+        self.connect_stage(i)
+
+    def set_stage(self, stage):
+        """Detach the stages released before the given one, and attach the other ones."""
+        for i in range(self.stage, stage):
+            self.detach_stage(i)
+        for i in range(self.stage - 1, stage - 1, -1):
+            self.attach_stage(i)
+        self.stage = stage
@@ -11,12 +11,16 @@ class Stage(System):
     ------
     is_on: float,
         whether the stage is on or not
+    p_amb [Pa]: float,
+        ambient pressure
+    physics_only: boolean,
+        whether the stage model is only built on demand
 
     Outputs
     ------
     shapes: TopoDS_Shape,
         pyoccad visual representation the stage
-    properties: GProp_Gprops,
+    properties: MassProperties,
         volume properties of the stage
     thrust [N]: float,
         thrust force
@@ -31,7 +35,7 @@ class Stage(System):
 
         self.add_child(StageControllerCoSApp("controller"), pulling=["is_on"])
         self.add_child(Tank("tank"), pulling=["w_in", "weight_prop"])
-        self.add_child(Engine("engine"), pulling={"force": "thrust"})
+        self.add_child(Engine("engine"), pulling={"force": "thrust", "p_amb": "p_amb"})
         self.add_child(TubeGeom("tube"))
 
         if nose:
@@ -45,7 +49,8 @@ class Stage(System):
             properties.append("wings")
 
         self.add_child(
-            OCCGeometry("geom", shapes=shapes, properties=properties), pulling=["shape", "props"]
+            OCCGeometry("geom", shapes=shapes, properties=properties),
+            pulling=["shape", "props", "physics_only"],
         )
 
         self.connect(self.controller.outwards, self.tank.inwards, {"w": "w_command"})
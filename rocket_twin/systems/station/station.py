@@ -1,6 +1,7 @@
 from cosapp.base import System
 
 from rocket_twin.systems import Pipe, Rocket, StationControllerCoSApp, Tank
+from rocket_twin.utils import Snapshot
 
 
 class Station(System):
@@ -10,6 +11,10 @@ class Station(System):
     ------
     n_stages: int,
         how many stages are present in the rocket
+    environment: boolean,
+        whether gravity and air pressure depend on the rocket altitude
+    rigid_body: boolean,
+        whether the rocket flight follows the 6-DOF dynamics instead of the vertical ones
     fueling: boolean,
         whether the rocket is in the fueling phase
     time_int [s]: float,
@@ -21,7 +26,10 @@ class Station(System):
     ------
     """
 
-    def setup(self, n_stages=1):
+    def setup(self, n_stages=1, environment=False, rigid_body=False):
+
+        self.add_property("environment", environment)
+        self.add_property("rigid_body", rigid_body)
 
         self.add_inward("n_stages", n_stages, desc="Number of stages")
         self.add_outward("stage", 1, desc="Current stage")
@@ -33,7 +41,9 @@ class Station(System):
         self.add_child(StationControllerCoSApp("controller"), pulling=["fueling"])
         self.add_child(Tank("g_tank"))
         self.add_child(Pipe("pipe"))
-        self.add_child(Rocket("rocket", n_stages=n_stages))
+        self.add_child(
+            Rocket("rocket", n_stages=n_stages, environment=environment, rigid_body=rigid_body)
+        )
 
         self.connect(self.g_tank.outwards, self.pipe.inwards, {"w_out": "w_in"})
         self.connect(self.pipe.outwards, self.rocket.inwards, {"w_out": "w_in_1"})
@@ -48,22 +58,90 @@ class Station(System):
 
         for i in range(1, self.n_stages + 1):
             if self.rocket[f"stage_{i}"].controller.full.present:
-                if self.stage < self.n_stages:
-                    self.pop_child("pipe")
-                    self.add_child(Pipe("pipe"), execution_index=2)
-
-                    self.connect(self.g_tank.outwards, self.pipe.inwards, {"w_out": "w_in"})
-                    self.connect(
-                        self.pipe.outwards, self.rocket.inwards, {"w_out": f"w_in_{self.stage + 1}"}
-                    )
-
-                    self.rocket[f"w_in_{self.stage}"] = 0.0
-                    self.stage += 1
-                else:
-                    self.time_lnc = self.time + self.time_int
-                    self.fueling = False
-                    self.stage = 1
+                self.end_stage_fueling()
 
         if self.launch.present:
-            self.rocket.flying = True
-            self.rocket.controller.is_on_1 = True
+            self.launch_rocket()
+
+    def end_stage_fueling(self):
+        """Route the pipe to the next stage, or schedule the launch once the last one is full."""
+        if self.stage < self.n_stages:
+            self.route_pipe(self.stage + 1)
+            self.rocket[f"w_in_{self.stage}"] = 0.0
+            self.stage += 1
+        else:
+            self.time_lnc = self.time + self.time_int
+            self.fueling = False
+            self.stage = 1
+
+    def launch_rocket(self):
+        """Start the flight of the rocket."""
+        self.rocket.flying = True
+        self.rocket.controller.is_on_1 = True
+
+    def route_pipe(self, stage):
+        """Replace the pipe by a new one, feeding the given stage of the rocket."""
+        self.pop_child("pipe")
+        self.add_child(Pipe("pipe"), execution_index=2)
+
+        self.connect(self.g_tank.outwards, self.pipe.inwards, {"w_out": "w_in"})
+        self.connect(self.pipe.outwards, self.rocket.inwards, {"w_out": f"w_in_{stage}"})
+
+    def piped_stage(self):
+        """Return the stage of the rocket fed by the pipe."""
+        for connector in self.connectors().values():
+            if connector.source is self.pipe.outwards:
+                (sink,) = connector.sink_variables()
+                return int(sink.rsplit("_", 1)[1])
+
+    def snapshot(self):
+        """Capture the current state of the station.
+
+        Outputs
+        ------
+        snapshot: Snapshot,
+            values, events and structure of the station, at the current time
+        """
+        return Snapshot.capture(self, pipe=self.piped_stage(), rocket_stage=self.rocket.stage)
+
+    def restore(self, snapshot):
+        """Set the station back to a captured state, and the clock to its time.
+
+        Inputs
+        ------
+        snapshot: Snapshot,
+            state of a station with as many stages
+        """
+        if snapshot.structure["pipe"] != self.piped_stage():
+            self.route_pipe(snapshot.structure["pipe"])
+        self.rocket.set_stage(snapshot.structure["rocket_stage"])
+        snapshot.apply(self)
+
+    def fork(self, name=None, snapshot=None):
+        """Create an independent station in the state of this one.
+
+        The copy is built from the same setup, and shares the geometry models and the mass
+        properties of the captured state instead of rebuilding them.
+
+        Inputs
+        ------
+        name: string,
+            name of the copy, that of the station if None
+        snapshot: Snapshot,
+            state of the copy, the current state of the station if None
+
+        Outputs
+        ------
+        station: Station,
+            copy of the station in the captured state
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        station = Station(
+            self.name if name is None else name,
+            n_stages=self.n_stages,
+            environment=self.environment,
+            rigid_body=self.rigid_body,
+        )
+        station.restore(snapshot)
+        return station
@@ -5,6 +5,8 @@ from OCC.Core.gp import gp_Pnt, gp_Vec
 from OCC.Core.GProp import GProp_GProps
 from pyoccad.create import CreateCylinder, CreateSphere
 
+from rocket_twin.utils import MassProperties, geometry_cache
+
 
 class TubeGeom(System):
     """Pyoccad model of a solid tube.
@@ -16,7 +18,7 @@ class TubeGeom(System):
     ------
     shape: TopoDS_Solid,
         pyoccad model
-    props: GProp_GProps,
+    props: MassProperties,
         model properties
     """
 
@@ -34,14 +36,39 @@ class TubeGeom(System):
 
         # Outputs
         self.add_outward("shape", CreateSphere.from_radius_and_center(1.0), desc="pyoccad model")
-        self.add_outward("props", GProp_GProps(), desc="model properties")
+        self.add_outward("props", MassProperties(), desc="model properties")
 
     def compute(self):
 
-        self.shape = CreateCylinder().from_base_and_dir(
-            gp_Pnt(0, 0, self.pos), gp_Vec(0, 0, self.length), self.radius
+        self.shape, self.props = geometry_cache.get(
+            "tube", self.create_tube, self.radius, self.length, self.pos, self.rho
         )
+
+    def create_tube(self, radius, length, pos, rho):
+        """Create a pyoccad model of a solid tube and its properties.
+
+        Inputs
+        ------
+        radius: float,
+            radius
+        length: float,
+            length
+        pos: float,
+            lowest point z-coordinate
+        rho: float,
+            density
+
+        Outputs
+        ------
+        shape: TopoDS_Solid,
+            pyoccad model
+        props: MassProperties,
+            model properties
+        """
+
+        shape = CreateCylinder().from_base_and_dir(gp_Pnt(0, 0, pos), gp_Vec(0, 0, length), radius)
         vprop = GProp_GProps()
-        brepgprop.VolumeProperties(self.shape, vprop)
-        self.props = GProp_GProps()
-        self.props.Add(vprop, self.rho)
+        brepgprop.VolumeProperties(shape, vprop)
+        props = MassProperties.from_gprops(vprop, rho)
+
+        return shape, props
@@ -1,12 +1,14 @@
 import numpy as np
 from cosapp.base import System
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Fuse
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
 from OCC.Core.BRepGProp import brepgprop
-from OCC.Core.gp import gp_Pnt, gp_Vec
+from OCC.Core.gp import gp_Ax1, gp_Dir, gp_Pnt, gp_Trsf, gp_Vec
 from OCC.Core.GProp import GProp_GProps
-from OCC.Core.TopoDS import TopoDS_Compound
+from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Solid
 from pyoccad.create import CreateEdge, CreateExtrusion, CreateFace, CreateTopology, CreateWire
 
+from rocket_twin.utils import MassProperties, fuse_shapes, geometry_cache
+
 
 class WingsGeom(System):
     """Pyoccad model of a set of wings.
@@ -18,7 +20,7 @@ class WingsGeom(System):
     ------
     shape: TopoDS_Compound,
         pyoccad model
-    props: GProp_GProps,
+    props: MassProperties,
         model properties
     """
 
@@ -39,18 +41,53 @@ class WingsGeom(System):
         self.add_inward("pos", 0.0, desc="lowest point z-coordinate", unit="m")
 
         # Outputs
-        self.add_outward("shape", TopoDS_Compound(), desc="pyoccad model")
-        self.add_outward("props", GProp_GProps(), desc="model properties")
+        self.add_outward(
+            "shape",
+            TopoDS_Compound(),
+            dtype=(TopoDS_Compound, TopoDS_Solid),
+            desc="pyoccad model",
+        )
+        self.add_outward("props", MassProperties(), desc="model properties")
 
     def compute(self):
 
-        self.shape = self.create_wings(
-            self.n, self.radius, self.pos, self.l_in, self.l_out, self.width, self.th
+        self.shape, self.props = geometry_cache.get(
+            "wings",
+            self.create_model,
+            self.n,
+            self.radius,
+            self.pos,
+            self.l_in,
+            self.l_out,
+            self.width,
+            self.th,
+            self.rho,
         )
+
+    def create_model(self, n_wings, radius, pos, l_in, l_out, width, th, rho):
+        """Create a pyoccad model of a set of wings and its properties.
+
+        Inputs
+        ------
+        n_wings, radius, pos, l_in, l_out, width, th:
+            see `create_wings`
+        rho: float,
+            density
+
+        Outputs
+        ------
+        shape: TopoDS_Compound,
+            pyoccad model
+        props: MassProperties,
+            model properties
+        """
+
+        shape = self.create_wings(n_wings, radius, pos, l_in, l_out, width, th)
         vprop = GProp_GProps()
-        brepgprop.VolumeProperties(self.shape, vprop)
-        self.props = GProp_GProps()
-        self.props.Add(vprop, self.rho)
+        brepgprop.VolumeProperties(shape, vprop)
+        props = MassProperties.from_gprops(vprop, rho)
+
+        return shape, props
 
     def create_wings(self, n_wings, radius, pos, l_in, l_out, width, th):
         """Create a pyoccad model of a set of wings.
@@ -79,31 +116,54 @@ class WingsGeom(System):
             pyoccad model of the set of wings
         """
 
-        theta = 2 * np.pi / n_wings
-        shapes = [None] * n_wings
+        wing = self.create_wing(radius, pos, l_in, l_out, width, th)
+
+        # The other wings are rotated instances of the first one
+        axis = gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1))
+        shapes = [wing]
+        for i in range(1, n_wings):
+            rotation = gp_Trsf()
+            rotation.SetRotation(axis, 2 * np.pi * i / n_wings)
+            shapes.append(BRepBuilderAPI_Transform(wing, rotation).Shape())
 
-        for i in range(n_wings):
+        return fuse_shapes(shapes)
 
-            ang = theta * i
+    def create_wing(self, radius, pos, l_in, l_out, width, th):
+        """Create a pyoccad model of a single wing lying in the xz-plane.
 
-            p1 = gp_Pnt(radius * np.cos(ang), radius * np.sin(ang), pos)
-            p2 = gp_Pnt((radius + width) * np.cos(ang), (radius + width) * np.sin(ang), pos)
-            p3 = gp_Pnt((radius + width) * np.cos(ang), (radius + width) * np.sin(ang), pos + l_out)
-            p4 = gp_Pnt(radius * np.cos(ang), radius * np.sin(ang), pos + l_in)
+        Inputs
+        ------
+        radius: float,
+            the distance of the internal edge to the center
+        pos: float,
+            the lower edge z-coordinate
+        l_in: float,
+            the length of the inner edge
+        l_out: float,
+            the length of the outer edge
+        width: float,
+            width
+        th: float,
+            thickness
 
-            edge1 = CreateEdge().from_2_points(p1, p2)
-            edge2 = CreateEdge().from_2_points(p2, p3)
-            edge3 = CreateEdge().from_2_points(p3, p4)
-            edge4 = CreateEdge().from_2_points(p4, p1)
+        Outputs
+        ------
+        wing: TopoDS_Solid,
+            pyoccad model of the wing
+        """
 
-            contour = CreateWire().from_elements([edge1, edge2, edge3, edge4])
-            face = CreateFace().from_contour(contour)
-            shell = CreateExtrusion().surface(face, gp_Vec(-th * np.sin(ang), th * np.cos(ang), 0))
-            shapes[i] = CreateTopology().make_solid(shell)
+        p1 = gp_Pnt(radius, 0, pos)
+        p2 = gp_Pnt(radius + width, 0, pos)
+        p3 = gp_Pnt(radius + width, 0, pos + l_out)
+        p4 = gp_Pnt(radius, 0, pos + l_in)
 
-        fusion = BRepAlgoAPI_Fuse(shapes[0], shapes[1]).Shape()
+        edge1 = CreateEdge().from_2_points(p1, p2)
+        edge2 = CreateEdge().from_2_points(p2, p3)
+        edge3 = CreateEdge().from_2_points(p3, p4)
+        edge4 = CreateEdge().from_2_points(p4, p1)
 
-        for i in range(2, n_wings):
-            fusion = BRepAlgoAPI_Fuse(fusion, shapes[i]).Shape()
+        contour = CreateWire().from_elements([edge1, edge2, edge3, edge4])
+        face = CreateFace().from_contour(contour)
+        shell = CreateExtrusion().surface(face, gp_Vec(0, th, 0))
 
-        return fusion
+        return CreateTopology().make_solid(shell)
@@ -23,7 +23,7 @@ class Tank(System):
         maximum fuel capacity
     shape: TopoDS_Solid,
         pyoccad model of the structure and fuel
-    props: GProp_GProps,
+    props: MassProperties,
         model properties
     """
 
@@ -1,5 +1,6 @@
 import numpy as np
 from cosapp.base import System
+from OCC.Core.BRep import BRep_Builder
 from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut, BRepAlgoAPI_Fuse
 from OCC.Core.BRepGProp import brepgprop
 from OCC.Core.gp import gp_Pnt, gp_Vec
@@ -7,19 +8,28 @@ from OCC.Core.GProp import GProp_GProps
 from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Solid
 from pyoccad.create import CreateCircle, CreateCylinder, CreateExtrusion, CreateFace, CreateSphere
 
+from rocket_twin.utils import LazyShape, MassProperties, geometry_cache
+
 
 class TankGeom(System):
     """Pyoccad model of the tank structure and fuel.
 
     Inputs
     ------
+    analytic: boolean,
+        whether the properties are computed in closed form, the model being built on demand
+    n_table: int,
+        number of fill levels at which the properties are tabulated, 0 to disable
 
     Outputs
     ------
-    shape: TopoDS_Solid,
-        pyoccad model
-    props: GProp_GProps,
+    shape: TopoDS_Compound,
+        pyoccad model, made of the structure and fuel solids, or built on demand as a
+        LazyShape in the analytic and table modes
+    props: MassProperties,
         model properties
+    table_error: float,
+        relative interpolation error estimated at the middle of the table intervals
     """
 
     def setup(self):
@@ -38,38 +48,197 @@ class TankGeom(System):
         # Position
         self.add_inward("pos", 0.0, desc="base center z-coordinate", unit="m")
 
+        # Mode
+        self.add_inward("analytic", False, desc="Whether properties are computed in closed form")
+        self.add_inward("n_table", 0, desc="Number of tabulated fill levels, 0 to disable")
+
         # Outputs
         self.add_outward(
             "shape",
             CreateSphere.from_radius_and_center(1.0),
-            dtype=(TopoDS_Compound, TopoDS_Solid),
+            dtype=(TopoDS_Compound, TopoDS_Solid, LazyShape),
             desc="pyoccad model",
         )
-        self.add_outward("props", GProp_GProps(), desc="model properties")
+        self.add_outward("props", MassProperties(), desc="model properties")
         self.add_outward("weight_max", 1.0, desc="Maximum fuel capacity", unit="kg")
+        self.add_outward("table_error", 0.0, desc="Relative interpolation error of the table")
 
     def compute(self):
 
         self.weight_max = np.pi * self.r_int**2 * self.height * self.rho_fuel
 
-        height_fuel = self.weight_prop / (np.pi * self.r_int**2 * self.rho_fuel) + 0.00000001
+        height_fuel = self.weight_prop / (np.pi * self.r_int**2 * self.rho_fuel)
+        geom = (self.r_int, self.r_ext, self.height, self.thickness, self.pos)
+        self.table_error = 0.0
+
+        if self.analytic:
+            self.props = self.analytic_props(*geom, height_fuel, self.rho_struct, self.rho_fuel)
+            self.shape = LazyShape(self.create_tank, *geom, height_fuel)
+
+        elif self.n_table > 0:
+            # The table is only built when the geometry changes
+            _, table = geometry_cache.get(
+                "tank_table",
+                self.create_table,
+                *geom,
+                self.rho_struct,
+                self.rho_fuel,
+                max(int(self.n_table), 2),
+            )
+            self.props = self.interpolate_table(table, height_fuel / self.height)
+            self.table_error = self.estimate_table_error(table, self.height + self.thickness)
+            self.shape = LazyShape(self.create_tank, *geom, height_fuel)
+
+        else:
+            # The structure only changes with the geometry, the fuel column at each step
+            shape_struct, struct_prop = geometry_cache.get(
+                "tank_structure", self.create_structure_model, *geom, self.rho_struct
+            )
+            shape_fuel = self.create_fuel(self.r_int, self.pos, height_fuel + 0.00000001)
+            self.shape = self.assemble(shape_struct, shape_fuel)
+
+            fuel_prop = GProp_GProps()
+            brepgprop.VolumeProperties(shape_fuel, fuel_prop)
+
+            self.props = MassProperties.from_gprops(fuel_prop, self.rho_fuel) + struct_prop
+
+    def create_structure_model(self, r_int, r_ext, height, thickness, pos, rho_struct):
+        """Create a pyoccad model of an empty cylindrical tank and its properties.
+
+        Inputs
+        ------
+        r_int, r_ext, height, thickness, pos:
+            see `create_structure`
+        rho_struct: float,
+            structure density
+
+        Outputs
+        ------
+        shape: TopoDS_Solid,
+            pyoccad model of the structure
+        props: MassProperties,
+            structure properties
+        """
+
+        shape = self.create_structure(r_int, r_ext, height, thickness, pos)
+        vprop = GProp_GProps()
+        brepgprop.VolumeProperties(shape, vprop)
+        props = MassProperties.from_gprops(vprop, rho_struct)
+
+        return shape, props
+
+    def create_table(self, r_int, r_ext, height, thickness, pos, rho_struct, rho_fuel, n_table):
+        """Tabulate the properties of the tank at evenly spaced fill levels.
+
+        The properties are computed at the `n_table` nodes of the table, from empty to full,
+        and at the middle of each interval to estimate the interpolation error.
 
-        shape_struct = self.create_structure(
-            self.r_int, self.r_ext, self.height, self.thickness, self.pos
+        Inputs
+        ------
+        r_int, r_ext, height, thickness, pos:
+            see `create_structure`
+        rho_struct: float,
+            structure density
+        rho_fuel: float,
+            fuel density
+        n_table: int,
+            number of nodes of the table
+
+        Outputs
+        ------
+        shape: None,
+            the table has no model of its own, the structure being cached on its own
+        table: MassProperties,
+            properties at the 2 * n_table - 1 fill levels, nodes and middles alternating
+        """
+
+        _, struct_prop = geometry_cache.get(
+            "tank_structure",
+            self.create_structure_model,
+            r_int,
+            r_ext,
+            height,
+            thickness,
+            pos,
+            rho_struct,
         )
-        shape_fuel = CreateCylinder.from_base_and_dir(
-            gp_Pnt(0, 0, self.pos + 0.000000001), gp_Vec(0, 0, height_fuel), self.r_int
+
+        levels = []
+        for height_fuel in np.linspace(0.0, height, 2 * n_table - 1):
+            fuel_prop = GProp_GProps()
+            brepgprop.VolumeProperties(
+                self.create_fuel(r_int, pos, height_fuel + 0.00000001), fuel_prop
+            )
+            levels.append(MassProperties.from_gprops(fuel_prop, rho_fuel) + struct_prop)
+
+        return None, MassProperties.stack(levels)
+
+    @staticmethod
+    def interpolate_table(table, fill):
+        """Interpolate linearly the tabulated properties of the tank.
+
+        The moments about the origin are interpolated rather than the center of gravity and
+        the central inertia, which are not linear in the fuel mass.
+
+        Inputs
+        ------
+        table: MassProperties,
+            properties tabulated by `create_table`
+        fill: float or numpy.ndarray,
+            fill level, from 0 (empty) to 1 (full)
+
+        Outputs
+        ------
+        props: MassProperties,
+            model properties
+        """
+
+        nodes = table.moments()
+        n_nodes = (len(table.mass) + 1) // 2
+        x = np.asarray(fill, dtype=float) * (n_nodes - 1)
+        i = np.clip(np.floor(x).astype(int), 0, n_nodes - 2)
+        t = x - i
+
+        return MassProperties.from_moments(
+            *(
+                (1.0 - t).reshape(t.shape + (1,) * (value.ndim - 1)) * value[2 * i]
+                + t.reshape(t.shape + (1,) * (value.ndim - 1)) * value[2 * i + 2]
+                for value in nodes
+            )
         )
-        self.shape = BRepAlgoAPI_Fuse(shape_struct, shape_fuel).Shape()
 
-        fuel_prop = GProp_GProps()
-        struct_prop = GProp_GProps()
-        brepgprop.VolumeProperties(shape_struct, struct_prop)
-        brepgprop.VolumeProperties(shape_fuel, fuel_prop)
+    @classmethod
+    def estimate_table_error(cls, table, length):
+        """Estimate the interpolation error of the table.
+
+        The interpolation is compared to the properties computed at the middle of each
+        interval, where the error of a smooth function is the largest.
+
+        Inputs
+        ------
+        table: MassProperties,
+            properties tabulated by `create_table`
+        length [m]: float,
+            reference length of the tank
+
+        Outputs
+        ------
+        error: float,
+            largest error, relative to the mass, the length and the inertia of the full tank
+        """
+
+        n_intervals = (len(table.mass) - 1) // 2
+        middle = cls.interpolate_table(table, (np.arange(n_intervals) + 0.5) / n_intervals)
+
+        errors = []
+        for value, exact, scale in (
+            (middle.mass, table.mass[1::2], table.mass[-1]),
+            (middle.cg, table.cg[1::2], length),
+            (middle.inertia, table.inertia[1::2], np.abs(table.inertia[-1]).max()),
+        ):
+            errors.append(np.abs(value - exact).max() / scale if scale > 0 else 0.0)
 
-        self.props = GProp_GProps()
-        self.props.Add(fuel_prop, self.rho_fuel)
-        self.props.Add(struct_prop, self.rho_struct)
+        return float(max(errors))
 
     def create_structure(self, r_int, r_ext, height, thickness, pos):
         """Create a pyoccad model of an empty cylindrical tank.
@@ -111,3 +280,140 @@ class TankGeom(System):
         tank = BRepAlgoAPI_Fuse(shell, bottom).Shape()
 
         return tank
+
+    def create_fuel(self, r_int, pos, height_fuel):
+        """Create a pyoccad model of the fuel column.
+
+        Inputs
+        ------
+        r_int: float,
+            internal radius
+        pos: float,
+            base center z-coordinate
+        height_fuel: float,
+            height of the fuel column
+
+        Outputs
+        ------
+        fuel: TopoDS_Solid,
+            pyoccad model of the fuel
+        """
+
+        return CreateCylinder.from_base_and_dir(
+            gp_Pnt(0, 0, pos + 0.000000001), gp_Vec(0, 0, height_fuel), r_int
+        )
+
+    def create_tank(self, r_int, r_ext, height, thickness, pos, height_fuel):
+        """Create a pyoccad model of the tank structure filled with fuel.
+
+        Inputs
+        ------
+        r_int: float,
+            internal radius
+        r_ext: float,
+            external radius
+        height: float,
+            height
+        thickness: float,
+            base thickness
+        pos: float,
+            base center z-coordinate
+        height_fuel: float,
+            height of the fuel column
+
+        Outputs
+        ------
+        tank: TopoDS_Compound,
+            pyoccad model of the structure and fuel
+        """
+
+        shape_struct = self.create_structure(r_int, r_ext, height, thickness, pos)
+        shape_fuel = self.create_fuel(r_int, pos, height_fuel + 0.00000001)
+
+        return self.assemble(shape_struct, shape_fuel)
+
+    def assemble(self, shape_struct, shape_fuel):
+        """Gather the structure and fuel models in a single compound.
+
+        The fuel column lies inside the structure without touching it, so that their boolean
+        fusion would only have gathered them in a compound as well. The consumers of the
+        shape accept compounds: the stage and rocket geometries fuse it with the other
+        models, where the solids of a compound are taken as disjoint arguments, and the
+        properties are computed from the solids themselves, not from the compound.
+
+        Inputs
+        ------
+        shape_struct: TopoDS_Shape,
+            pyoccad model of the structure
+        shape_fuel: TopoDS_Shape,
+            pyoccad model of the fuel
+
+        Outputs
+        ------
+        tank: TopoDS_Compound,
+            pyoccad model of the structure and fuel
+        """
+
+        tank = TopoDS_Compound()
+        builder = BRep_Builder()
+        builder.MakeCompound(tank)
+        builder.Add(tank, shape_struct)
+        builder.Add(tank, shape_fuel)
+
+        return tank
+
+    def analytic_props(
+        self, r_int, r_ext, height, thickness, pos, height_fuel, rho_struct, rho_fuel
+    ):
+        """Compute the properties of the tank structure and fuel in closed form.
+
+        The structure is a hollow cylinder on top of a full cylindrical bottom, and the fuel
+        a full cylinder resting on the bottom.
+
+        Inputs
+        ------
+        r_int: float,
+            internal radius
+        r_ext: float,
+            external radius
+        height: float,
+            height
+        thickness: float,
+            base thickness
+        pos: float,
+            base center z-coordinate
+        height_fuel: float,
+            height of the fuel column
+        rho_struct: float,
+            structure density
+        rho_fuel: float,
+            fuel density
+
+        Outputs
+        ------
+        props: MassProperties,
+            model properties
+        """
+
+        # (r_in, r_out, z_base, height, density) of each cylindrical part
+        parts = np.array(
+            [
+                [r_int, r_ext, pos, height, rho_struct],
+                [0.0, r_ext, pos - thickness, thickness, rho_struct],
+                [0.0, r_int, pos, height_fuel, rho_fuel],
+            ]
+        )
+        r_in, r_out, z_base, h, rho = parts.T
+        r2 = r_out**2 + r_in**2
+
+        mass = rho * np.pi * (r_out**2 - r_in**2) * h
+        i_xx = mass * (3 * r2 + h**2) / 12
+        i_zz = mass * r2 / 2
+
+        cg = np.zeros((len(parts), 3))
+        cg[:, 2] = z_base + h / 2
+        inertia = np.zeros((len(parts), 3, 3))
+        inertia[:, 0, 0] = inertia[:, 1, 1] = i_xx
+        inertia[:, 2, 2] = i_zz
+
+        return MassProperties(mass, cg, inertia).sum()
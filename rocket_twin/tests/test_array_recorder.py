@@ -0,0 +1,85 @@
+import numpy as np
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import RungeKutta
+from cosapp.recorders import DataFrameRecorder
+from cosapp.systems import System
+
+from rocket_twin.systems import Station
+from rocket_twin.utils import ArrayRecorder, LazySolver
+
+
+class Free(System):
+    """System with a variable of any type."""
+
+    def setup(self):
+        self.add_inward("x", 1, dtype=(int, float, str))
+
+
+class TestArrayRecorder:
+    """Tests for the NumPy array recorder."""
+
+    init = {
+        "g_tank.fuel.weight_p": 10.0,
+        "g_tank.fuel.w_out_max": 3.0,
+        "rocket.stage_1.tank.fuel.w_out_max": 3.0,
+    }
+
+    includes = ["rocket.a", "rocket.stage", "rocket.flying", "rocket.geom.I", "rocket.stage_1.*"]
+
+    def run(self, recorder):
+        UniversalClock().reset()
+        sys = Station("sys")
+        rk = sys.add_driver(RungeKutta("rk", order=4, dt=0.5))
+        rk.add_child(LazySolver("solver"))
+        rk.time_interval = (0.0, 8.0)
+        rk.set_scenario(init=self.init)
+        rk.add_recorder(recorder)
+        sys.run_drivers()
+        return rk
+
+    def test_records(self):
+        data = self.run(DataFrameRecorder(includes=self.includes)).recorder.export_data()
+        recorder = self.run(ArrayRecorder(includes=self.includes, capacity=2)).recorder
+        data2 = recorder.export_data()
+
+        assert len(recorder) == len(data)
+        assert list(data2.columns) == list(data.columns)
+        for name in data.columns:
+            values, values2 = list(data[name]), list(data2[name])
+            if name in ("rocket.a", "rocket.stage", "rocket.flying", "rocket.geom.I", "time"):
+                np.testing.assert_array_equal(np.stack(values2), np.stack(values))
+            elif isinstance(values[0], str):
+                assert values2 == values
+
+        assert recorder.column("rocket.geom.I").shape == (len(data), 3, 3)
+        assert recorder.column("rocket.stage").dtype == np.int64
+        assert recorder.column("rocket.flying").dtype == bool
+        assert recorder.column("rocket.stage_1.tank.shape").dtype == object
+
+    def test_zero_copy(self):
+        rk = self.run(ArrayRecorder(includes=["rocket.a"]))
+        recorder = rk.recorder
+        data = recorder.export_data()
+
+        assert np.shares_memory(data["rocket.a"].to_numpy(), recorder.column("rocket.a"))
+
+        # Records of a new session do not overwrite the exported ones
+        values = data["rocket.a"].to_numpy().copy()
+        rk.owner.run_drivers()
+        np.testing.assert_array_equal(data["rocket.a"], values)
+
+    def test_promotion(self):
+        sys = Free("sys")
+        rk = sys.add_driver(RungeKutta("rk"))
+        recorder = rk.add_recorder(ArrayRecorder(includes=["x"]))
+        recorder.start()
+
+        for value in (1, 2, 2.5, "late"):
+            sys.x = value
+            recorder.record_state(0.0)
+            if value == 2:
+                assert recorder.column("x").dtype == np.int64
+            if value == 2.5:
+                assert recorder.column("x").dtype == np.float64
+
+        assert list(recorder.column("x")) == [1, 2, 2.5, "late"]
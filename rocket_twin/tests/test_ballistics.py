@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from rocket_twin.utils import ConstantGravityArc, InverseSquareArc, spin
+
+
+class TestBallistics:
+    """Tests for the closed-form coast propagation."""
+
+    def test_constant(self):
+        arc = ConstantGravityArc(1.0, [0.0, 0.0, 10.0], [2.0, 0.0, 20.0], [0.0, 0.0, -10.0])
+
+        np.testing.assert_allclose(arc.apogee_time, 3.0, atol=10 ** (-10))
+        np.testing.assert_allclose(arc.impact_time, 3.0 + np.sqrt(6.0), atol=10 ** (-10))
+
+        position, velocity = arc.state(np.array([arc.apogee_time, arc.impact_time]))
+        np.testing.assert_allclose(position[:, 2], [30.0, 0.0], atol=10 ** (-10))
+        np.testing.assert_allclose(velocity[0], [2.0, 0.0, 0.0], atol=10 ** (-10))
+
+    def test_inverse_square(self):
+        g_0, radius = 10.0, 1.0e5
+        arc = InverseSquareArc(0.0, [0.0, 0.0, 1.0e4], [0.0, 0.0, 500.0], g_0, radius)
+
+        # Energy is conserved along the arc
+        times = np.linspace(0.0, arc.impact_time, 50)
+        position, velocity = arc.state(times)
+        energy = 0.5 * velocity[:, 2] ** 2 - g_0 * radius**2 / (radius + position[:, 2])
+        np.testing.assert_allclose(energy, energy[0], rtol=10 ** (-9))
+
+        position, velocity = arc.state(np.array([arc.apogee_time, arc.impact_time]))
+        np.testing.assert_allclose(velocity[0, 2], 0.0, atol=10 ** (-6))
+        np.testing.assert_allclose(position[1, 2], 0.0, atol=10 ** (-6))
+
+        # Close to the ground, the field is uniform
+        low = InverseSquareArc(0.0, [0.0, 0.0, 0.0], [0.0, 0.0, 20.0], g_0, 1.0e9)
+        np.testing.assert_allclose(low.apogee_time, 2.0, rtol=10 ** (-6))
+        np.testing.assert_allclose(low.impact_time, 4.0, rtol=10 ** (-6))
+
+        # Only the radial motion is closed-form
+        with pytest.raises(ValueError, match="Horizontal velocity"):
+            InverseSquareArc(0.0, [0.0, 0.0, 0.0], [1.0, 0.0, 20.0], g_0, radius)
+
+    def test_escape(self):
+        g_0, radius = 10.0, 1.0e5
+        v_escape = np.sqrt(2.0 * g_0 * radius)
+
+        for v0 in (1.5 * v_escape, v_escape):
+            arc = InverseSquareArc(0.0, [0.0, 0.0, 0.0], [0.0, 0.0, v0], g_0, radius)
+            assert arc.apogee_time is None
+            assert arc.impact_time is None
+
+            # Energy is conserved along the arc
+            position, velocity = arc.state(np.linspace(0.0, 100.0, 50))
+            energy = 0.5 * velocity[:, 2] ** 2 - g_0 * radius**2 / (radius + position[:, 2])
+            np.testing.assert_allclose(energy, 0.5 * v0**2 - g_0 * radius, atol=10 ** (-6))
+
+        # A body falling faster still reaches the ground
+        arc = InverseSquareArc(0.0, [0.0, 0.0, 1.0e4], [0.0, 0.0, -v_escape], g_0, radius)
+        position, velocity = arc.state(np.array([0.0, arc.impact_time]))
+        np.testing.assert_allclose(position[:, 2], [1.0e4, 0.0], atol=10 ** (-6))
+        np.testing.assert_allclose(velocity[0, 2], -v_escape, rtol=10 ** (-9))
+
+    def test_spin(self):
+        q = np.array([1.0, 0.0, 0.0, 0.0])
+        omega = np.array([0.0, 0.0, np.pi])
+
+        np.testing.assert_allclose(spin(q, omega, 1.0), [0.0, 0.0, 0.0, 1.0], atol=10 ** (-10))
+        np.testing.assert_allclose(
+            spin(q, omega, np.array([0.5, 2.0])),
+            [[np.sqrt(0.5), 0.0, 0.0, np.sqrt(0.5)], [-1.0, 0.0, 0.0, 0.0]],
+            atol=10 ** (-10),
+        )
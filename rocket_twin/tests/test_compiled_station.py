@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from cosapp.recorders import DataFrameRecorder
+
+from rocket_twin.drivers import CompiledStation, StationModel
+from rocket_twin.systems import Station
+
+
+class TestCompiledStation:
+    """Tests for the compiled station driver."""
+
+    def test_mission(self):
+        sys = Station("sys")
+        dt = 1.0
+
+        init = {
+            "rocket.stage_1.tank.fuel.weight_p": 0.0,
+            "g_tank.fuel.weight_p": 10.0,
+            "g_tank.w_in": 0.0,
+            "g_tank.fuel.w_out_max": 3.0,
+            "rocket.stage_1.tank.fuel.w_out_max": 3.0,
+        }
+
+        stop = "rocket.stage_1.tank.weight_prop <= 0."
+
+        includes = ["rocket.a"]
+
+        sys.add_driver(
+            CompiledStation("compiled", owner=sys, init=init, stop=stop, includes=includes, dt=dt)
+        )
+
+        sys.run_drivers()
+
+        data = sys.drivers["compiled"].data
+        acel = np.asarray(data["rocket.a"])
+
+        assert data["Reference"].iloc[-1] == "sys.stop"
+        np.testing.assert_allclose(acel[-2], 65.0, atol=10 ** (-10))
+        np.testing.assert_allclose(sys.rocket.stage_1.tank.weight_prop, 0.0, atol=10 ** (-10))
+        np.testing.assert_allclose(sys.g_tank.weight_prop, 5.0, atol=10 ** (-10))
+        assert sys.rocket.flying
+
+    def test_stages(self):
+        init = {
+            "g_tank.fuel.weight_p": 20.0,
+            "g_tank.fuel.w_out_max": 1.0,
+            "rocket.stage_1.tank.fuel.w_out_max": 1.0,
+            "rocket.stage_2.tank.fuel.w_out_max": 1.0,
+            "rocket.stage_3.tank.fuel.w_out_max": 1.0,
+            "time_int": 5.0,
+        }
+
+        includes = ["rocket.a", "rocket.v", "rocket.altitude", "rocket.stage"]
+
+        sys = Station("sys", n_stages=3)
+        driver = sys.add_driver(RungeKutta("rk", order=4, dt=1))
+        driver.add_child(NonLinearSolver("solver"))
+        driver.time_interval = (0, 35)
+        driver.set_scenario(init=init)
+        driver.add_recorder(DataFrameRecorder(includes=includes), period=1.0)
+        sys.run_drivers()
+
+        sys2 = Station("sys", n_stages=3)
+        compiled = sys2.add_driver(
+            CompiledStation("compiled", owner=sys2, init=init, includes=includes, dt=1.0)
+        )
+        compiled.time_interval = (0, 35)
+        sys2.run_drivers()
+
+        data = driver.recorder.export_data()
+        data2 = compiled.data
+
+        assert list(data2["Reference"]) == list(data["Reference"])
+        for name in includes:
+            np.testing.assert_allclose(
+                np.asarray(data2[name], dtype=float),
+                np.asarray(data[name], dtype=float),
+                atol=10 ** (-8),
+            )
+
+        assert sys2.rocket.stage == sys.rocket.stage
+        assert list(sys2.rocket.children) == list(sys.rocket.children)
+        np.testing.assert_allclose(sys2.rocket.geom.weight, sys.rocket.geom.weight, atol=10 ** (-8))
+        np.testing.assert_allclose(sys2.rocket.altitude, sys.rocket.altitude, atol=10 ** (-8))
+
+    def test_uncovered(self):
+        sys = Station("sys")
+        sys.add_driver(CompiledStation("compiled", owner=sys, stop="g_tank.geom.height > 3."))
+
+        with pytest.raises(ValueError, match="not covered"):
+            sys.run_drivers()
+
+    def test_model(self):
+        sys = Station("sys", n_stages=2)
+        sys.run_once()
+        model = StationModel(sys)
+
+        code = model.expression("np.abs(rocket.v) + max(rocket.stage_2.tank.weight_prop, 1.)")
+        np.testing.assert_allclose(model.evaluate(code, 0.0, model.y), 1.0, atol=10 ** (-10))
+
+        sys.rocket.stage_1.tank.fuel.weight_p = 1.0
+        with pytest.raises(ValueError, match="differs from the station"):
+            StationModel(sys)
+
+        with pytest.raises(ValueError, match="rigid-body"):
+            StationModel(Station("sys", rigid_body=True))
@@ -0,0 +1,94 @@
+import numpy as np
+from cosapp.base import System
+from cosapp.recorders import DataFrameRecorder
+
+from rocket_twin.utils import DormandPrince
+
+
+class Oscillator(System):
+    """Harmonic oscillator of unit pulsation."""
+
+    def setup(self):
+        self.add_inward("x", np.array([1.0, 0.0]), desc="Position and velocity")
+        self.add_outward("dx", np.zeros(2), desc="Derivative")
+        self.add_transient("x", der="dx")
+
+    def compute(self):
+        self.dx = np.array([self.x[1], -self.x[0]])
+
+
+class TestDormandPrince:
+    """Tests for the adaptive time driver."""
+
+    def test_tolerance(self):
+        evaluations = []
+        for rtol in [1e-4, 1e-8]:
+            sys = Oscillator("sys")
+            driver = sys.add_driver(DormandPrince(rtol=rtol, atol=rtol, dt=0.01))
+            driver.time_interval = (0, 20)
+
+            sys.run_drivers()
+
+            np.testing.assert_allclose(sys.x, [np.cos(20), -np.sin(20)], atol=100 * rtol)
+            evaluations.append(driver.n_evaluations)
+
+        # Looser tolerances take larger steps
+        assert evaluations[0] < evaluations[1]
+
+    def test_recording(self):
+        sys = Oscillator("sys")
+        driver = sys.add_driver(DormandPrince(rtol=1e-6, dt=0.01))
+        driver.time_interval = (0, 20)
+        driver.add_recorder(DataFrameRecorder(includes=["x"]), period=2.5)
+
+        sys.run_drivers()
+
+        data = driver.recorder.export_data()
+        np.testing.assert_allclose(data["time"], np.linspace(0.0, 20.0, 9), atol=10 ** (-10))
+        assert driver.n_accepted > 8
+
+    def test_dense_recording(self):
+        accepted = []
+        for period in [None, 0.1]:
+            sys = Oscillator("sys")
+            driver = sys.add_driver(DormandPrince(rtol=1e-6, atol=1e-6, dt=0.01))
+            driver.time_interval = (0, 20)
+            if period is not None:
+                driver.add_recorder(DataFrameRecorder(includes=["x"]), period=period)
+
+            sys.run_drivers()
+
+            np.testing.assert_allclose(sys.x, [np.cos(20), -np.sin(20)], atol=10 ** (-4))
+            accepted.append(driver.n_accepted)
+
+        # The recording times are interpolated within the steps, which are not shortened
+        data = driver.recorder.export_data()
+        time = np.asarray(data["time"], dtype=float)
+        np.testing.assert_allclose(time, np.linspace(0.0, 20.0, 201), atol=10 ** (-10))
+        np.testing.assert_allclose(np.stack(data["x"])[:, 0], np.cos(time), atol=10 ** (-4))
+        assert accepted[1] == accepted[0] < 200
+
+    def test_event(self):
+        sys = Oscillator("sys")
+        driver = sys.add_driver(DormandPrince(rtol=1e-9, atol=1e-9, dt=4 * np.pi))
+        driver.time_interval = (0, 40)
+        driver.add_recorder(DataFrameRecorder(includes=["x"]), period=4 * np.pi)
+        driver.set_scenario(init={"x": np.array([1.0, 0.0])}, stop="x[0] == 0")
+
+        sys.run_drivers()
+
+        # The first crossing is found within the first recording period
+        np.testing.assert_allclose(sys.time, np.pi / 2, atol=10 ** (-8))
+        np.testing.assert_allclose(sys.x, [0.0, -1.0], atol=10 ** (-8))
+
+    def test_event_at_start(self):
+        sys = Oscillator("sys")
+        driver = sys.add_driver(DormandPrince(rtol=1e-9, atol=1e-9, dt=0.5))
+        driver.time_interval = (0, 40)
+        driver.set_scenario(init={"x": np.array([0.0, 1.0])}, stop="x[0] == 0")
+
+        sys.run_drivers()
+
+        # The stop condition holds at the start, and only occurs at the next crossing
+        np.testing.assert_allclose(sys.time, np.pi, atol=10 ** (-8))
+        np.testing.assert_allclose(sys.x, [0.0, -1.0], atol=10 ** (-8))
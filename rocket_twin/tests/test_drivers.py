@@ -1,4 +1,5 @@
 import numpy as np
+from cosapp.core.time import UniversalClock
 
 from rocket_twin.drivers.fueling_rocket import FuelingRocket
 from rocket_twin.drivers.vertical_flying_rocket import VerticalFlyingRocket
@@ -70,3 +71,71 @@ class TestDrivers:
         np.testing.assert_allclose(acel[-2], 65.0, atol=10 ** (-10))
         np.testing.assert_allclose(self.sys.rocket.stage_1.tank.weight_prop, 0.0, atol=10 ** (-10))
         np.testing.assert_allclose(self.sys.g_tank.weight_prop, 0.0, atol=10 ** (-10))
+
+    def test_coast(self):
+        UniversalClock().reset()
+        sys = Station("sys", rigid_body=True)
+
+        init = {
+            "rocket.flying": True,
+            "rocket.controller.is_on_1": True,
+            "rocket.stage_1.tank.fuel.weight_p": 5.0,
+            "rocket.stage_1.tank.fuel.w_out_max": 3.0,
+            "g_tank.w_in": 0.0,
+            "g_tank.fuel.weight_p": 0.0,
+        }
+
+        sys.add_driver(
+            VerticalFlyingRocket(
+                "vfr", owner=sys, init=init, dt=0.1, coast="apogee", includes=["rocket.a"]
+            )
+        )
+
+        sys.run_drivers()
+
+        # The coast ends exactly at the apogee
+        np.testing.assert_allclose(sys.rocket.stage_1.tank.weight_prop, 0.0, atol=10 ** (-10))
+        np.testing.assert_allclose(sys.rocket.body.state[5], 0.0, atol=10 ** (-8))
+        assert sys.rocket.body.state[2] > 0.0
+        apogee = sys.rocket.body.state[2]
+
+        # The vertical dynamics reach the same apogee
+        UniversalClock().reset()
+        sys = Station("sys")
+        sys.add_driver(
+            VerticalFlyingRocket(
+                "vfr", owner=sys, init=init, dt=0.1, coast="apogee", includes=["rocket.a"]
+            )
+        )
+        sys.run_drivers()
+
+        np.testing.assert_allclose(sys.rocket.v, 0.0, atol=10 ** (-8))
+        np.testing.assert_allclose(sys.rocket.altitude, apogee, rtol=10 ** (-6))
+
+    def test_adaptive(self):
+        sys = Station("sys")
+
+        init = {
+            "rocket.stage_1.tank.fuel.weight_p": 0.0,
+            "g_tank.fuel.weight_p": 10.0,
+            "g_tank.w_in": 0.0,
+            "g_tank.fuel.w_out_max": 3.0,
+        }
+
+        sys.add_driver(
+            FuelingRocket(
+                "fr",
+                owner=sys,
+                init=init,
+                stop="rocket.flying == 1.",
+                includes=["rocket.a"],
+                dt=1.0,
+                adaptive=True,
+            )
+        )
+
+        sys.run_drivers()
+
+        np.testing.assert_allclose(sys.rocket.stage_1.tank.weight_prop, 5.0, atol=10 ** (-6))
+        np.testing.assert_allclose(sys.g_tank.weight_prop, 5.0, atol=10 ** (-6))
+        assert sys.drivers["fr"].rk.n_accepted > 0
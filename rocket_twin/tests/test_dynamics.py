@@ -1,6 +1,7 @@
 import numpy as np
 
-from rocket_twin.systems.physics import Dynamics
+from rocket_twin.systems import Rocket
+from rocket_twin.systems.physics import Dynamics, VectorDynamics
 
 
 class TestDynamics:
@@ -23,3 +24,32 @@ class TestDynamics:
         sys.run_once()
 
         np.testing.assert_allclose(sys.a, -8.0, atol=10 ** (-10))
+
+    def test_vector(self):
+        sys = VectorDynamics("sys", n_forces=3, n_weights=2)
+        sys.forces = np.array([60.0, 30.0, 10.0])
+        sys.weights = np.array([2.0, 3.0])
+
+        sys.run_once()
+
+        np.testing.assert_allclose(sys.weight, 5.0, atol=10 ** (-10))
+        np.testing.assert_allclose(sys.a, 10.0, atol=10 ** (-10))
+
+    def test_rocket(self):
+        sys = Rocket("sys", n_stages=3)
+        for i in range(1, 4):
+            sys[f"stage_{i}.engine.perfo.isp"] = 10.0 * i
+            sys[f"stage_{i}.tank.fuel.w_out_max"] = 1.0
+            sys[f"stage_{i}.tank.fuel.weight_p"] = 1.0
+            sys[f"controller.is_on_{i}"] = True
+
+        sys.run_once()
+
+        thrusts = [sys[f"stage_{i}.thrust"] for i in range(1, 4)]
+        assert all(thrust > 0.0 for thrust in thrusts)
+        np.testing.assert_allclose(sys.dyn.forces, thrusts, atol=10 ** (-10))
+        np.testing.assert_allclose(sys.dyn.weights, [sys.geom.weight], atol=10 ** (-10))
+
+        connector = sys.connectors()["geom.outwards -> dyn.inwards"]
+        assert list(connector.sink_variables()) == ["weights"]
+        assert connector.index == 0
@@ -29,21 +29,15 @@ class TestEngine:
 
         sys.run_drivers()
 
-        np.testing.assert_allclose(sys.props.Mass(), 10.0, atol=10 ** (-2))
-
-        np.testing.assert_allclose(sys.props.CentreOfMass().X(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Y(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Z(), 0.692, atol=10 ** (-2))
-
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().X(), 16.553, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Y(), 16.553, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Z(), 27.923, atol=10 ** (-2)
-        )
+        np.testing.assert_allclose(sys.props.mass, 10.0, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[2], 0.692, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.inertia[0, 0], 16.553, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[1, 1], 16.553, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[2, 2], 27.923, atol=10 ** (-2))
 
     def test_perfo(self):
         sys = Engine("sys")
@@ -0,0 +1,91 @@
+import numpy as np
+
+from rocket_twin.drivers.vertical_flying_rocket import VerticalFlyingRocket
+from rocket_twin.systems import Environment, Rocket, Station
+from rocket_twin.utils import UniformTable, environment_table, gravity, standard_atmosphere
+
+
+class TestEnvironment:
+    """Tests for the gravity and atmosphere models."""
+
+    def test_standard_atmosphere(self):
+        # Bases of the layers, converted from geopotential to geometric altitudes
+        h = np.array([0.0, 11000.0, 20000.0, 32000.0, 47000.0, 51000.0, 71000.0])
+        altitude = 6.356766e6 * h / (6.356766e6 - h)
+
+        T, p, rho, c = standard_atmosphere(altitude)
+
+        np.testing.assert_allclose(
+            T, [288.15, 216.65, 216.65, 228.65, 270.65, 270.65, 214.65], rtol=10 ** (-6)
+        )
+        np.testing.assert_allclose(
+            p, [101325.0, 22632.1, 5474.89, 868.019, 110.906, 66.9389, 3.95642], rtol=10 ** (-4)
+        )
+        np.testing.assert_allclose(rho[0], 1.225, rtol=10 ** (-4))
+        np.testing.assert_allclose(c[0], 340.294, rtol=10 ** (-4))
+
+    def test_table(self):
+        table = UniformTable.sample([lambda x: (x**2, -x)], 0.0, 2.0, 3)
+
+        np.testing.assert_allclose(table(np.array([0.5, 1.5])), [[0.5, -0.5], [2.5, -1.5]])
+        np.testing.assert_allclose(table(np.array([-1.0, 3.0])), [[0.0, 0.0], [4.0, -2.0]])
+
+        altitude = np.linspace(0.0, 86000.0, 1001)
+        exact = np.stack(standard_atmosphere(altitude), -1)
+        np.testing.assert_allclose(environment_table(altitude), exact, rtol=10 ** (-4))
+
+    def test_rocket(self):
+        sys = Rocket("sys", environment=True)
+        sys.stage_1.engine.perfo.area_exit = 0.001
+        sys.stage_1.tank.fuel.w_out_max = 1.0
+        sys.stage_1.tank.fuel.weight_p = 1.0
+        sys.controller.is_on_1 = True
+        sys.flying = True
+        sys.altitude = 10000.0
+
+        sys.run_once()
+
+        _, p, _, _ = standard_atmosphere(10000.0)
+        np.testing.assert_allclose(sys.env.p, p, rtol=10 ** (-4))
+        np.testing.assert_allclose(sys.dyn.g, -gravity(10000.0), rtol=10 ** (-6))
+        np.testing.assert_allclose(
+            sys.stage_1.thrust, 200.0 * sys.stage_1.engine.w_out - 0.001 * p, rtol=10 ** (-4)
+        )
+
+        # The altitude of the 6-DOF dynamics drives the environment
+        sys2 = Rocket("sys2", environment=True, rigid_body=True)
+        sys2.state[2] = 10000.0
+        sys2.run_once()
+        assert sys2.altitude == sys2.env.altitude == 10000.0
+        np.testing.assert_allclose(sys2.body.g, [0.0, 0.0, -gravity(10000.0)], rtol=10 ** (-6))
+
+    def test_flight(self):
+        sys = Station("sys", environment=True, rigid_body=True)
+        init = {
+            "rocket.flying": True,
+            "rocket.controller.is_on_1": True,
+            "rocket.stage_1.tank.fuel.weight_p": 5.0,
+            "rocket.stage_1.tank.fuel.w_out_max": 3.0,
+            "g_tank.fuel.weight_p": 0.0,
+        }
+        includes = ["rocket.altitude", "rocket.env.altitude"]
+        stop = "rocket.stage_1.tank.weight_prop == 0"
+        driver = sys.add_driver(
+            VerticalFlyingRocket("vfr", owner=sys, init=init, stop=stop, dt=0.1, includes=includes)
+        )
+        sys.run_drivers()
+
+        # The environment follows the single integration of the motion
+        data = driver.data
+        assert data["rocket.altitude"].iloc[-1] > 0.0
+        np.testing.assert_array_equal(data["rocket.env.altitude"], data["rocket.altitude"])
+        np.testing.assert_allclose(sys.rocket.altitude, sys.rocket.body.state[2], rtol=10 ** (-12))
+
+    def test_run_once(self):
+        sys = Environment("sys")
+        sys.altitude = 100000.0
+
+        sys.run_once()
+
+        np.testing.assert_allclose(sys.g, -gravity(100000.0), rtol=10 ** (-12))
+        np.testing.assert_allclose(sys.g_vec, [0.0, 0.0, sys.g], rtol=10 ** (-10))
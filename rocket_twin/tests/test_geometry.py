@@ -5,6 +5,7 @@ from OCC.Core.GProp import GProp_GProps
 from pyoccad.create import CreateCone, CreateCylinder
 
 from rocket_twin.systems import OCCGeometry
+from rocket_twin.utils import LazyShape, MassProperties
 
 
 class TestGeometry:
@@ -25,14 +26,12 @@ class TestGeometry:
         cylinder_s = CreateCylinder.from_base_and_dir(center_cyl, dir_cyl, radius)
         cone_s = CreateCone.from_base_and_dir(center_con, dir_con, radius)
 
-        cylinder = GProp_GProps()
-        cone = GProp_GProps()
         vprop = GProp_GProps()
         vprop2 = GProp_GProps()
         brepgprop.VolumeProperties(cylinder_s, vprop)
         brepgprop.VolumeProperties(cone_s, vprop2)
-        cylinder.Add(vprop, dens_cyl)
-        cone.Add(vprop2, dens_con)
+        cylinder = MassProperties.from_gprops(vprop, dens_cyl)
+        cone = MassProperties.from_gprops(vprop2, dens_con)
 
         sys.cylinder_s = cylinder_s
         sys.cone_s = cone_s
@@ -49,3 +48,32 @@ class TestGeometry:
         np.testing.assert_allclose(sys.I[0, 0], 431725.5164, atol=10 ** (-2))
         np.testing.assert_allclose(sys.I[1, 1], 431725.5164, atol=10 ** (-2))
         np.testing.assert_allclose(sys.I[2, 2], 30536.2806, atol=10 ** (-2))
+
+    def test_physics_only(self):
+
+        sys = OCCGeometry("sys", shapes=["cylinder_s", "cone_s"], properties=["cylinder", "cone"])
+
+        cylinder_s = CreateCylinder.from_base_and_dir(gp_Pnt(0, 0, 0), gp_Vec(0, 0, 20), 3.0)
+        cone_s = CreateCone.from_base_and_dir(gp_Pnt(0, 0, 20), gp_Vec(0, 0, 10), 3.0)
+
+        vprop = GProp_GProps()
+        vprop2 = GProp_GProps()
+        brepgprop.VolumeProperties(cylinder_s, vprop)
+        brepgprop.VolumeProperties(cone_s, vprop2)
+        cylinder = MassProperties.from_gprops(vprop)
+        cone = MassProperties.from_gprops(vprop2)
+
+        sys.cylinder_s = cylinder_s
+        sys.cone_s = cone_s
+        sys.cylinder = cylinder
+        sys.cone = cone
+        sys.physics_only = True
+
+        sys.run_once()
+
+        assert isinstance(sys.shape, LazyShape)
+        assert not sys.shape.built
+        np.testing.assert_allclose(sys.weight, 210 * np.pi, rtol=10 ** (-6))
+
+        assert sys.shape.shape is not None
+        assert sys.shape.built
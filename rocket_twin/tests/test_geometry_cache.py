@@ -0,0 +1,99 @@
+import numpy as np
+
+from rocket_twin.systems import NoseGeom, TubeGeom
+from rocket_twin.utils import DiskCache, GeometryCache, geometry_cache
+
+
+class TestGeometryCache:
+    """Tests for the geometry cache."""
+
+    def test_shared(self):
+        geometry_cache.clear()
+
+        sys = NoseGeom("sys")
+        sys2 = NoseGeom("sys2")
+
+        sys.run_once()
+        sys2.run_once()
+
+        assert sys.shape is sys2.shape
+        assert geometry_cache.stats()["hits"] == 1
+        assert geometry_cache.stats()["misses"] == 1
+
+        sys2.radius = 2.0
+        sys2.run_once()
+
+        assert sys.shape is not sys2.shape
+        np.testing.assert_allclose(sys2.props.mass, 4 * sys.props.mass, rtol=10 ** (-6))
+        assert geometry_cache.stats()["misses"] == 2
+
+    def test_rounding(self):
+        cache = GeometryCache(precision=6)
+
+        assert cache.key("tube", (1.0, 2.0)) == cache.key("tube", (1.0 + 1e-9, 2.0))
+        assert cache.key("tube", (1.0, 2.0)) != cache.key("nose", (1.0, 2.0))
+
+    def test_eviction(self):
+        cache = GeometryCache()
+        sys = TubeGeom("sys")
+
+        for length in (1.0, 2.0, 3.0):
+            cache.get("tube", sys.create_tube, 1.0, length, 0.0, 1.0)
+        cache.max_size = cache.size * 2 // 3
+        cache.get("tube", sys.create_tube, 1.0, 1.0, 0.0, 1.0)
+        cache.get("tube", sys.create_tube, 1.0, 4.0, 0.0, 1.0)
+
+        assert cache.evictions > 0
+        assert cache.size <= cache.max_size
+        assert cache.key("tube", (1.0, 1.0, 0.0, 1.0)) in cache
+        assert cache.key("tube", (1.0, 2.0, 0.0, 1.0)) not in cache
+
+    def test_disk(self, tmp_path):
+        sys = TubeGeom("sys")
+        calls = []
+
+        def builder(*inputs):
+            calls.append(inputs)
+            return sys.create_tube(*inputs)
+
+        # Two caches standing for two processes sharing a directory
+        cache = GeometryCache(disk=DiskCache(tmp_path))
+        cache2 = GeometryCache(disk=DiskCache(tmp_path))
+
+        shape, props = cache.get("tube", builder, 1.0, 2.0, 0.0, 1.0)
+        shape2, props2 = cache2.get("tube", builder, 1.0, 2.0, 0.0, 1.0)
+
+        assert len(calls) == 1
+        assert cache2.stats()["disk_hits"] == 1
+        assert isinstance(shape2, type(shape))
+        np.testing.assert_allclose(props2.mass, props.mass, rtol=10 ** (-9))
+        np.testing.assert_allclose(props2.cg, props.cg, atol=10 ** (-9))
+        np.testing.assert_allclose(props2.inertia, props.inertia, atol=10 ** (-9))
+
+        # Concurrent writers of the same entry keep a single one
+        cache2.disk.store(cache2.key("tube", (1.0, 2.0, 0.0, 1.0)), shape2, props2)
+        assert len(cache2.disk.entries()) == 1
+
+        # Entries without a model only hold their properties
+        size = cache.size
+        assert cache.get("table", lambda *inputs: (None, props), 1.0) == (None, props)
+        assert cache.size == size
+        shape3, props3 = cache2.disk.load(cache2.key("table", (1.0,)))
+        assert shape3 is None
+        np.testing.assert_allclose(props3.mass, props.mass, rtol=10 ** (-9))
+
+    def test_disk_eviction(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        cache = GeometryCache(disk=disk)
+        sys = TubeGeom("sys")
+
+        cache.get("tube", sys.create_tube, 1.0, 1.0, 0.0, 1.0)
+        disk.max_size = disk.entries()[0][1] * 2
+        for length in (2.0, 3.0, 4.0):
+            cache.get("tube", sys.create_tube, 1.0, length, 0.0, 1.0)
+
+        entries = disk.entries()
+        assert len(entries) == 2
+        assert sum(entry[1] for entry in entries) <= disk.max_size
+        assert disk.load(cache.key("tube", (1.0, 4.0, 0.0, 1.0))) is not None
+        assert disk.load(cache.key("tube", (1.0, 1.0, 0.0, 1.0))) is None
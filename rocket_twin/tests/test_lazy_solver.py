@@ -0,0 +1,48 @@
+import numpy as np
+from cosapp.base import System
+from cosapp.drivers import RungeKutta
+
+from rocket_twin.utils import LazySolver
+
+
+class Decay(System):
+    """Exponential decay, whose rate may be solved for."""
+
+    def setup(self):
+        self.add_inward("x", 1.0, desc="Decaying quantity")
+        self.add_inward("k", 1.0, desc="Decay rate")
+        self.add_outward("dx", 0.0, desc="Derivative")
+        self.add_outward("k2", 1.0, desc="Square of the decay rate")
+        self.add_transient("x", der="dx")
+
+    def compute(self):
+        self.dx = -self.k * self.x
+        self.k2 = self.k**2
+
+
+class TestLazySolver:
+    """Tests for the solver skipped on empty problems."""
+
+    def test_bypass(self):
+        sys = Decay("sys")
+        driver = sys.add_driver(RungeKutta(order=4, dt=0.01))
+        solver = driver.add_child(LazySolver("solver"))
+        driver.time_interval = (0, 1)
+
+        sys.run_drivers()
+
+        assert solver.bypassed
+        np.testing.assert_allclose(sys.x, np.exp(-1.0), rtol=10 ** (-8))
+
+    def test_unknowns(self):
+        sys = Decay("sys")
+        driver = sys.add_driver(RungeKutta(order=4, dt=0.01))
+        solver = driver.add_child(LazySolver("solver"))
+        driver.time_interval = (0, 1)
+        solver.add_unknown("k").add_equation("k2 == 4")
+
+        sys.run_drivers()
+
+        assert not solver.bypassed
+        np.testing.assert_allclose(sys.k, 2.0, rtol=10 ** (-6))
+        np.testing.assert_allclose(sys.x, np.exp(-2.0), rtol=10 ** (-6))
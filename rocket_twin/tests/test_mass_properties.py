@@ -0,0 +1,66 @@
+import pickle
+
+import numpy as np
+
+from rocket_twin.utils import MassProperties
+
+
+class TestMassProperties:
+    """Tests for the mass properties type."""
+
+    def test_combine(self):
+
+        rod = MassProperties(2.0, [0.0, 0.0, 1.0], np.diag([1.0, 1.0, 0.5]))
+        ball = MassProperties(1.0, [0.0, 1.0, 4.0], np.eye(3))
+
+        props = MassProperties.combine([rod, ball])
+
+        np.testing.assert_allclose(props.mass, 3.0, atol=10 ** (-9))
+        np.testing.assert_allclose(props.cg, [0.0, 1 / 3, 2.0], atol=10 ** (-9))
+
+        # Parallel-axis theorem, offsets (0, -1/3, -1) and (0, 2/3, 2)
+        inertia = np.diag([2.0, 2.0, 1.5]) + np.array(
+            [
+                [2 * 10 / 9 + 40 / 9, 0.0, 0.0],
+                [0.0, 2 + 4, -2 / 3 - 4 / 3],
+                [0.0, -2 / 3 - 4 / 3, 2 / 9 + 4 / 9],
+            ]
+        )
+        np.testing.assert_allclose(props.inertia, inertia, atol=10 ** (-9))
+
+        np.testing.assert_allclose((rod + ball).inertia, inertia, atol=10 ** (-9))
+
+    def test_batch(self):
+
+        mass = np.array([[1.0, 2.0], [0.0, 0.0]])
+        cg = np.zeros((2, 2, 3))
+        cg[0, :, 2] = [0.0, 3.0]
+        props = MassProperties(mass, cg).sum(axis=1)
+
+        np.testing.assert_allclose(props.mass, [3.0, 0.0], atol=10 ** (-9))
+        np.testing.assert_allclose(props.cg[:, 2], [2.0, 0.0], atol=10 ** (-9))
+        np.testing.assert_allclose(props.inertia[0], np.diag([6.0, 6.0, 0.0]), atol=10 ** (-9))
+        np.testing.assert_allclose(props.inertia[1], np.zeros((3, 3)), atol=10 ** (-9))
+
+    def test_pickle(self):
+
+        props = MassProperties(2.0, [0.0, 0.0, 1.0], np.eye(3))
+        copy = pickle.loads(pickle.dumps(props))
+
+        np.testing.assert_allclose(copy.mass, props.mass)
+        np.testing.assert_allclose(copy.cg, props.cg)
+        np.testing.assert_allclose(copy.inertia, props.inertia)
+
+    def test_moments(self):
+
+        props = MassProperties(
+            [2.0, 0.0], [[0.0, 1.0, 3.0], [0.0, 0.0, 0.0]], [np.eye(3), np.zeros((3, 3))]
+        )
+        mass, moment, inertia = props.moments()
+
+        np.testing.assert_allclose(moment[0], [0.0, 2.0, 6.0], atol=10 ** (-9))
+        np.testing.assert_allclose(inertia[0, 0, 0], 1.0 + 2.0 * 10.0, atol=10 ** (-9))
+
+        copy = MassProperties.from_moments(mass, moment, inertia)
+        np.testing.assert_allclose(copy.cg, props.cg, atol=10 ** (-9))
+        np.testing.assert_allclose(copy.inertia, props.inertia, atol=10 ** (-9))
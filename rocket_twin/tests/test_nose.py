@@ -21,18 +21,12 @@ class TestNose:
 
         sys.run_once()
 
-        np.testing.assert_allclose(sys.props.Mass(), 750 * np.pi, atol=10 ** (-2))
-
-        np.testing.assert_allclose(sys.props.CentreOfMass().X(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Y(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Z(), 2.25, atol=10 ** (-2))
-
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().X(), 6.7875 * 750 * np.pi, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Y(), 6.7875 * 750 * np.pi, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Z(), 7.5 * 750 * np.pi, atol=10 ** (-2)
-        )
+        np.testing.assert_allclose(sys.props.mass, 750 * np.pi, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[2], 2.25, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.inertia[0, 0], 6.7875 * 750 * np.pi, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[1, 1], 6.7875 * 750 * np.pi, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[2, 2], 7.5 * 750 * np.pi, atol=10 ** (-2))
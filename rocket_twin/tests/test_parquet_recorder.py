@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pandas as pd
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import RungeKutta
+
+from rocket_twin.drivers.mission import Mission
+from rocket_twin.systems import Station
+from rocket_twin.utils import ArrayRecorder, LazySolver, ParquetRecorder, Trajectory
+
+
+class TestParquetRecorder:
+    """Tests for the Parquet recorder."""
+
+    init = {
+        "rocket.stage_1.tank.fuel.weight_p": 0.0,
+        "g_tank.fuel.weight_p": 10.0,
+        "g_tank.w_in": 0.0,
+        "g_tank.fuel.w_out_max": 3.0,
+    }
+
+    stop = "rocket.stage_1.tank.weight_prop <= 0."
+
+    includes = ["rocket.a", "rocket.stage", "rocket.flying", "rocket.stage_1.tank.weight_*"]
+
+    def run(self, recorder):
+        sys = Station("sys")
+        rk = sys.add_driver(RungeKutta("rk", order=4, dt=0.5))
+        rk.add_child(LazySolver("solver"))
+        rk.time_interval = (0.0, 8.0)
+        rk.set_scenario(init=dict(self.init, **{"rocket.stage_1.tank.fuel.w_out_max": 3.0}))
+        rk.add_recorder(recorder)
+        sys.run_drivers()
+        return rk
+
+    def test_records(self, tmp_path):
+        data = self.run(ArrayRecorder(includes=self.includes)).recorder.export_data()
+        recorder = self.run(
+            ParquetRecorder(tmp_path, includes=self.includes, buffer_size=4)
+        ).recorder
+
+        trajectory = recorder.trajectory()
+        pd.testing.assert_frame_equal(recorder.export_data(), data)
+        assert trajectory.columns == list(data.columns)
+        assert len(trajectory) == len(data)
+        assert [batch.num_rows for batch in trajectory.batches()][:-1] == [4] * (len(data) // 4)
+        np.testing.assert_allclose(trajectory["rocket.a"], data["rocket.a"])
+
+    def test_sessions(self, tmp_path):
+        rk = self.run(ParquetRecorder(tmp_path, includes=["rocket.a"], hold=True))
+        recorder = rk.recorder
+        length = len(recorder.trajectory())
+
+        rk.time_interval = (8.0, 10.0)
+        rk.owner.run_drivers()
+        assert len(recorder.files) == 2
+        assert len(recorder.trajectory()) == length + 5
+
+        recorder.hold = False
+        rk.owner.run_drivers()
+        assert len(recorder.files) == 1
+        assert len(recorder.trajectory()) == 5
+
+    def test_mission(self, tmp_path):
+        data = []
+        for path in (None, tmp_path):
+            UniversalClock().reset()
+            sys = Station("sys")
+            sys.add_driver(
+                Mission(
+                    "mission",
+                    owner=sys,
+                    init=self.init,
+                    stop=self.stop,
+                    includes=self.includes,
+                    dt=1.0,
+                    path=path,
+                )
+            )
+            sys.run_drivers()
+            data.append(sys.drivers["mission"].data)
+
+        assert isinstance(data[1], Trajectory)
+        assert len(data[1].files) == 2
+        # The categories of the phases are merged in the files only
+        specials = dict.fromkeys(["Section", "Status", "Error code"], str)
+        pd.testing.assert_frame_equal(
+            data[1].to_pandas().astype(specials), data[0].astype(specials)
+        )
+
+    def test_types(self, tmp_path):
+        other = tmp_path / "part-00000.parquet"
+        other.write_bytes(b"")
+        recorder = self.run(
+            ParquetRecorder(tmp_path, includes=["rocket.stage", "rocket.a"], buffer_size=4)
+        ).recorder
+        assert str(other) not in recorder.files
+
+        # A column inferred as integers is promoted once it gets floats
+        length = len(recorder.trajectory())
+        recorder.hold = True
+        recorder.start()
+        recorder.watched_object.rocket.stage = 1.5
+        recorder.record_state("t=0.0")
+        recorder.record_state("t=1.0")
+        recorder.exit()
+        assert len(recorder.files) == 2
+        data = recorder.export_data()
+        assert len(data) == length + 2
+        np.testing.assert_allclose(data["rocket.stage"].iloc[-3:], [1.0, 1.5, 1.5])
+
+        recorder.clear()
+        assert not any(os.path.exists(file) for file in recorder.files)
+        assert other.exists()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from cosapp.core.time import UniversalClock
+
+from rocket_twin.drivers.mission import Mission
+from rocket_twin.systems import Station
+from rocket_twin.utils import Decimation, EventsOnly, OnChange, SamplingRates
+
+
+class TestRecordingPolicy:
+    """Tests for the recording policies of the drivers."""
+
+    init = {
+        "rocket.stage_1.tank.fuel.weight_p": 0.0,
+        "g_tank.fuel.weight_p": 10.0,
+        "g_tank.w_in": 0.0,
+        "g_tank.fuel.w_out_max": 3.0,
+    }
+
+    stop = "rocket.stage_1.tank.weight_prop <= 0."
+
+    includes = ["rocket.a", "rocket.stage_1.tank.weight_prop"]
+
+    def run(self, policy=None, path=None):
+        UniversalClock().reset()
+        sys = Station("sys")
+        mission = sys.add_driver(
+            Mission(
+                "mission",
+                owner=sys,
+                init=self.init,
+                stop=self.stop,
+                includes=self.includes,
+                dt=0.1,
+                path=path,
+                policy=policy,
+            )
+        )
+        sys.run_drivers()
+        data = mission.data if path is None else mission.data.to_pandas()
+        return data.astype(dict.fromkeys(["Section", "Status", "Error code"], str))
+
+    def check(self, data, full):
+        """Check that the kept records are records of the full run, events included."""
+        keys = list(zip(full["Reference"], full["time"]))
+        rows = [-1]
+        for key in zip(data["Reference"], data["time"]):
+            rows.append(keys.index(key, rows[-1] + 1))
+        rows = rows[1:]
+        pd.testing.assert_frame_equal(
+            data.reset_index(drop=True), full.iloc[rows].reset_index(drop=True)
+        )
+
+        # Events, their preceding records and the last records of the phases are kept
+        events = np.flatnonzero(~full["Reference"].str.startswith("t="))
+        for row in np.concatenate([events, events - 1, [len(full) - 1]]):
+            assert row in rows
+        return rows
+
+    def test_decimation(self):
+        full = self.run()
+        data = self.run(Decimation(10))
+        rows = self.check(data, full)
+
+        assert rows[:4] == [0, 10, 17, 18]
+        assert len(data) < len(full) / 4
+
+    def test_events(self):
+        full = self.run()
+        data = self.run(EventsOnly())
+        self.check(data, full)
+
+        assert list(data["Reference"][~data["Reference"].str.startswith("t=")]) == [
+            "controller.full",
+            "sys.launch",
+            "controller.drop",
+        ]
+        assert len(data) == 8
+
+    def test_on_change(self):
+        full = self.run()
+        data = self.run(OnChange({"rocket.a": 1.0}))
+        rows = self.check(data, full)
+
+        acel = np.asarray(full["rocket.a"])
+        for prev, row in zip(rows[:-1], rows[1:]):
+            assert np.all(np.abs(acel[prev + 1 : row - 1] - acel[prev]) <= 1.0)
+        assert len(data) < len(full) / 2
+
+    def test_rates(self, tmp_path):
+        full = self.run()
+        data = self.run(SamplingRates({"rocket.a": 1.0, "rocket.stage_1.tank.weight_prop": 2.5}))
+        self.check(data, full)
+
+        times = np.asarray(data["time"][data["Reference"].str.startswith("t=")])
+        t_full, t_launch = 5.0 / 3.0, 20.0 / 3.0
+        expected = [0, 1, t_full, 2, 2.5, 3, 4, 5, 6, t_launch, 0, 1, t_full]
+        np.testing.assert_allclose(times, expected, atol=10 ** (-10))
+
+        # Streamed records follow the same policy
+        streamed = self.run(SamplingRates({"rocket.a": 1.0}), path=tmp_path)
+        pd.testing.assert_frame_equal(streamed, self.run(SamplingRates({"rocket.a": 1.0})))
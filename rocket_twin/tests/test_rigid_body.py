@@ -0,0 +1,59 @@
+import numpy as np
+from cosapp.drivers import RungeKutta
+
+from rocket_twin.systems import RigidBodyDynamics, Rocket
+from rocket_twin.systems.physics import rigid_body_derivative
+
+
+class TestRigidBody:
+    """Tests for the 6-DOF dynamics model."""
+
+    def test_vertical(self):
+        sys = RigidBodyDynamics("sys", n_thrusts=2)
+        sys.thrusts = np.array([15.0, 5.0])
+        sys.mass = 1.0
+        sys.flying = True
+
+        driver = sys.add_driver(RungeKutta(order=4, dt=0.1))
+        driver.time_interval = (0, 2)
+        sys.run_drivers()
+
+        np.testing.assert_allclose(sys.state[:3], [0.0, 0.0, 20.0], atol=10 ** (-8))
+        np.testing.assert_allclose(sys.state[3:6], [0.0, 0.0, 20.0], atol=10 ** (-8))
+        np.testing.assert_allclose(sys.state[6:], [1.0, 0, 0, 0, 0, 0, 0], atol=10 ** (-8))
+
+    def test_rotation(self):
+        state = np.zeros((2, 13))
+        state[:, 6] = 1.0
+        state[0, 10:] = [0.0, 0.0, 3.0]
+        state[1, 10:] = [1.0, 0.0, 0.0]
+        inertia = np.diag([2.0, 2.0, 1.0])
+
+        derivative = rigid_body_derivative(
+            state, np.zeros(3), np.array([0.0, 4.0, 0.0]), 1.0, inertia, np.zeros(3)
+        )
+
+        # Spin about the axis of symmetry, and rolling about x at constant rate
+        np.testing.assert_allclose(derivative[0, 6:10], [0.0, 0.0, 0.0, 1.5], atol=10 ** (-10))
+        np.testing.assert_allclose(derivative[1, 6:10], [0.0, 0.5, 0.0, 0.0], atol=10 ** (-10))
+        np.testing.assert_allclose(derivative[:, 10:], [[0, 2.0, 0], [0, 2.0, 0]], atol=10 ** (-10))
+
+    def test_rocket(self):
+        rockets = []
+        for rigid_body in (False, True):
+            sys = Rocket("sys", n_stages=2, rigid_body=rigid_body)
+            for i in range(1, 3):
+                sys[f"stage_{i}.tank.fuel.w_out_max"] = 1.0
+                sys[f"stage_{i}.tank.fuel.weight_p"] = 1.0
+                sys[f"controller.is_on_{i}"] = True
+            sys.flying = True
+            sys.run_once()
+            rockets.append(sys)
+
+        # The 6-DOF dynamics replace the 1-D ones, and agree with them along the vertical
+        vertical, sys = rockets
+        assert "body" not in vertical.children
+        assert "dyn" not in sys.children
+        np.testing.assert_allclose(sys.a, vertical.a, rtol=10 ** (-10))
+        np.testing.assert_allclose(sys.body.dstate[3:6], [0.0, 0.0, sys.a], atol=10 ** (-10))
+        np.testing.assert_allclose(sys.body.dstate[10:], 0.0, atol=10 ** (-10))
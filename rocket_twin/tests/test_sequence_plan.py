@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from cosapp.core.time import UniversalClock
+
+from rocket_twin.systems import Station
+from rocket_twin.utils import SequencePlan, run_sequences
+
+
+class TestSequencePlan:
+    """Tests for the compiled command sequences."""
+
+    sequences = [
+        {
+            "name": "start",
+            "init": {"g_tank.fuel.weight_p": 10.0},
+            "type": "static",
+        },
+        {
+            "name": "fuel",
+            "type": "transient",
+            "init": {"g_tank.fuel.w_out_max": 1.0},
+            "dt": 1.0,
+            "stop": "rocket.stage_1.tank.weight_prop == rocket.stage_1.tank.weight_max",
+        },
+        {
+            "name": "flight",
+            "type": "transient",
+            "init": {"rocket.stage_1.tank.fuel.w_out_max": 0.5},
+            "stop": "rocket.stage_1.tank.weight_prop == 0",
+        },
+    ]
+
+    includes = ["rocket.a", "g_tank.weight_prop"]
+
+    def test_runs(self):
+        UniversalClock().reset()
+        data = run_sequences(Station("sys"), self.sequences, self.includes).recorder.export_data()
+
+        UniversalClock().reset()
+        sys = Station("sys")
+        initial = sys.snapshot()
+        plan = SequencePlan(sys, self.sequences, self.includes)
+        drivers = [seq["driver"] for seq in plan.sequences]
+
+        for run in range(2):
+            sys.restore(initial)
+            rk = plan.run()
+            assert rk is plan.rk
+            assert [seq["driver"] for seq in plan.sequences] == drivers
+            pd.testing.assert_frame_equal(rk.recorder.export_data(), data)
+        # The records of all the transients are kept
+        assert list(data["time"][[0, len(data) - 1]]) == [0.0, 20.0]
+
+        statistics = plan.statistics
+        assert list(statistics["run"]) == [0, 0, 0, 1, 1, 1]
+        assert list(statistics["sequence"]) == ["start", "fuel", "flight"] * 2
+        assert (statistics["wall_time"] > 0.0).all()
+        # The flight keeps the time step of the fueling
+        assert list(statistics["steps"][1:3]) == [6, 15]
+
+    def test_values(self):
+        UniversalClock().reset()
+        sys = Station("sys")
+        plan = SequencePlan(sys, self.sequences, self.includes)
+        data = plan.run({"g_tank.fuel.w_out_max": 2.5}).recorder.export_data()
+
+        assert list(data["time"][data["Reference"] == "controller.full"]) == [2.0]
+        assert plan.statistics["steps"][1] == 3
+        np.testing.assert_allclose(sys.g_tank.fuel.w_out_max, 2.5)
+
+    def test_validation(self):
+        sys = Station("sys")
+
+        for seq, message in [
+            ({"name": "s", "type": "static", "init": {"g_tank.w": 1.0}}, "Unknown variable"),
+            ({"name": "s", "type": "transient", "stop": "rocket.w == 0"}, "Invalid stop"),
+            ({"name": "s", "type": "transient", "steps": 10}, "Unknown keys"),
+            ({"name": "s", "type": "dynamic"}, "must be of type"),
+        ]:
+            with pytest.raises(ValueError, match=message):
+                SequencePlan(sys, [seq], self.includes)
+
+    def test_files(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "mission.yaml"
+        path.write_text(yaml.safe_dump(self.sequences))
+        path2 = tmp_path / "mission.json"
+        path2.write_text(json.dumps(self.sequences))
+
+        data = []
+        for sequences in (path, str(path2)):
+            UniversalClock().reset()
+            plan = SequencePlan(Station("sys"), sequences, self.includes)
+            data.append(plan.run().recorder.export_data())
+        pd.testing.assert_frame_equal(data[0], data[1])
@@ -0,0 +1,122 @@
+import functools
+
+import pandas as pd
+import pytest
+from cosapp.core.time import UniversalClock
+
+from rocket_twin.systems import Station
+from rocket_twin.utils import run_sequences, run_tree, sequence_tree
+
+
+class TestSequenceTree:
+    """Tests for the sequence trees."""
+
+    nodes = [
+        {
+            "name": "start",
+            "init": {"g_tank.fuel.weight_p": 10.0},
+            "type": "static",
+        },
+        {
+            "name": "fuel",
+            "parent": "start",
+            "type": "transient",
+            "init": {"g_tank.fuel.w_out_max": 1.0},
+            "dt": 1.0,
+            "stop": "rocket.stage_1.tank.weight_prop == rocket.stage_1.tank.weight_max",
+        },
+        {
+            "name": "slow",
+            "parent": "fuel",
+            "type": "transient",
+            "init": {"rocket.stage_1.tank.fuel.w_out_max": 0.5},
+            "stop": "rocket.stage_1.tank.weight_prop == 0",
+        },
+        {
+            "name": "fast",
+            "parent": "fuel",
+            "type": "transient",
+            "init": {"rocket.stage_1.tank.fuel.w_out_max": 1.0},
+            "stop": "rocket.stage_1.tank.weight_prop == 0",
+        },
+    ]
+
+    includes = ["rocket.a", "g_tank.weight_prop"]
+
+    codes = dict.fromkeys(["Section", "Status", "Error code"], str)
+
+    def linear(self, leaf):
+        """Run the branch of a leaf as a single list of sequences."""
+        nodes = {node["name"]: node for node in self.nodes}
+        path = [nodes[leaf]]
+        while "parent" in path[0]:
+            path.insert(0, nodes[path[0]["parent"]])
+        sequences = [{k: v for k, v in node.items() if k != "parent"} for node in path]
+
+        UniversalClock().reset()
+        rk = run_sequences(Station("sys"), sequences, self.includes)
+        return rk.recorder.export_data().astype(self.codes)
+
+    def test_segments(self):
+        segments, branches, roots = sequence_tree(self.nodes)
+
+        assert roots == ["start"]
+        assert {start: [seq["name"] for seq in seqs] for start, seqs in segments.items()} == {
+            "start": ["start", "fuel"],
+            "slow": ["slow"],
+            "fast": ["fast"],
+        }
+        assert branches == {"start": ["slow", "fast"], "slow": [], "fast": []}
+        assert all("parent" not in seq for seqs in segments.values() for seq in seqs)
+
+    def test_run(self):
+        factory = functools.partial(Station, "sys")
+        results = run_tree(factory, self.nodes, self.includes, processes=2)
+
+        assert sorted(results.data) == ["fast", "slow"]
+        assert not results.errors
+        for leaf in ("slow", "fast"):
+            pd.testing.assert_frame_equal(results[leaf].astype(self.codes), self.linear(leaf))
+            assert results.snapshots[leaf].structure["rocket_stage"] == 1
+        # The branches start from the end of the fueling
+        assert results["slow"]["time"].iloc[-1] > results["fast"]["time"].iloc[-1]
+
+        inline = run_tree(factory, self.nodes, self.includes, processes=1)
+        for leaf in ("slow", "fast"):
+            pd.testing.assert_frame_equal(inline[leaf], results[leaf])
+
+    def test_errors(self):
+        nodes = self.nodes + [
+            {"name": "broken", "parent": "fuel", "type": "transient", "dt": "fast"},
+        ]
+        with pytest.warns(UserWarning, match="1 of the 3 branches failed"):
+            results = run_tree(functools.partial(Station, "sys"), nodes, self.includes, processes=1)
+
+        assert sorted(results.data) == ["fast", "slow"]
+        assert list(results.errors) == ["broken"]
+
+        # A failed prefix fails all the branches following it
+        nodes = [dict(node, dt="fast") if node["name"] == "fuel" else node for node in nodes]
+        with pytest.warns(UserWarning, match="3 of the 3 branches failed"):
+            results = run_tree(functools.partial(Station, "sys"), nodes, self.includes, processes=1)
+
+        assert not results.data
+        assert sorted(results.errors) == ["broken", "fast", "slow"]
+        assert len(set(results.errors.values())) == 1
+
+    def test_validation(self):
+        start = {"name": "start", "type": "static"}
+        for nodes, message in [
+            ([start, dict(start)], "unique names"),
+            ([start, {"name": "s", "parent": "end", "type": "static"}], "Unknown parent"),
+            (
+                [
+                    start,
+                    {"name": "a", "parent": "b", "type": "static"},
+                    {"name": "b", "parent": "a", "type": "static"},
+                ],
+                "cycle",
+            ),
+        ]:
+            with pytest.raises(ValueError, match=message):
+                sequence_tree(nodes)
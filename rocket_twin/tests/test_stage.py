@@ -15,6 +15,16 @@ class TestStage:
 
         sys2.run_once()
 
+    def test_physics_only(self):
+        sys2 = Rocket("sys", n_stages=2)
+        sys2.physics_only = True
+
+        sys2.run_once()
+
+        assert sys2.stage_1.physics_only
+        assert sys2.stage_2.geom.physics_only
+        assert not sys2.stage_1.shape.built
+
     def test_fuel(self):
 
         init = {
@@ -1,12 +1,38 @@
 import numpy as np
-from cosapp.drivers import NonLinearSolver
+import pandas as pd
+import pytest
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import NonLinearSolver, RungeKutta
 
 from rocket_twin.systems import Station
+from rocket_twin.utils import ArrayRecorder
 
 
 class TestStation:
     """Tests for the station model."""
 
+    init = {
+        "g_tank.fuel.weight_p": 20.0,
+        "g_tank.fuel.w_out_max": 1.0,
+        "rocket.stage_1.tank.fuel.w_out_max": 1.0,
+        "rocket.stage_2.tank.fuel.w_out_max": 1.0,
+        "rocket.stage_3.tank.fuel.w_out_max": 1.0,
+        "time_int": 5.0,
+    }
+
+    includes = ["rocket.a", "rocket.v", "rocket.stage", "stage", "rocket.stage_2.tank.weight_prop"]
+
+    def run(self, sys, end, init=None):
+        sys.drivers.clear()
+        driver = sys.add_driver(RungeKutta("rk", order=4, dt=1.0))
+        driver.add_child(NonLinearSolver("solver"))
+        driver.time_interval = (sys.time, end)
+        if init is not None:
+            driver.set_scenario(init=init)
+        driver.add_recorder(ArrayRecorder(includes=self.includes), period=1.0)
+        sys.run_drivers()
+        return driver.recorder.export_data()
+
     def test_run_once(self):
         sys = Station("sys")
 
@@ -16,3 +42,51 @@ class TestStation:
         sys = Station("sys")
         sys.add_driver(NonLinearSolver("solver"))
         sys.run_drivers()
+
+    def test_fork(self):
+        UniversalClock().reset()
+        sys = Station("sys", n_stages=3, rigid_body=True)
+        self.run(sys, 27.0, self.init)
+        assert sys.rocket.stage == 2
+
+        snapshot = sys.snapshot()
+        fork = sys.fork()
+        assert fork.rocket.geom.shape is sys.rocket.geom.shape
+        assert fork.rocket.stage_2.geom.props is sys.rocket.stage_2.geom.props
+        assert fork.rocket.body.state is not sys.rocket.body.state
+        assert list(fork.rocket.children) == list(sys.rocket.children)
+
+        data = self.run(sys, 35.0)
+        fork = sys.fork(snapshot=snapshot)
+        assert fork.time == 27.0
+        pd.testing.assert_frame_equal(self.run(fork, 35.0), data)
+        assert sys.rocket.stage == fork.rocket.stage == 3
+
+    def test_restore(self):
+        UniversalClock().reset()
+        sys = Station("sys", n_stages=3)
+        self.run(sys, 7.0, self.init)
+        assert sys.piped_stage() == 2
+
+        snapshot = sys.snapshot()
+        data = self.run(sys, 35.0)
+        assert sys.piped_stage() == 3
+        assert sys.rocket.stage == 3
+
+        sys.restore(snapshot)
+        assert sys.time == 7.0
+        assert sys.piped_stage() == 2
+        assert sys.rocket.stage == 1
+        assert list(sys.rocket.children) == list(Station("sys2", n_stages=3).rocket.children)
+        pd.testing.assert_frame_equal(self.run(sys, 35.0), data)
+
+    def test_snapshot_internals(self):
+        sys = Station("sys", n_stages=2)
+        snapshot = sys.snapshot()
+
+        # The snapshots rely on private attributes of the cosapp events
+        del sys.rocket.burnout._present
+        with pytest.raises(TypeError, match="burnout"):
+            sys.snapshot()
+        with pytest.raises(TypeError, match="burnout"):
+            sys.restore(snapshot)
@@ -0,0 +1,103 @@
+import numpy as np
+
+from rocket_twin.drivers import CompiledStation, StationEnsemble
+from rocket_twin.systems import Station
+
+
+class TestStationEnsemble:
+    """Tests for the station ensemble driver."""
+
+    init = {
+        "g_tank.fuel.weight_p": 20.0,
+        "g_tank.fuel.w_out_max": 1.0,
+        "rocket.stage_1.tank.fuel.w_out_max": 1.0,
+        "rocket.stage_2.tank.fuel.w_out_max": 1.0,
+        "time_int": 5.0,
+    }
+
+    parameters = {
+        "rocket.stage_2.engine.perfo.isp": [20.0, 25.0, 30.0],
+        "rocket.stage_1.tank.fuel.w_out_max": [1.0, 1.5, 0.7],
+        "rocket.stage_1.tank.geom.height": [1.0, 1.2, 1.2],
+    }
+
+    stop = "rocket.stage_2.tank.weight_prop <= 0."
+
+    includes = ["rocket.a", "rocket.v", "rocket.altitude", "rocket.stage"]
+
+    def test_members(self):
+        sys = Station("sys", n_stages=2)
+        ensemble = sys.add_driver(
+            StationEnsemble(
+                "ensemble",
+                owner=sys,
+                parameters=self.parameters,
+                init=self.init,
+                stop=self.stop,
+                includes=self.includes,
+                dt=1.0,
+            )
+        )
+        ensemble.time_interval = (0, 60)
+        sys.run_drivers()
+
+        results = ensemble.results
+        assert ensemble.stopped.all()
+
+        for member in range(3):
+            sys2 = Station("sys", n_stages=2)
+            init = dict(self.init, **{key: value[member] for key, value in self.parameters.items()})
+            compiled = sys2.add_driver(
+                CompiledStation(
+                    "compiled",
+                    owner=sys2,
+                    init=init,
+                    stop=self.stop,
+                    includes=self.includes,
+                    dt=1.0,
+                )
+            )
+            compiled.time_interval = (0, 60)
+            sys2.run_drivers()
+
+            data = compiled.data
+            rows = results["Member"] == member
+            events = data["Reference"].where(~data["Reference"].str.startswith("t="), "")
+
+            assert list(results["Event"][rows]) == list(events)
+            for name in self.includes + ["time"]:
+                np.testing.assert_allclose(
+                    results[name][rows], np.asarray(data[name], dtype=float), atol=10 ** (-8)
+                )
+            np.testing.assert_allclose(
+                ensemble.final["rocket.altitude"][member], sys2.rocket.altitude, atol=10 ** (-8)
+            )
+
+        # The station itself is left unchanged
+        np.testing.assert_allclose(sys.rocket.stage_1.tank.geom.height, 1.0)
+
+    def test_stop(self):
+        sys = Station("sys")
+        ensemble = sys.add_driver(
+            StationEnsemble(
+                "ensemble",
+                owner=sys,
+                parameters={"time_int": [5.0, 50.0]},
+                init={
+                    "g_tank.fuel.weight_p": 10.0,
+                    "g_tank.fuel.w_out_max": 3.0,
+                    "rocket.stage_1.tank.fuel.w_out_max": 3.0,
+                },
+                stop="rocket.stage_1.tank.weight_prop <= 0.",
+                dt=1.0,
+            )
+        )
+        ensemble.time_interval = (0, 20)
+        sys.run_drivers()
+
+        # The second member is not launched before the end of the time interval
+        np.testing.assert_array_equal(ensemble.stopped, [True, False])
+        np.testing.assert_allclose(ensemble.final["time"], [8.333333333333334, 20.0])
+        np.testing.assert_allclose(
+            ensemble.final["rocket.stage_1.weight_prop"], [0.0, 5.0], atol=10 ** (-10)
+        )
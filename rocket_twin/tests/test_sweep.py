@@ -0,0 +1,98 @@
+import functools
+import json
+
+import numpy as np
+import pytest
+from cosapp.core.time import UniversalClock
+
+from rocket_twin.systems import Station
+from rocket_twin.utils import SweepResults, parameter_grid, run_sequences, sweep
+from rocket_twin.utils.sweep import main
+
+
+class TestSweep:
+    """Tests for the parameter sweeps."""
+
+    sequences = [
+        {
+            "name": "fuel",
+            "type": "transient",
+            "init": {"g_tank.fuel.weight_p": 10.0, "g_tank.fuel.w_out_max": 1.0},
+            "dt": 1.0,
+            "stop": "rocket.stage_1.tank.weight_prop == rocket.stage_1.tank.weight_max",
+        },
+        {
+            "name": "flight",
+            "type": "transient",
+            "init": {"rocket.stage_1.tank.fuel.w_out_max": 0.5},
+            "dt": 1.0,
+            "stop": "rocket.stage_1.tank.weight_prop == 0",
+        },
+    ]
+
+    factory = functools.partial(Station, "sys")
+
+    includes = ["rocket.a", "rocket.stage_1.tank.weight_prop", "rocket.stage_1.shape"]
+
+    def test_grid(self):
+        table = parameter_grid({"a": [1.0, 2.0], "b": [3.0, 4.0, 5.0]})
+
+        np.testing.assert_allclose(table["a"], [1.0, 1.0, 1.0, 2.0, 2.0, 2.0])
+        np.testing.assert_allclose(table["b"], [3.0, 4.0, 5.0, 3.0, 4.0, 5.0])
+
+    def test_runs(self):
+        parameters = {
+            "g_tank.fuel.w_out_max": [1.0, 2.0, 1.5],
+            "rocket.stage_1.engine.perfo.isp": [20.0, 25.0, 30.0],
+        }
+        results = sweep(self.factory, self.sequences, parameters, self.includes, processes=2)
+
+        # Non-scalar variables are not gathered
+        assert results.names == ["time", "rocket.a", "rocket.stage_1.tank.weight_prop"]
+        assert not results.errors
+
+        for run in range(3):
+            UniversalClock().reset()
+            sys = Station("sys")
+            sys.g_tank.fuel.w_out_max = parameters["g_tank.fuel.w_out_max"][run]
+            sys.rocket.stage_1.engine.perfo.isp = parameters["rocket.stage_1.engine.perfo.isp"][run]
+            sequences = [dict(seq) for seq in self.sequences]
+            sequences[0]["init"] = dict(
+                sequences[0]["init"], **{"g_tank.fuel.w_out_max": sys.g_tank.fuel.w_out_max}
+            )
+            data = run_sequences(sys, sequences, self.includes).recorder.export_data()
+
+            assert results.lengths[run] == len(data)
+            for name in results.names:
+                np.testing.assert_allclose(
+                    results.data(run)[name], np.asarray(data[name], dtype=float), atol=10 ** (-10)
+                )
+            np.testing.assert_allclose(results.final["rocket.a"][run], sys.rocket.a)
+
+    def test_errors(self):
+        parameters = {"time_int": np.array([5.0, "late"], dtype=object)}
+
+        with pytest.warns(UserWarning):
+            results = sweep(self.factory, self.sequences, parameters, ["rocket.a"], processes=1)
+
+        assert list(results.errors) == [1]
+        assert results.lengths[1] == 0
+        assert np.isnan(results.final["rocket.a"][1])
+
+        with pytest.warns(UserWarning, match="more than 2 rows"):
+            results = sweep(self.factory, self.sequences, parameters, ["rocket.a"], rows=2)
+        assert results.truncated[0]
+        assert len(results.data(0)) == 2
+
+    def test_command_line(self, tmp_path):
+        mission, grid = tmp_path / "mission.json", tmp_path / "grid.json"
+        mission.write_text(json.dumps(self.sequences))
+        grid.write_text(json.dumps({"rocket.stage_1.engine.perfo.isp": [20.0, 30.0]}))
+        output = tmp_path / "sweep.npz"
+
+        main([str(mission), str(grid), "-i", "rocket.v", "-o", str(output), "--processes", "2"])
+
+        results = SweepResults.load(output)
+        np.testing.assert_allclose(results.parameters["rocket.stage_1.engine.perfo.isp"], [20, 30])
+        assert results.names == ["time", "rocket.v"]
+        assert results.final["rocket.v"][1] > results.final["rocket.v"][0]
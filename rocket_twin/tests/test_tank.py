@@ -1,7 +1,11 @@
 import numpy as np
 from cosapp.drivers import RungeKutta
+from OCC.Core.TopAbs import TopAbs_SOLID
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopoDS import TopoDS_Compound
 
 from rocket_twin.systems import Tank
+from rocket_twin.utils import LazyShape, fuse_shapes, geometry_cache
 
 
 class TestTank:
@@ -38,6 +42,22 @@ class TestTank:
 
         np.testing.assert_allclose(sys.weight_prop, 0.0, atol=10 ** (-10))
 
+    def test_structure_reuse(self):
+        geometry_cache.clear()
+
+        sys = Tank("sys")
+        driver = sys.add_driver(RungeKutta(order=4, dt=0.1))
+        driver.time_interval = (0, 5)
+
+        init = {"w_in": 3.0, "fuel.w_out_max": 0.0, "fuel.weight_p": 0.0}
+
+        driver.set_scenario(init=init)
+
+        sys.run_drivers()
+
+        assert geometry_cache.stats()["misses"] == 1
+        assert geometry_cache.stats()["hits"] > 0
+
     def test_geometry(self):
         sys = Tank("sys")
         driver = sys.add_driver(RungeKutta(order=4, dt=0.1))
@@ -60,18 +80,106 @@ class TestTank:
 
         sys.run_drivers()
 
-        np.testing.assert_allclose(sys.props.Mass(), 3.7017, atol=10 ** (-2))
-
-        np.testing.assert_allclose(sys.props.CentreOfMass().X(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Y(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Z(), 0.31413, atol=10 ** (-2))
-
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().X(), 18.3849, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Y(), 18.3849, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Z(), 36.0101, atol=10 ** (-2)
-        )
+        np.testing.assert_allclose(sys.props.mass, 3.7017, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[2], 0.31413, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.inertia[0, 0], 18.3849, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[1, 1], 18.3849, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[2, 2], 36.0101, atol=10 ** (-2))
+
+    def test_shape(self):
+        sys = Tank("sys")
+        sys.fuel.weight_p = 1.0
+        sys.run_once()
+
+        # The structure and the fuel column are the two disjoint solids of a compound
+        shape = sys.geom.shape
+        assert isinstance(shape, TopoDS_Compound)
+        explorer = TopExp_Explorer(shape, TopAbs_SOLID)
+        n_solids = 0
+        while explorer.More():
+            n_solids += 1
+            explorer.Next()
+        assert n_solids == 2
+
+        # The compound is fused with the other models as a single solid would be
+        fusion = fuse_shapes([shape, sys.geom.create_structure(1.0, 1.5, 1.0, 0.1, 1.0)])
+        assert not fusion.IsNull()
+
+    def test_analytic(self):
+        sys = Tank("sys")
+
+        init = {
+            "geom.r_int": 3.0,
+            "geom.r_ext": 4.0,
+            "geom.thickness": 0.1,
+            "geom.height": 1.0,
+            "geom.rho_struct": 0.1,
+            "geom.rho_fuel": 0.2,
+            "fuel.weight_p": 1.0,
+            "geom.pos": 0.0,
+        }
+
+        for key, val in init.items():
+            sys[key] = val
+        sys.run_once()
+        props = sys.props
+
+        sys.geom.analytic = True
+        sys.run_once()
+
+        assert isinstance(sys.shape, LazyShape)
+        assert not sys.shape.built
+
+        np.testing.assert_allclose(sys.props.mass, props.mass, rtol=10 ** (-6))
+        np.testing.assert_allclose(sys.props.cg, props.cg, atol=10 ** (-6))
+        np.testing.assert_allclose(sys.props.inertia, props.inertia, atol=10 ** (-4))
+
+        assert sys.shape.shape is not None
+        assert sys.shape.built
+
+    def test_table(self):
+        geometry_cache.clear()
+
+        sys = Tank("sys")
+        init = {
+            "geom.r_int": 3.0,
+            "geom.r_ext": 4.0,
+            "geom.thickness": 0.1,
+            "geom.height": 1.0,
+            "geom.rho_struct": 0.1,
+            "geom.rho_fuel": 0.2,
+            "geom.pos": 0.0,
+        }
+        for key, val in init.items():
+            sys[key] = val
+
+        references = []
+        for weight in (0.0, 1.0, 2.5, 5.0):
+            sys.fuel.weight_p = weight
+            sys.run_once()
+            references.append(sys.props)
+
+        sys.geom.n_table = 11
+        sys.run_once()
+        misses = geometry_cache.stats()["misses"]
+
+        error = sys.geom.table_error
+        assert 0.0 < error < 10 ** (-2)
+
+        for weight, props in zip((0.0, 1.0, 2.5, 5.0), references):
+            sys.fuel.weight_p = weight
+            sys.run_once()
+
+            assert isinstance(sys.shape, LazyShape)
+            np.testing.assert_allclose(sys.props.mass, props.mass, rtol=10 ** (-6))
+            np.testing.assert_allclose(sys.props.cg, props.cg, atol=1.1 * error)
+            np.testing.assert_allclose(
+                sys.props.inertia, props.inertia, atol=error * np.abs(props.inertia).max()
+            )
+
+        # The fuel column is no longer modeled once the table is built
+        assert geometry_cache.stats()["misses"] == misses
@@ -0,0 +1,79 @@
+import json
+import struct
+
+import numpy as np
+
+from rocket_twin.systems import Stage
+from rocket_twin.utils import (
+    TessellationCache,
+    export_meshes,
+    fusion_cache,
+    geometry_cache,
+    mesh_system,
+    to_glb,
+)
+
+
+class TestTessellation:
+    """Tests for the tessellation cache and the mesh export."""
+
+    def test_cache(self):
+        cache = TessellationCache()
+        sys = Stage("sys")
+        sys.run_once()
+
+        meshes = mesh_system(sys, cache=cache)
+        assert cache.misses > 0
+        assert all(len(mesh) > 0 for mesh in meshes.values())
+
+        meshes2 = mesh_system(sys, cache=cache)
+        assert all(meshes2[name] is meshes[name] for name in meshes)
+
+        # Only the models depending on the fuel level are rebuilt by a new run
+        sys.run_once()
+        meshes3 = mesh_system(sys, cache=cache)
+        for name in ("sys.engine", "sys.engine.geom", "sys.tube"):
+            assert meshes3[name] is meshes[name]
+
+        for mesh in meshes.values():
+            assert mesh.triangles.max() < len(mesh.vertices)
+
+    def test_inputs(self):
+        cache = TessellationCache()
+        geometry_cache.clear()
+        fusion_cache.clear()
+        sys = Stage("sys")
+        sys.run_once()
+        meshes = mesh_system(sys, cache=cache)
+
+        # Models rebuilt from the same inputs are not meshed again
+        geometry_cache.clear()
+        sys2 = Stage("sys")
+        sys2.run_once()
+        assert sys2.engine.geom.shape is not sys.engine.geom.shape
+        assert cache.get(sys2.engine.geom.shape) is meshes["sys.engine.geom"]
+
+        # The fusions of models rebuilt at each step are not kept
+        assert geometry_cache.key_of(sys.shape) is None
+        assert len(fusion_cache) == 0
+
+    def test_export(self, tmp_path):
+        cache = TessellationCache()
+        sys = Stage("sys")
+        sys.run_once()
+        meshes = mesh_system(sys, cache=cache)
+
+        glb = to_glb(meshes)
+        magic, version, length = struct.unpack("<III", glb[:12])
+        assert magic == 0x46546C67
+        assert version == 2
+        assert length == len(glb)
+
+        size, _ = struct.unpack("<II", glb[12:20])
+        content = json.loads(glb[20 : 20 + size])
+        assert len(content["meshes"]) == len(meshes)
+
+        export_meshes(tmp_path / "stage.npz", meshes)
+        arrays = np.load(tmp_path / "stage.npz")
+        np.testing.assert_array_equal(arrays["sys/vertices"], meshes["sys"].vertices)
+        np.testing.assert_array_equal(arrays["sys/triangles"], meshes["sys"].triangles)
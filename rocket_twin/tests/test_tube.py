@@ -21,18 +21,12 @@ class TestTube:
 
         sys.run_once()
 
-        np.testing.assert_allclose(sys.props.Mass(), 2250 * np.pi, atol=10 ** (-2))
-
-        np.testing.assert_allclose(sys.props.CentreOfMass().X(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Y(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Z(), 4.5, atol=10 ** (-2))
-
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().X(), 13 * 2250 * np.pi, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Y(), 13 * 2250 * np.pi, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Z(), 12.5 * 2250 * np.pi, atol=10 ** (-2)
-        )
+        np.testing.assert_allclose(sys.props.mass, 2250 * np.pi, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[2], 4.5, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.inertia[0, 0], 13 * 2250 * np.pi, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[1, 1], 13 * 2250 * np.pi, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[2, 2], 12.5 * 2250 * np.pi, atol=10 ** (-2))
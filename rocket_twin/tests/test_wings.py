@@ -29,18 +29,32 @@ class TestWings:
 
         sys.run_drivers()
 
-        np.testing.assert_allclose(sys.props.Mass(), 2.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.mass, 2.0, atol=10 ** (-2))
 
-        np.testing.assert_allclose(sys.props.CentreOfMass().X(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Y(), 0.0, atol=10 ** (-2))
-        np.testing.assert_allclose(sys.props.CentreOfMass().Z(), 0.5, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.cg[2], 0.5, atol=10 ** (-2))
+
+        np.testing.assert_allclose(sys.props.inertia[0, 0], 1.01 / 6, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[1, 1], 5 / 6, atol=10 ** (-2))
+        np.testing.assert_allclose(sys.props.inertia[2, 2], 4.01 / 6, atol=10 ** (-2))
+
+    def test_rotated_copies(self):
+        sys = WingsGeom("sys")
+        sys.n = 1
+        sys.run_once()
+        mass = sys.props.mass
+
+        sys.n = 3
+        sys.run_once()
+
+        np.testing.assert_allclose(sys.props.mass, 3 * mass, rtol=10 ** (-6))
+
+        np.testing.assert_allclose(sys.props.cg[0], 0.0, atol=10 ** (-6))
+        np.testing.assert_allclose(sys.props.cg[1], 0.0, atol=10 ** (-6))
 
         np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().X(), 1.01 / 6, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Y(), 5 / 6, atol=10 ** (-2)
-        )
-        np.testing.assert_allclose(
-            sys.props.MatrixOfInertia().Diagonal().Z(), 4.01 / 6, atol=10 ** (-2)
+            sys.props.inertia[0, 0],
+            sys.props.inertia[1, 1],
+            rtol=10 ** (-6),
         )
@@ -1,3 +1,85 @@
+from rocket_twin.utils.array_recorder import ArrayRecorder
+from rocket_twin.utils.atmosphere import (
+    UniformTable,
+    environment_table,
+    gravity,
+    standard_atmosphere,
+)
+from rocket_twin.utils.ballistics import ConstantGravityArc, InverseSquareArc, spin
+from rocket_twin.utils.connectors import ElementConnector, ElementSourceConnector
+from rocket_twin.utils.disk_cache import DiskCache
+from rocket_twin.utils.dormand_prince import DormandPrince
+from rocket_twin.utils.geometry_cache import GeometryCache, fusion_cache, geometry_cache, model_key
+from rocket_twin.utils.lazy_solver import LazySolver
+from rocket_twin.utils.mass_properties import MassProperties
+from rocket_twin.utils.parquet_recorder import ParquetRecorder, Trajectory
+from rocket_twin.utils.recording_policy import (
+    Decimation,
+    EventsOnly,
+    OnChange,
+    RecordingPolicy,
+    SamplingRates,
+)
 from rocket_twin.utils.run_sequences import run_sequences
+from rocket_twin.utils.sequence_plan import SequencePlan, read_sequences
+from rocket_twin.utils.sequence_tree import TreeResults, run_tree, sequence_tree
+from rocket_twin.utils.shapes import LazyShape, fuse_shapes, resolve_shape
+from rocket_twin.utils.snapshot import Snapshot
+from rocket_twin.utils.sweep import SweepResults, parameter_grid, sweep
+from rocket_twin.utils.tessellation import (
+    Mesh,
+    TessellationCache,
+    export_meshes,
+    mesh_system,
+    tessellate,
+    tessellation_cache,
+    to_glb,
+)
 
-__all__ = ["run_sequences"]
+__all__ = [
+    "run_sequences",
+    "SequencePlan",
+    "read_sequences",
+    "run_tree",
+    "sequence_tree",
+    "TreeResults",
+    "DormandPrince",
+    "LazySolver",
+    "ElementConnector",
+    "ElementSourceConnector",
+    "LazyShape",
+    "resolve_shape",
+    "fuse_shapes",
+    "MassProperties",
+    "GeometryCache",
+    "geometry_cache",
+    "fusion_cache",
+    "model_key",
+    "DiskCache",
+    "Mesh",
+    "tessellate",
+    "TessellationCache",
+    "tessellation_cache",
+    "to_glb",
+    "export_meshes",
+    "mesh_system",
+    "ConstantGravityArc",
+    "InverseSquareArc",
+    "spin",
+    "gravity",
+    "standard_atmosphere",
+    "UniformTable",
+    "environment_table",
+    "sweep",
+    "SweepResults",
+    "parameter_grid",
+    "ParquetRecorder",
+    "Trajectory",
+    "ArrayRecorder",
+    "RecordingPolicy",
+    "Decimation",
+    "EventsOnly",
+    "OnChange",
+    "SamplingRates",
+    "Snapshot",
+]
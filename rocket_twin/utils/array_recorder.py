@@ -0,0 +1,297 @@
+import copy
+import functools
+import operator
+
+import numpy as np
+import pandas as pd
+from cosapp.core.eval_str import EvalString
+from cosapp.recorders.recorder import BaseRecorder, make_wishlist
+
+from rocket_twin.utils.recording_policy import RecordingPolicy
+
+
+class ArrayRecorder(BaseRecorder):
+    """Recorder writing its records in preallocated NumPy columns.
+
+    Each recorded variable is resolved once into an accessor of its port, and written in a
+    column grown geometrically. Numerical variables get a typed column, of the shape of their
+    value, other ones an object column. The section, status and error code are stored as
+    codes of their distinct values. The variables follow the patterns of the cosapp
+    `DataFrameRecorder`, and the export shares the memory of the columns. A record left out
+    by the policy is written in the next free row, and kept if an event follows.
+
+    Inputs
+    ------
+    includes, excludes: list[string],
+        patterns of the recorded and ignored variables
+    numerical_only: boolean,
+        whether only numerical variables are recorded
+    section: string,
+        current section name
+    precision: int,
+        precision digits of the floating point numbers
+    hold: boolean,
+        whether the records of the previous sessions are kept
+    raw_output: boolean,
+        whether the units are left out of the column names
+    capacity: int,
+        number of records allocated at first
+    policy: RecordingPolicy,
+        policy selecting the periodic records kept, all of them if None
+
+    Outputs
+    ------
+    """
+
+    def __init__(
+        self,
+        includes="*",
+        excludes=None,
+        numerical_only=False,
+        section="",
+        precision=9,
+        hold=False,
+        raw_output=True,
+        capacity=1024,
+        policy=None,
+    ):
+        super().__init__(includes, excludes, numerical_only, section, precision, hold, raw_output)
+        self.capacity = capacity
+        self.policy = RecordingPolicy() if policy is None else policy
+        self.__accessors = None
+        self.__time = None
+        self.__first = True
+        self.__reset()
+
+    @classmethod
+    def extend(cls, recorder, includes=[], excludes=[]):
+        """Return a recorder with the same options and extended patterns."""
+        new = cls(
+            recorder.includes + make_wishlist(includes, "includes"),
+            recorder.excludes + make_wishlist(excludes, "excludes"),
+            recorder._numerical_only,
+            recorder.section,
+            recorder.precision,
+            recorder.hold,
+            recorder._raw_output,
+            recorder.capacity,
+            recorder.policy,
+        )
+        new.watched_object = recorder.watched_object
+        return new
+
+    @BaseRecorder.watched_object.setter
+    def watched_object(self, module):
+        # Drivers set their owner again when they are added back to it
+        changed = module is not self.watched_object
+        BaseRecorder.watched_object.fset(self, module)
+        if changed:
+            self.__accessors = None
+            self.__reset()
+
+    def __len__(self):
+        return self.__length
+
+    def __reset(self):
+        """Drop the records, new columns being allocated for the next ones."""
+        self.__length = 0
+        self.__pending = False
+        self.__columns = None
+        self.__codes = [np.empty(self.capacity, dtype=np.int16) for _ in range(3)]
+        self.__categories = [{} for _ in range(3)]
+        self.__references = np.empty(self.capacity, dtype=object)
+
+    def accessors(self):
+        """Return the functions reading the recorded variables.
+
+        Outputs
+        ------
+        accessors: list[callable],
+            functions returning the value of each variable, in the order of `field_names`
+        """
+        if self.__accessors is None:
+            context = self.watched_object
+            accessors = []
+            for name in self.field_names():
+                reference = context.name2variable.get(name)
+                if reference is None:
+                    accessors.append(EvalString(name, context).eval)
+                else:
+                    accessors.append(
+                        functools.partial(operator.getitem, reference.mapping, reference.key)
+                    )
+            self.__accessors = accessors
+        return self.__accessors
+
+    def start(self):
+        """Initialize recording support."""
+        super().start()
+        if not self.hold:
+            self.__reset()
+        names = self.field_names()
+        self.__time = names.index("time") if "time" in names else None
+        self.__first = True
+        self.policy.bind(names)
+
+    def formatted_data(self):
+        """Collect recorded data from watched object into a list."""
+        return [copy.deepcopy(accessor()) for accessor in self.accessors()]
+
+    def record_state(self, time_ref, status="", error_code="0"):
+        """Record the watched object at the provided status.
+
+        Inputs
+        ------
+        time_ref: float or string,
+            current simulation time or point reference
+        status: string,
+            status of the simulation
+        error_code: string,
+            error code
+        """
+        if self.paused:
+            return
+
+        values = [accessor() for accessor in self.accessors()]
+        event = not str(time_ref).startswith("t=")
+        if event and self.__pending:
+            self.__commit()
+        if self.__columns is None:
+            self.__columns = [self.__column(value, self.capacity) for value in values]
+        n = self.__length
+        if n == len(self.__references):
+            self.__grow(2 * n)
+
+        for i, value in enumerate((self.section, status, error_code)):
+            categories = self.__categories[i]
+            self.__codes[i][n] = categories.setdefault(value, len(categories))
+        self.__references[n] = str(time_ref)
+        for i, (column, value) in enumerate(zip(self.__columns, values)):
+            if column.dtype == object:
+                column[n] = copy.deepcopy(value)
+                continue
+            try:
+                if column.dtype.kind in "biu" and np.result_type(column, value) != column.dtype:
+                    raise TypeError
+                column[n] = value
+            except (TypeError, ValueError):
+                self.__columns[i] = column = self.__promote(column, value)
+                column[n] = copy.deepcopy(value) if column.dtype == object else value
+
+        time = None if self.__time is None else values[self.__time]
+        if event or self.__first or self.policy.keep(time, values):
+            self.__length = n + 1
+            self.__first = self.__pending = False
+            self.policy.kept(time, values)
+        else:
+            self.__pending = True
+
+        self.state_recorded.emit(time_ref=time_ref, status=status, error_code=error_code)
+
+    def _record(self, line):
+        self.record_state(line[3], line[1], line[2])
+
+    def __commit(self):
+        """Keep the record left out by the policy."""
+        n = self.__length
+        values = [column[n] for column in self.__columns]
+        self.__length = n + 1
+        self.__pending = False
+        self.policy.kept(None if self.__time is None else values[self.__time], values)
+
+    @staticmethod
+    def __column(value, capacity):
+        """Allocate the column of a variable from its first value."""
+        array = np.asarray(value)
+        if array.dtype.kind in "biuf":
+            return np.empty((capacity,) + array.shape, dtype=array.dtype)
+        return np.empty(capacity, dtype=object)
+
+    def __promote(self, column, value):
+        """Widen a column to hold a value of another type or shape."""
+        n = self.__length
+        array = np.asarray(value)
+        if array.dtype.kind in "biuf" and array.shape == column.shape[1:]:
+            new = np.empty(column.shape, dtype=np.result_type(column, array))
+            new[:n] = column[:n]
+        else:
+            new = np.empty(len(column), dtype=object)
+            new[:n] = list(column[:n])
+        return new
+
+    def __grow(self, capacity):
+        """Reallocate the columns with a larger capacity."""
+        n = self.__length
+
+        def grown(column):
+            new = np.empty((capacity,) + column.shape[1:], dtype=column.dtype)
+            new[:n] = column[:n]
+            return new
+
+        self.__codes = [grown(codes) for codes in self.__codes]
+        self.__references = grown(self.__references)
+        self.__columns = [grown(column) for column in self.__columns]
+
+    def column(self, name):
+        """Return the recorded values of a variable, sharing the memory of the recorder.
+
+        Inputs
+        ------
+        name: string,
+            name of the variable
+
+        Outputs
+        ------
+        values: np.ndarray,
+            recorded values, with one row per record
+        """
+        if self.__columns is None:
+            return np.empty(0)
+        if self.__pending:
+            self.__commit()
+        return self.__columns[self.field_names().index(name)][: self.__length]
+
+    def headers(self):
+        """Return the names of the exported columns."""
+        headers = list(self.SPECIALS)
+        varlist = self.field_names()
+        if self._raw_output:
+            headers.extend(varlist)
+        else:
+            headers.extend(
+                f"{name} [{unit}]" for name, unit in zip(varlist, self._get_units(varlist))
+            )
+        return headers
+
+    def export_data(self):
+        """Export recorded results into a pandas.DataFrame object, without copying them.
+
+        The section, status and error code are exported as categorical columns, and the
+        variables of several dimensions as object columns of views of their records.
+        """
+        if self.__pending:
+            self.__commit()
+        n = self.__length
+        columns = [
+            pd.Categorical.from_codes(codes[:n], list(categories))
+            for codes, categories in zip(self.__codes, self.__categories)
+        ]
+        columns.append(self.__references[:n])
+        for column in self.__columns or [np.empty(0)] * len(self.field_names()):
+            column = column[:n]
+            columns.append(list(column) if column.ndim > 1 else column)
+        return pd.DataFrame(dict(zip(self.headers(), columns)), copy=False)
+
+    @property
+    def _raw_data(self):
+        return self.export_data().values.tolist()
+
+    def exit(self):
+        """Close recording session, keeping its last record."""
+        if self.__pending:
+            self.__commit()
+
+    def clear(self):
+        """Clear all previously stored data."""
+        self.__reset()
+        super().clear()
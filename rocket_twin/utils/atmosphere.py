@@ -0,0 +1,157 @@
+import numpy as np
+
+# Standard gravity and radius of the Earth
+G_0 = 9.80665
+RADIUS = 6.371e6
+
+# U.S. Standard Atmosphere 1976: base geopotential altitude [m] and lapse rate [K/m] of the layers
+LAYERS = [
+    (0.0, -0.0065),
+    (11000.0, 0.0),
+    (20000.0, 0.001),
+    (32000.0, 0.0028),
+    (47000.0, 0.0),
+    (51000.0, -0.0028),
+    (71000.0, -0.002),
+]
+GEOPOTENTIAL_RADIUS = 6.356766e6
+R_AIR = 287.053
+GAMMA = 1.4
+
+
+def gravity(altitude):
+    """Gravity acceleration of the Earth, decreasing with the inverse square of the distance.
+
+    Inputs
+    ------
+    altitude [m]: float or numpy.ndarray,
+        geometric altitude
+
+    Outputs
+    ------
+    g [m/s**2]: float or numpy.ndarray,
+        gravity acceleration, positive
+    """
+    return G_0 * (RADIUS / (RADIUS + np.asarray(altitude, dtype=float))) ** 2
+
+
+def standard_atmosphere(altitude):
+    """Evaluate the U.S. Standard Atmosphere 1976 up to 86 km.
+
+    Inputs
+    ------
+    altitude [m]: float or numpy.ndarray,
+        geometric altitude
+
+    Outputs
+    ------
+    T [K]: numpy.ndarray,
+        temperature
+    p [Pa]: numpy.ndarray,
+        pressure
+    rho [kg/m**3]: numpy.ndarray,
+        density
+    c [m/s]: numpy.ndarray,
+        speed of sound
+    """
+    altitude = np.asarray(altitude, dtype=float)
+    h = GEOPOTENTIAL_RADIUS * altitude / (GEOPOTENTIAL_RADIUS + altitude)
+
+    temperature = np.empty_like(h)
+    pressure = np.empty_like(h)
+
+    t_base, p_base = 288.15, 101325.0
+    bounds = [base for base, _ in LAYERS[1:]] + [np.inf]
+    for (base, lapse), top in zip(LAYERS, bounds):
+        layer = (h < top) if base == 0.0 else (h >= base) & (h < top)
+        dh = h[layer] - base
+        if lapse == 0.0:
+            temperature[layer] = t_base
+            pressure[layer] = p_base * np.exp(-G_0 * dh / (R_AIR * t_base))
+        else:
+            temperature[layer] = t_base + lapse * dh
+            pressure[layer] = p_base * (temperature[layer] / t_base) ** (-G_0 / (R_AIR * lapse))
+
+        # Conditions at the base of the next layer
+        if lapse == 0.0:
+            p_base *= np.exp(-G_0 * (top - base) / (R_AIR * t_base))
+        elif np.isfinite(top):
+            t_top = t_base + lapse * (top - base)
+            p_base *= (t_top / t_base) ** (-G_0 / (R_AIR * lapse))
+            t_base = t_top
+
+    density = pressure / (R_AIR * temperature)
+    speed = np.sqrt(GAMMA * R_AIR * temperature)
+    return temperature, pressure, density, speed
+
+
+class UniformTable:
+    """Lookup table of functions sampled at uniformly spaced abscissas.
+
+    The interpolation is linear and the abscissas outside the table are clamped to its
+    bounds. Since the abscissas are evenly spaced, the interval of a point is found by a
+    division rather than a search, for any number of points at once.
+
+    Inputs
+    ------
+    start: float,
+        first abscissa
+    step: float,
+        spacing of the abscissas
+    values: numpy.ndarray,
+        tabulated values, of shape (n, m) for m functions sampled at n abscissas
+    """
+
+    def __init__(self, start, step, values):
+        self.start = start
+        self.step = step
+        self.values = np.asarray(values, dtype=float)
+
+    @classmethod
+    def sample(cls, functions, start, stop, n):
+        """Tabulate functions between two bounds.
+
+        Inputs
+        ------
+        functions: list[callable],
+            vectorized functions of the abscissa, each returning one array or a tuple of
+            arrays, which are tabulated in order
+        start, stop: float,
+            bounds of the table
+        n: int,
+            number of abscissas
+
+        Outputs
+        ------
+        table: UniformTable,
+            the lookup table
+        """
+        x = np.linspace(start, stop, n)
+        columns = []
+        for function in functions:
+            value = function(x)
+            columns.extend(value if isinstance(value, tuple) else [value])
+        return cls(start, (stop - start) / (n - 1), np.stack(columns, -1))
+
+    def __call__(self, x):
+        """Interpolate the tabulated functions.
+
+        Inputs
+        ------
+        x: float or numpy.ndarray,
+            abscissas, of shape (...)
+
+        Outputs
+        ------
+        values: numpy.ndarray,
+            interpolated values, of shape (..., m)
+        """
+        u = np.clip((np.asarray(x, dtype=float) - self.start) / self.step, 0.0, None)
+        i = np.minimum(u.astype(int), len(self.values) - 2)
+        w = np.minimum(u - i, 1.0)[..., None]
+        return (1.0 - w) * self.values[i] + w * self.values[i + 1]
+
+
+# Temperature, pressure, density and speed of sound every 10 m up to 86 km, the gravity being
+# evaluated in closed form
+environment_table = UniformTable.sample([standard_atmosphere], 0.0, 86000.0, 8601)
@@ -0,0 +1,253 @@
+import numpy as np
+
+# Fraction of the potential energy below which a radial orbit is taken as a parabola
+PARABOLIC_ENERGY = 1e-8
+
+
+def sinh_minus(eta):
+    """Evaluate sinh(eta) - eta, with its series close to zero to avoid cancellation."""
+    eta = np.asarray(eta, dtype=float)
+    eta2 = eta**2
+    series = eta * eta2 / 6.0 * (1.0 + eta2 / 20.0 * (1.0 + eta2 / 42.0 * (1.0 + eta2 / 72.0)))
+    return np.where(np.abs(eta) < 0.1, series, np.sinh(eta) - eta)
+
+
+class ConstantGravityArc:
+    """Closed-form ballistic motion under a uniform gravity field.
+
+    Inputs
+    ------
+    t0 [s]: float,
+        initial time
+    position [m]: numpy.ndarray,
+        initial position, the ground being at z = 0
+    velocity [m/s]: numpy.ndarray,
+        initial velocity
+    gravity [m/s**2]: numpy.ndarray,
+        gravity acceleration
+
+    Outputs
+    ------
+    apogee_time [s]: float or None,
+        time of the highest point, None if the body is not climbing
+    impact_time [s]: float or None,
+        time of the ground impact, None if the body never falls back
+    """
+
+    def __init__(self, t0, position, velocity, gravity):
+        self.t0 = t0
+        self.position = np.array(position, dtype=float)
+        self.velocity = np.array(velocity, dtype=float)
+        self.gravity = np.array(gravity, dtype=float)
+
+        z, vz, gz = self.position[2], self.velocity[2], self.gravity[2]
+        self.apogee_time = t0 - vz / gz if vz > 0.0 and gz < 0.0 else None
+
+        self.impact_time = None
+        if gz < 0.0 and z >= 0.0:
+            duration = (vz + np.sqrt(vz**2 - 2.0 * gz * z)) / -gz
+            if duration > 0.0:
+                self.impact_time = t0 + duration
+
+    def state(self, t):
+        """Return the position and velocity at given times.
+
+        Inputs
+        ------
+        t [s]: float or numpy.ndarray,
+            times, of shape (...)
+
+        Outputs
+        ------
+        position [m]: numpy.ndarray,
+            positions, of shape (..., 3)
+        velocity [m/s]: numpy.ndarray,
+            velocities, of shape (..., 3)
+        """
+        dt = np.asarray(t, dtype=float)[..., None] - self.t0
+        position = self.position + self.velocity * dt + 0.5 * self.gravity * dt**2
+        velocity = self.velocity + self.gravity * dt
+        return position, velocity
+
+
+class InverseSquareArc:
+    """Closed-form vertical motion under an inverse-square gravity field.
+
+    The motion is radial, along the z axis: it follows a degenerate Kepler orbit, the
+    eccentric anomaly being the parameter of the closed-form solution. The orbit is an
+    ellipse below the escape energy, a hyperbola above it and a parabola at it. A body with a
+    horizontal velocity would follow a curved orbit, so it is rejected.
+
+    Inputs
+    ------
+    t0 [s]: float,
+        initial time
+    position [m]: numpy.ndarray,
+        initial position, the ground being at z = 0
+    velocity [m/s]: numpy.ndarray,
+        initial velocity, along the z axis
+    g_0 [m/s**2]: float,
+        gravity at the ground
+    radius [m]: float,
+        radius of the planet
+
+    Outputs
+    ------
+    apogee_time [s]: float or None,
+        time of the highest point, None if the body is not climbing or escapes
+    impact_time [s]: float or None,
+        time of the ground impact, None if the body escapes
+    """
+
+    def __init__(self, t0, position, velocity, g_0, radius):
+        self.t0 = t0
+        self.position = np.array(position, dtype=float)
+        self.velocity = np.array(velocity, dtype=float)
+        if not np.allclose(self.velocity[:2], 0.0):
+            raise ValueError(
+                f"Horizontal velocity {self.velocity[:2]} of a radial inverse-square arc"
+            )
+        self.mu = g_0 * radius**2
+        self.radius = radius
+
+        r0 = radius + self.position[2]
+        v0 = self.velocity[2]
+        energy = 0.5 * v0**2 - self.mu / r0
+        self.apogee_time = None
+
+        if abs(energy) <= PARABOLIC_ENERGY * self.mu / r0:
+            self.kind = "parabolic"
+            # r = |m|^(2/3), m growing linearly with time and negative while falling
+            self.n = 1.5 * np.sqrt(2.0 * self.mu)
+            self.m0 = np.copysign(r0**1.5, v0)
+            m_ground = -(radius**1.5)
+
+        elif energy < 0.0:
+            self.kind = "elliptic"
+            # Semi-major axis of the degenerate ellipse, the apogee being at r = 2 a
+            self.a = -self.mu / (2.0 * energy)
+            self.n = np.sqrt(self.mu / self.a**3)
+
+            eta0 = np.arccos(np.clip(1.0 - r0 / self.a, -1.0, 1.0))
+            if v0 < 0.0:
+                eta0 = 2.0 * np.pi - eta0
+            self.m0 = eta0 - np.sin(eta0)
+
+            if eta0 < np.pi:
+                self.apogee_time = t0 + (np.pi - self.m0) / self.n
+            eta_ground = 2.0 * np.pi - np.arccos(np.clip(1.0 - radius / self.a, -1.0, 1.0))
+            m_ground = eta_ground - np.sin(eta_ground)
+
+        else:
+            self.kind = "hyperbolic"
+            # r = a (cosh(eta) - 1) = 2 a sinh(eta / 2)**2, the anomaly being negative while
+            # falling
+            self.a = self.mu / (2.0 * energy)
+            self.n = np.sqrt(self.mu / self.a**3)
+
+            eta0 = np.copysign(2.0 * np.arcsinh(np.sqrt(0.5 * r0 / self.a)), v0)
+            self.m0 = sinh_minus(eta0)
+            m_ground = sinh_minus(-2.0 * np.arcsinh(np.sqrt(0.5 * radius / self.a)))
+
+        duration = (m_ground - self.m0) / self.n
+        self.impact_time = t0 + duration if duration > 0.0 else None
+
+    def anomaly(self, t):
+        """Solve Kepler's equation for the eccentric anomaly at given times.
+
+        The mean anomaly is monotonic in the eccentric anomaly, so the equation is solved
+        by a vectorized bisection, over one period for the ellipse.
+        """
+        mean = self.m0 + self.n * (np.asarray(t, dtype=float) - self.t0)
+        if self.kind == "parabolic":
+            return mean
+        if self.kind == "elliptic":
+            mean = np.clip(mean, 0.0, 2.0 * np.pi)
+            low = np.zeros_like(mean)
+            high = np.full_like(mean, 2.0 * np.pi)
+
+            def kepler(eta):
+                return eta - np.sin(eta)
+
+        else:
+            # |sinh(eta) - eta| >= |eta|**3 / 6 bounds the anomaly
+            high = np.cbrt(6.0 * mean)
+            low = np.zeros_like(mean)
+            low, high = np.minimum(low, high), np.maximum(low, high)
+
+            kepler = sinh_minus
+
+        for _ in range(100):
+            eta = 0.5 * (low + high)
+            below = kepler(eta) < mean
+            low = np.where(below, eta, low)
+            high = np.where(below, high, eta)
+        return 0.5 * (low + high)
+
+    def state(self, t):
+        """Return the position and velocity at given times.
+
+        Inputs
+        ------
+        t [s]: float or numpy.ndarray,
+            times, of shape (...)
+
+        Outputs
+        ------
+        position [m]: numpy.ndarray,
+            positions, of shape (..., 3)
+        velocity [m/s]: numpy.ndarray,
+            velocities, of shape (..., 3)
+        """
+        eta = self.anomaly(t)
+        if self.kind == "elliptic":
+            r = self.a * (1.0 - np.cos(eta))
+            vz = self.n * self.a**2 * np.sin(eta) / r
+        elif self.kind == "hyperbolic":
+            r = 2.0 * self.a * np.sinh(0.5 * eta) ** 2
+            vz = self.n * self.a / np.tanh(0.5 * eta)
+        else:
+            r = np.abs(eta) ** (2.0 / 3.0)
+            vz = np.sign(eta) * np.sqrt(2.0 * self.mu / r)
+
+        position = np.broadcast_to(self.position, eta.shape + (3,)).copy()
+        velocity = np.zeros(eta.shape + (3,))
+        position[..., 2] = r - self.radius
+        velocity[..., 2] = vz
+        return position, velocity
+
+
+def spin(q, omega, dt):
+    """Rotate attitude quaternions at a constant body angular rate.
+
+    Inputs
+    ------
+    q: numpy.ndarray,
+        unit quaternions (w, x, y, z), of shape (..., 4)
+    omega [rad/s]: numpy.ndarray,
+        angular rate in the body frame, of shape (3,)
+    dt [s]: float or numpy.ndarray,
+        elapsed times, of shape (...)
+
+    Outputs
+    ------
+    q: numpy.ndarray,
+        rotated quaternions, of shape (..., 4)
+    """
+    rate = np.linalg.norm(omega)
+    angle = 0.5 * rate * np.asarray(dt, dtype=float)
+    axis = omega / rate if rate > 0.0 else np.zeros(3)
+
+    # Product of q with the rotation quaternion (cos(angle), sin(angle) * axis)
+    w, x, y, z = np.moveaxis(np.asarray(q, dtype=float), -1, 0)
+    c, s = np.cos(angle), np.sin(angle)
+    a, b, d = axis[0] * s, axis[1] * s, axis[2] * s
+    return np.stack(
+        [
+            w * c - x * a - y * b - z * d,
+            w * a + x * c + y * d - z * b,
+            w * b - x * d + y * c + z * a,
+            w * d + x * b - y * a + z * c,
+        ],
+        -1,
+    )
@@ -0,0 +1,44 @@
+from cosapp.ports.connectors import BaseConnector
+
+
+class ElementConnector(BaseConnector):
+    """Connector of source variables to one element of sink array variables.
+
+    As any connector, it sets whole sink variables in the eyes of cosapp, which lets a single
+    connector set each of them: the other elements of the arrays are kept as they are.
+
+    Inputs
+    ------
+    index: int,
+        index of the element of the sink arrays set by the connector
+    """
+
+    def __init__(self, name, sink, source, mapping=None, index=0):
+        super().__init__(name, sink, source, mapping)
+        self.index = index
+
+    def transfer(self):
+        source, sink = self.source, self.sink
+
+        for target, origin in self._mapping.items():
+            getattr(sink, target)[self.index] = getattr(source, origin)
+
+
+class ElementSourceConnector(BaseConnector):
+    """Connector of one element of source array variables to sink variables.
+
+    Inputs
+    ------
+    index: int,
+        index of the element of the source arrays read by the connector
+    """
+
+    def __init__(self, name, sink, source, mapping=None, index=0):
+        super().__init__(name, sink, source, mapping)
+        self.index = index
+
+    def transfer(self):
+        source, sink = self.source, self.sink
+
+        for target, origin in self._mapping.items():
+            setattr(sink, target, getattr(source, origin)[self.index])
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from numbers import Real
+
+import numpy as np
+from OCC.Core.BRep import BRep_Builder
+from OCC.Core.BRepTools import breptools
+from OCC.Core.TopAbs import TopAbs_COMPOUND, TopAbs_SHELL, TopAbs_SOLID
+from OCC.Core.TopoDS import TopoDS_Shape, topods
+
+from rocket_twin.utils.mass_properties import MassProperties
+
+# Bumped whenever the layout of the entries changes
+FORMAT_VERSION = 1
+
+DOWNCASTS = {
+    TopAbs_COMPOUND: topods.Compound,
+    TopAbs_SOLID: topods.Solid,
+    TopAbs_SHELL: topods.Shell,
+}
+
+
+class DiskCache:
+    """On-disk cache of pyoccad models and their properties, shared between processes.
+
+    Each entry is a directory named after a hash of the cache key, holding the model in
+    BRep format and its properties. Entries are written in a temporary directory and then
+    renamed, so concurrent readers only ever see complete entries; concurrent writers of the
+    same entry simply keep the first one renamed.
+
+    Inputs
+    ------
+    directory: str,
+        directory of the cache, created if needed
+    max_size [B]: int,
+        disk budget of the cache, the least recently used entries being removed beyond it
+
+    Outputs
+    ------
+    hits: int,
+        number of entries read by this process
+    writes: int,
+        number of entries written by this process
+    """
+
+    def __init__(self, directory, max_size=2**30):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def cacheable(key):
+        """Whether a cache key only holds values with a stable text representation."""
+        kind, inputs = key
+        return isinstance(kind, str) and all(
+            isinstance(value, (Real, str, bool)) for value in inputs
+        )
+
+    def path(self, key):
+        """Return the directory of the entry of a cache key.
+
+        Inputs
+        ------
+        key: tuple,
+            cache key, made of the component type and its rounded inputs
+
+        Outputs
+        ------
+        path: str,
+            directory of the entry
+        """
+        digest = hashlib.sha256(repr((FORMAT_VERSION, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key[0]}-{digest[:32]}")
+
+    def load(self, key):
+        """Read an entry from the disk.
+
+        Inputs
+        ------
+        key: tuple,
+            cache key
+
+        Outputs
+        ------
+        entry: tuple or None,
+            (shape, props) tuple, None if the entry does not exist
+        """
+        path = self.path(key)
+        shape = TopoDS_Shape()
+        try:
+            with np.load(os.path.join(path, "props.npz")) as arrays:
+                props = MassProperties(arrays["mass"], arrays["cg"], arrays["inertia"])
+                has_shape = "has_shape" not in arrays.files or bool(arrays["has_shape"])
+            if not has_shape:
+                shape = None
+            elif not breptools.Read(shape, os.path.join(path, "shape.brep"), BRep_Builder()):
+                return None
+            # Mark the entry as recently used
+            os.utime(path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Missing, or removed by another process in the meantime
+            return None
+
+        self.hits += 1
+        if shape is None:
+            return None, props
+        downcast = DOWNCASTS.get(shape.ShapeType())
+        return (shape if downcast is None else downcast(shape)), props
+
+    def store(self, key, shape, props):
+        """Write an entry to the disk, unless another process already did.
+
+        Inputs
+        ------
+        key: tuple,
+            cache key
+        shape: TopoDS_Shape or None,
+            pyoccad model, None if the entry only holds properties
+        props: MassProperties,
+            model properties
+        """
+        path = self.path(key)
+        if os.path.isdir(path):
+            return
+
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            if shape is not None:
+                breptools.Write(shape, os.path.join(tmp, "shape.brep"))
+            np.savez(
+                os.path.join(tmp, "props.npz"),
+                mass=props.mass,
+                cg=props.cg,
+                inertia=props.inertia,
+                has_shape=shape is not None,
+            )
+            os.rename(tmp, path)
+        except OSError:
+            # The entry was written by another process first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self.writes += 1
+        self.evict()
+
+    def entries(self):
+        """Return the entries of the cache, from the least to the most recently used.
+
+        Outputs
+        ------
+        entries: list[tuple],
+            (path, size, last use time) of each entry
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith("."):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((path, size, os.stat(path).st_mtime))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self):
+        """Remove the least recently used entries beyond the disk budget."""
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries[:-1]:
+            if size <= self.max_size:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        for path, _, _ in self.entries():
+            self._remove(path)
+        self.hits = 0
+        self.writes = 0
+
+    def _remove(self, path):
+        # Renaming is atomic: readers either see the whole entry or nothing
+        tmp = os.path.join(self.directory, f".del-{os.getpid()}-{os.path.basename(path)}")
+        try:
+            os.rename(path, tmp)
+        except OSError:
+            return
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,379 @@
+from numbers import Number
+from typing import Optional
+
+import numpy as np
+from cosapp.drivers.time.interfaces import EventRecord, ExplicitTimeDriver
+from cosapp.multimode.discreteStepper import DiscreteStepper
+from cosapp.ports.enum import PortType
+from cosapp.recorders import DataFrameRecorder
+from cosapp.systems import System
+
+# Dormand-Prince 5(4) tableau, the last stage being evaluated at the fifth-order solution
+NODES = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+MATRIX = [
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+    np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+]
+ERROR = np.array([71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+# Fourth-order continuous extension of the scheme (Hairer, Norsett & Wanner)
+DENSE = np.array(
+    [
+        -12715105075 / 11282082432,
+        0.0,
+        87487479700 / 32700410799,
+        -10690763975 / 1880347072,
+        701980252875 / 199316789632,
+        -1453857185 / 822651844,
+        69997945 / 29380423,
+    ]
+)
+
+
+class DormandPrince(ExplicitTimeDriver):
+    """Time driver with an adaptive step, controlled by the Dormand-Prince 5(4) error estimate.
+
+    The time step `dt` is the first trial step of each run, the following ones being set by
+    the error estimate. The time loop is the one of `ExplicitTimeDriver`, each iteration
+    being one adaptive step: the recording times met within a step are evaluated on the
+    continuous extension of the scheme, so that the recorder keeps a fixed period without
+    shortening the steps.
+
+    The events are checked after each step, and located within the step by root finding on
+    the continuous extension of the scheme, so that the step size is set by the tolerances
+    only, and not by the accuracy required on the event times.
+
+    Inputs
+    ------
+    name: string,
+        the name of the driver
+    owner: System,
+        the system that owns the driver
+    rtol: float,
+        relative tolerance on the transients
+    atol: float,
+        absolute tolerance on the transients
+    dt_min [s]: float,
+        minimum time step, accepted whatever the error
+    dt_max [s]: float,
+        maximum time step
+
+    Outputs
+    ------
+    n_accepted: int,
+        number of accepted steps
+    n_rejected: int,
+        number of steps rejected and retried with a smaller step
+    n_evaluations: int,
+        number of evaluations of the system
+    """
+
+    def __init__(
+        self,
+        name: str = "DP",
+        owner: Optional["System"] = None,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        dt_min: float = 0.0,
+        dt_max: float = np.inf,
+        **options,
+    ):
+        super().__init__(name, owner, **options)
+        self.rtol = rtol
+        self.atol = atol
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+
+        self.n_accepted = 0
+        self.n_rejected = 0
+        self.n_evaluations = 0
+        self._problem = None
+        self._stepper = None
+        self._step = None
+        self._proposal = None
+        self._events = []
+        self._event_data = None
+        self._steps = []
+
+    @property
+    def event_data(self):
+        """pandas.DataFrame: event cascades occurring during the simulation"""
+        return self._event_data
+
+    @property
+    def recorded_events(self):
+        """list[EventRecord]: recorded event cascades"""
+        return self._events
+
+    @property
+    def recorded_dt(self):
+        """numpy.ndarray: time steps taken during the simulation"""
+        return np.asarray(self._steps)
+
+    def setup_run(self) -> None:
+        super().setup_run()
+        self._problem = self.owner.assembled_problem().transients
+        self._stepper = DiscreteStepper(self)
+
+    def _precompute(self):
+        super()._precompute()
+        self.n_accepted = 0
+        self.n_rejected = 0
+        self.n_evaluations = 0
+
+    def compute(self) -> None:
+        """Simulate the time evolution of the owner system over the time interval."""
+        if self.dt is None:
+            raise ValueError("Time step was not specified")
+        self._initialize()
+        stepper = self._stepper
+        stepper.reset()
+
+        t0, t_end = self.time_interval
+        t, h = t0, self.dt
+        self._set_time(t0)
+        self._events, self._steps = [], []
+
+        recorder = self._recorder
+        period = None if recorder is None else self.recording_period
+        eps = min(1e-8, self.dt / 100)
+        t_record = np.inf if recorder is None or period is None else t0
+        n_record = 0
+
+        options = {}
+        if recorder is not None:
+            options = {
+                attr: getattr(recorder, attr)
+                for attr in ("includes", "excludes", "section", "precision", "hold")
+            }
+        event_recorder = DataFrameRecorder(**options)
+        event_recorder.watched_object = self.owner
+
+        def record_data(stamp=None):
+            if recorder is not None:
+                recorder.record_state(
+                    stamp or f"t={float(self.time):.14}", self.status, self.error_code
+                )
+
+        def record_event(stamp=None):
+            event_recorder.record_state(
+                stamp or f"t={float(self.time):.14}", self.status, self.error_code
+            )
+
+        def record_within(t_stop):
+            # Recording times within the last step, evaluated on its continuous extension
+            nonlocal n_record, t_record
+            if t_record >= t_stop - eps:
+                return
+            stepper.sysview.interp = self.dense_output()
+            while t_record < t_stop - eps:
+                stepper.sysview.exec(t_record)
+                record_data()
+                n_record += 1
+                t_record = min(t0 + n_record * period, t_end)
+            stepper.sysview.exec(t_stop)
+
+        # The events sitting at zero at the start are only armed after the first step, past
+        # their root, so that they occur at their next crossing
+        for event in stepper.events():
+            if event.is_primitive and event.value() != 0.0:
+                event.reevaluate()
+                event.tick()
+
+        stopped = False
+        while not stopped:
+            if recorder is not None and period is None:
+                record_data()
+            elif abs(t - t_record) < eps:
+                record_data()
+                n_record += 1
+                t_record = min(t0 + n_record * period, t_end)
+            if t >= t_end - 1e-12 * max(1.0, abs(t_end)):
+                break
+
+            h = self._update_transients(min(h, self.dt_max, t_end - t))
+
+            if not stepper.event_detected():
+                record_within(t + h)
+                stepper.reevaluate_primitive_events()
+                stepper.shift()
+                self._steps.append(h)
+                t, h = t + h, self._proposal
+                continue
+
+            # Locate the first event on the continuous extension of the step, then go on
+            # from the event time, as the base driver does
+            stepper.set_data(interval=(t, t + h), interpol=self.dense_output())
+            occur = stepper.first_discrete_step()
+            record_within(occur.time)
+            record_data()
+            record_event()
+            stepper.reevaluate_primitive_events()
+            self.transition()
+            record_event(occur.event.contextual_name)
+            record = EventRecord(occur.time, [occur.event])
+            all_events = set(stepper.present_events())
+            stepper.tick()
+            stepper.set_events()
+
+            while stepper.event_detected():
+                events = stepper.discrete_step()
+                all_events.update(events)
+                self.transition()
+                record_event(", ".join(event.contextual_name for event in events))
+                stepper.tick()
+                stepper.set_events()
+
+            record.events.extend(all_events - {occur.event})
+            self._events.append(record)
+            for transient in self._transients.values():
+                transient.touch()
+            for event in record.events:
+                event.context.set_dirty(PortType.IN)
+            self._set_time(occur.time)
+            self._synch_transients()
+            record_data(occur.event.contextual_name)
+            stopped = any(event.final for event in all_events)
+            self._steps.append(occur.time - t)
+            t, h = occur.time, self._proposal
+
+        self._event_data = event_recorder.export_data()
+
+    def _update_transients(self, dt: Number) -> Number:
+        """Integrate the transients over one adaptive step, of at most `dt`.
+
+        The step is retried from the same initial state with a smaller size until its error
+        is acceptable, and the next trial step is kept for the following call.
+
+        Inputs
+        ------
+        dt [s]: float,
+            trial time step
+
+        Outputs
+        ------
+        h [s]: float,
+            time step taken, the system being evaluated at its end
+        """
+        transients = self._transients
+        problem = self._problem
+        t0, h = self.time, dt
+        if len(transients) == 0:
+            self._set_time(t0 + h)
+            self._step, self._proposal = (t0, h, {}), dt
+            return h
+
+        y0 = {name: np.array(x.value, dtype=float) for name, x in transients.items()}
+        stages = [{name: np.array(x.d_dt, dtype=float) for name, x in transients.items()}]
+        # Values and derivatives of the system transients, for the continuous extension
+        start = {name: np.array(x.value, dtype=float) for name, x in problem.items()}
+        rates = [{name: np.array(x.d_dt, dtype=float) for name, x in problem.items()}]
+
+        while True:
+            for node, row in zip(NODES[1:], MATRIX):
+                for name, x in transients.items():
+                    x.value = y0[name] + h * sum(
+                        coef * stage[name] for coef, stage in zip(row, stages)
+                    )
+                self._set_time(t0 + node * h)
+                self.n_evaluations += 1
+                stages.append(
+                    {name: np.array(x.d_dt, dtype=float) for name, x in transients.items()}
+                )
+                rates.append({name: np.array(x.d_dt, dtype=float) for name, x in problem.items()})
+
+            error = self.error_norm(y0, stages, h)
+            factor = min(5.0, max(0.2, 0.9 * error ** (-0.2))) if error > 0.0 else 5.0
+
+            if error <= 1.0 or h <= self.dt_min:
+                self.n_accepted += 1
+                self._proposal = min(max(h * factor, self.dt_min), self.dt_max)
+                break
+
+            self.n_rejected += 1
+            h = max(h * factor, self.dt_min)
+            del stages[1:], rates[1:]
+
+        self._step = (t0, h, self.extension(start, rates, h))
+        return h
+
+    def extension(self, y0, rates, h):
+        """Coefficients of the continuous extension of a step, for the system transients.
+
+        Inputs
+        ------
+        y0: dict[str, numpy.ndarray],
+            transients at the beginning of the step
+        rates: list[dict[str, numpy.ndarray]],
+            derivatives of the transients at the seven stages
+        h [s]: float,
+            time step
+
+        Outputs
+        ------
+        coefs: dict[str, tuple[numpy.ndarray]],
+            the five coefficients of the quartic polynomial of each transient, and its value
+            at the end of the step
+        """
+        coefs = {}
+        for name, x in self._problem.items():
+            end = np.array(x.value, dtype=float)
+            delta = end - y0[name]
+            first = h * rates[0][name] - delta
+            last = delta - h * rates[-1][name] - first
+            extra = h * sum(coef * rate[name] for coef, rate in zip(DENSE, rates))
+            coefs[name] = (y0[name], delta, first, last, extra, end)
+        return coefs
+
+    def dense_output(self):
+        """Interpolants of the system transients over the last step.
+
+        Outputs
+        ------
+        interpolants: dict[str, callable],
+            functions of time returning the value of each transient, the end of the step
+            giving back the state it reached
+        """
+        t0, h, coefs = self._step
+
+        def interpolant(name):
+            y0, delta, first, last, extra, end = coefs[name]
+
+            def value(t):
+                if t >= t0 + h:
+                    return end.copy()
+                s = (t - t0) / h
+                return y0 + s * (delta + (1 - s) * (first + s * (last + (1 - s) * extra)))
+
+            return value
+
+        return {name: interpolant(name) for name in self._problem}
+
+    def error_norm(self, y0, stages, h):
+        """Root mean square of the embedded error estimate, scaled by the tolerances.
+
+        Inputs
+        ------
+        y0: dict[str, numpy.ndarray],
+            transients at the beginning of the step
+        stages: list[dict[str, numpy.ndarray]],
+            derivatives of the transients at the seven stages
+        h [s]: float,
+            time step
+
+        Outputs
+        ------
+        error: float,
+            scaled error, the step being accepted below 1
+        """
+        squares, size = 0.0, 0
+        for name, x in self._transients.items():
+            y1 = np.asarray(x.value, dtype=float)
+            delta = h * sum(coef * stage[name] for coef, stage in zip(ERROR, stages))
+            scale = self.atol + self.rtol * np.maximum(np.abs(y0[name]), np.abs(y1))
+            squares += np.sum((delta / scale) ** 2)
+            size += np.size(delta)
+        return np.sqrt(squares / size)
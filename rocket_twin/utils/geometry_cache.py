@@ -0,0 +1,236 @@
+import os
+from collections import OrderedDict
+from numbers import Real
+
+from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_VERTEX
+from OCC.Core.TopExp import TopExp_Explorer
+
+from rocket_twin.utils.disk_cache import DiskCache
+
+# Approximate memory footprint of each topological entity, in bytes
+ENTITY_SIZES = {TopAbs_FACE: 2048, TopAbs_EDGE: 512, TopAbs_VERTEX: 128}
+
+
+def estimate_size(shape):
+    """Estimate the memory footprint of a pyoccad model from its topology.
+
+    Inputs
+    ------
+    shape: TopoDS_Shape,
+        pyoccad model
+
+    Outputs
+    ------
+    size [B]: int,
+        approximate memory footprint
+    """
+    size = 0
+    for kind, entity_size in ENTITY_SIZES.items():
+        explorer = TopExp_Explorer(shape, kind)
+        while explorer.More():
+            size += entity_size
+            explorer.Next()
+    return size
+
+
+class GeometryCache:
+    """Process-wide LRU cache of pyoccad models and their properties.
+
+    Models are keyed on the type of component that built them and on their inputs,
+    rounded to a given number of significant digits. Models missing from memory are looked
+    up in an optional on-disk cache before being built, and then written to it.
+
+    Inputs
+    ------
+    max_size [B]: int,
+        memory budget of the cache
+    precision: int,
+        number of significant digits of the inputs in the keys
+    disk: DiskCache,
+        on-disk cache shared between processes, disabled if None
+
+    Outputs
+    ------
+    hits: int,
+        number of models found in the cache
+    misses: int,
+        number of models built
+    evictions: int,
+        number of models removed to stay within the budget
+    """
+
+    def __init__(self, max_size=256 * 2**20, precision=12, disk=None):
+        self.max_size = max_size
+        self.precision = precision
+        self.disk = disk
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._keys = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def key_of(self, shape):
+        """Return the cache key of a model held by the cache.
+
+        Inputs
+        ------
+        shape: TopoDS_Shape,
+            pyoccad model
+
+        Outputs
+        ------
+        key: tuple,
+            cache key of the model, None if it is not in the cache
+        """
+        key = self._keys.get(id(shape))
+        if key is None or self._entries[key][0] is not shape:
+            return None
+        return key
+
+    def key(self, kind, inputs):
+        """Build the cache key of a component from its inputs.
+
+        Inputs
+        ------
+        kind: str,
+            type of component
+        inputs: tuple,
+            inputs of the component
+
+        Outputs
+        ------
+        key: tuple,
+            cache key
+        """
+        rounded = tuple(
+            float(f"{value:.{self.precision}g}") if isinstance(value, Real) else value
+            for value in inputs
+        )
+        return (kind, rounded)
+
+    def get(self, kind, builder, *inputs):
+        """Return the model and properties of a component, building them if needed.
+
+        Inputs
+        ------
+        kind: str,
+            type of component
+        builder: callable,
+            function returning a (shape, props) tuple from the inputs, the shape being None
+            for entries that only hold properties
+        inputs: tuple,
+            inputs of the component
+
+        Outputs
+        ------
+        shape: TopoDS_Shape or None,
+            pyoccad model
+        props: MassProperties,
+            model properties
+        """
+        if not self.enabled:
+            return builder(*inputs)
+
+        key = self.key(kind, inputs)
+        try:
+            shape, props, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return shape, props
+
+        shape, props = self._load_or_build(key, builder, inputs)
+        size = 0 if shape is None else estimate_size(shape)
+        self._entries[key] = (shape, props, size)
+        if shape is not None:
+            self._keys[id(shape)] = key
+        self.size += size
+        self._evict()
+
+        return shape, props
+
+    def _load_or_build(self, key, builder, inputs):
+        disk = self.disk if self.disk is not None and DiskCache.cacheable(key) else None
+
+        entry = None if disk is None else disk.load(key)
+        if entry is None:
+            entry = builder(*inputs)
+            if disk is not None:
+                disk.store(key, *entry)
+
+        return entry
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it exceeds the budget alone
+        while self.size > self.max_size and len(self._entries) > 1:
+            _, (shape, _, size) = self._entries.popitem(last=False)
+            self._keys.pop(id(shape), None)
+            self.size -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all models and reset the statistics."""
+        self._entries.clear()
+        self._keys.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Outputs
+        ------
+        stats: dict,
+            number of hits, misses, disk hits, evictions and entries, hit rate and memory
+            footprint
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "disk_hits": 0 if self.disk is None else self.disk.hits,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_size": self.max_size,
+        }
+
+
+geometry_cache = GeometryCache()
+
+# Fusions of cached models, kept apart so that they never evict the models of the components
+fusion_cache = GeometryCache(max_size=64 * 2**20)
+
+# Workers of a sweep share their models by pointing this variable to a common directory
+if os.environ.get("ROCKET_TWIN_GEOMETRY_CACHE"):
+    geometry_cache.disk = DiskCache(os.environ["ROCKET_TWIN_GEOMETRY_CACHE"])
+
+
+def model_key(shape):
+    """Return the key of the inputs of a model built by the shared caches.
+
+    Inputs
+    ------
+    shape: TopoDS_Shape,
+        pyoccad model
+
+    Outputs
+    ------
+    key: tuple,
+        cache key of the model, None if it was not built by the caches
+    """
+    key = geometry_cache.key_of(shape)
+    return fusion_cache.key_of(shape) if key is None else key
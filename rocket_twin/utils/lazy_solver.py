@@ -0,0 +1,40 @@
+from typing import Optional
+
+from cosapp.drivers import NonLinearSolver
+from cosapp.systems import System
+
+
+class LazySolver(NonLinearSolver):
+    """Non-linear solver which evaluates the system directly when it has nothing to solve.
+
+    The mathematical problem is assembled at each setup of the solver, that is at the start
+    of each run and after each transition of the system modes. As long as it has no unknowns
+    nor equations, the system graph is run without the solver machinery; the solver is used
+    again as soon as unknowns appear.
+
+    Inputs
+    ------
+    name: string,
+        the name of the driver
+    owner: System,
+        the system that owns the driver
+
+    Outputs
+    ------
+    bypassed: boolean,
+        whether the last setup found an empty problem
+    """
+
+    def __init__(self, name: str, owner: Optional["System"] = None, **options):
+        super().__init__(name, owner, **options)
+        self.bypassed = False
+
+    def setup_run(self) -> None:
+        super().setup_run()
+        self.bypassed = self.problem.is_empty() and not self.children and self._recorder is None
+
+    def run_once(self) -> None:
+        if self.bypassed and self.is_active():
+            self.owner.run_children_drivers()
+        else:
+            super().run_once()
@@ -0,0 +1,201 @@
+import numpy as np
+
+
+def center_of_gravity(mass, moment):
+    """Divide first moments by masses, massless bodies being centered on the origin."""
+    return np.divide(
+        moment, mass[..., None], out=np.zeros_like(moment), where=mass[..., None] != 0.0
+    )
+
+
+def transport(mass, offset):
+    """Inertia of point masses about a point at a given offset from them."""
+    square = np.einsum("...i,...i->...", offset, offset)
+    return mass[..., None, None] * (
+        square[..., None, None] * np.eye(3) - offset[..., :, None] * offset[..., None, :]
+    )
+
+
+class MassProperties:
+    """Mass properties of a rigid body, or of a batch of rigid bodies.
+
+    All attributes may carry leading batch dimensions, in which case each index describes
+    an independent body. Instances are exchanged between systems and must be treated as
+    immutable: operations always return new instances.
+
+    Inputs
+    ------
+    mass [kg]: float or numpy.ndarray,
+        mass, of shape (...)
+    cg [m]: numpy.ndarray,
+        center of gravity, of shape (..., 3)
+    inertia [kg*m**2]: numpy.ndarray,
+        inertia matrix about the center of gravity, of shape (..., 3, 3)
+    """
+
+    __slots__ = ("mass", "cg", "inertia")
+
+    def __init__(self, mass=0.0, cg=None, inertia=None):
+        self.mass = np.asarray(mass, dtype=float)
+        shape = self.mass.shape
+        self.cg = np.zeros(shape + (3,)) if cg is None else np.asarray(cg, dtype=float)
+        self.inertia = (
+            np.zeros(shape + (3, 3)) if inertia is None else np.asarray(inertia, dtype=float)
+        )
+
+    def __repr__(self):
+        return f"MassProperties(mass={self.mass!r}, cg={self.cg!r}, inertia={self.inertia!r})"
+
+    def __getstate__(self):
+        return self.mass, self.cg, self.inertia
+
+    def __setstate__(self, state):
+        self.mass, self.cg, self.inertia = state
+
+    @classmethod
+    def from_gprops(cls, gprops, density=1.0):
+        """Create mass properties from OCC volume properties.
+
+        Inputs
+        ------
+        gprops: GProp_GProps,
+            volume properties of a pyoccad model
+        density [kg/m**3]: float,
+            density of the model
+
+        Outputs
+        ------
+        props: MassProperties,
+            mass properties of the model
+        """
+        center = gprops.CentreOfMass()
+        matrix = gprops.MatrixOfInertia()
+        inertia = [[matrix.Value(i, j) for j in range(1, 4)] for i in range(1, 4)]
+
+        return cls(
+            gprops.Mass() * density,
+            [center.X(), center.Y(), center.Z()],
+            np.multiply(inertia, density),
+        )
+
+    @classmethod
+    def combine(cls, items):
+        """Aggregate the properties of several bodies with the parallel-axis theorem.
+
+        Inputs
+        ------
+        items: list[MassProperties],
+            properties of each body, with identical batch shapes
+
+        Outputs
+        ------
+        props: MassProperties,
+            properties of the assembly
+        """
+        if not items:
+            return cls()
+        return cls.stack(items).sum(axis=0)
+
+    @classmethod
+    def stack(cls, items):
+        """Gather the properties of several bodies along a new leading batch axis.
+
+        Inputs
+        ------
+        items: list[MassProperties],
+            properties of each body, with identical batch shapes
+
+        Outputs
+        ------
+        props: MassProperties,
+            batch of properties
+        """
+        return cls(
+            np.stack([item.mass for item in items]),
+            np.stack([item.cg for item in items]),
+            np.stack([item.inertia for item in items]),
+        )
+
+    def sum(self, axis=0):
+        """Aggregate the bodies along a batch axis with the parallel-axis theorem.
+
+        Inputs
+        ------
+        axis: int,
+            batch axis along which the bodies are assembled
+
+        Outputs
+        ------
+        props: MassProperties,
+            properties of the assemblies
+        """
+        axis = axis % self.mass.ndim
+        mass = self.mass.sum(axis=axis)
+        cg = center_of_gravity(mass, np.sum(self.mass[..., None] * self.cg, axis=axis))
+
+        offset = self.cg - np.expand_dims(cg, axis)
+        inertia = np.sum(self.inertia + transport(self.mass, offset), axis=axis)
+
+        return MassProperties(mass, cg, inertia)
+
+    def moments(self):
+        """Return the moments of the bodies about the origin.
+
+        Unlike the center of gravity and the central inertia, these moments are linear in
+        the mass distribution, and may therefore be interpolated.
+
+        Outputs
+        ------
+        mass [kg]: numpy.ndarray,
+            mass, of shape (...)
+        moment [kg*m]: numpy.ndarray,
+            first moment, of shape (..., 3)
+        inertia [kg*m**2]: numpy.ndarray,
+            inertia matrix about the origin, of shape (..., 3, 3)
+        """
+        return (
+            self.mass,
+            self.mass[..., None] * self.cg,
+            self.inertia + transport(self.mass, self.cg),
+        )
+
+    @classmethod
+    def from_moments(cls, mass, moment, inertia):
+        """Create mass properties from moments about the origin.
+
+        Inputs
+        ------
+        mass [kg]: numpy.ndarray,
+            mass, of shape (...)
+        moment [kg*m]: numpy.ndarray,
+            first moment, of shape (..., 3)
+        inertia [kg*m**2]: numpy.ndarray,
+            inertia matrix about the origin, of shape (..., 3, 3)
+
+        Outputs
+        ------
+        props: MassProperties,
+            mass properties, with the inertia about the center of gravity
+        """
+        mass = np.asarray(mass, dtype=float)
+        cg = center_of_gravity(mass, np.asarray(moment, dtype=float))
+        return cls(mass, cg, inertia - transport(mass, cg))
+
+    def __add__(self, other):
+        return MassProperties.combine([self, other])
+
+    def scaled(self, factor):
+        """Scale the mass and inertia, the center of gravity being unchanged.
+
+        Inputs
+        ------
+        factor: float or numpy.ndarray,
+            scaling factor, such as a density for unit-density properties
+
+        Outputs
+        ------
+        props: MassProperties,
+            scaled properties
+        """
+        factor = np.asarray(factor, dtype=float)
+        return MassProperties(self.mass * factor, self.cg, self.inertia * factor[..., None, None])
@@ -0,0 +1,287 @@
+import copy
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from cosapp.recorders.recorder import BaseRecorder, make_wishlist
+
+from rocket_twin.utils.recording_policy import RecordingPolicy
+
+
+class Trajectory:
+    """Lazy reader of records written in Parquet files, read one after the other.
+
+    Nothing is read before the records are requested, and the files are stitched without
+    copying their columns.
+
+    Inputs
+    ------
+    files: list[string],
+        Parquet files, in the order of the records
+
+    Outputs
+    ------
+    """
+
+    def __init__(self, files):
+        self.files = list(files)
+
+    def __len__(self):
+        return sum(pq.ParquetFile(file).metadata.num_rows for file in self.files)
+
+    def __getitem__(self, column):
+        return self.table([column]).column(0).to_numpy()
+
+    @property
+    def columns(self):
+        """Names of the recorded columns."""
+        return pq.read_schema(self.files[0]).names if self.files else []
+
+    def batches(self, columns=None):
+        """Iterate over the records, one row group at a time.
+
+        Inputs
+        ------
+        columns: list[string],
+            columns read, all of them if None
+
+        Outputs
+        ------
+        batch: pyarrow.RecordBatch,
+            records of a row group
+        """
+        for file in self.files:
+            parquet = pq.ParquetFile(file)
+            for group in range(parquet.num_row_groups):
+                yield from parquet.read_row_group(group, columns=columns).to_batches()
+
+    def table(self, columns=None):
+        """Read the records.
+
+        Inputs
+        ------
+        columns: list[string],
+            columns read, all of them if None
+
+        Outputs
+        ------
+        table: pyarrow.Table,
+            the records, made of one chunk per row group, the types of the files being
+            promoted to common ones
+        """
+        tables = [pq.read_table(file, columns=columns) for file in self.files]
+        if not tables:
+            return pa.table({name: [] for name in columns or []})
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def to_pandas(self, columns=None):
+        """Read the records in a DataFrame."""
+        return self.table(columns).to_pandas()
+
+
+class ParquetRecorder(BaseRecorder):
+    """Recorder streaming its records to Parquet files.
+
+    The records are buffered and written as a row group every `buffer_size` records, each
+    recording session writing its own file in the directory. The variables follow the
+    patterns of the cosapp `DataFrameRecorder`, and the section, status and error code are
+    dictionary-encoded. The types of the columns are inferred from the records, and a new
+    file is started whenever a buffer needs wider types than the current file, such as
+    floats after integers. Only the files written by the recorder are ever removed.
+
+    Inputs
+    ------
+    directory: string,
+        directory of the Parquet files, created if needed
+    includes, excludes: list[string],
+        patterns of the recorded and ignored variables
+    numerical_only: boolean,
+        whether only numerical variables are recorded
+    section: string,
+        current section name
+    precision: int,
+        precision digits of the floating point numbers
+    hold: boolean,
+        whether the records of the previous sessions are kept
+    raw_output: boolean,
+        whether the units are left out of the column names
+    buffer_size: int,
+        number of records held in memory before being written
+    policy: RecordingPolicy,
+        policy selecting the periodic records kept, all of them if None
+
+    Outputs
+    ------
+    files: list[string],
+        Parquet files written, in the order of the records
+    """
+
+    def __init__(
+        self,
+        directory,
+        includes="*",
+        excludes=None,
+        numerical_only=False,
+        section="",
+        precision=9,
+        hold=False,
+        raw_output=True,
+        buffer_size=1024,
+        policy=None,
+    ):
+        super().__init__(includes, excludes, numerical_only, section, precision, hold, raw_output)
+        self.directory = os.fspath(directory)
+        self.buffer_size = buffer_size
+        self.policy = RecordingPolicy() if policy is None else policy
+        self.files = []
+        self.__buffer = []
+        self.__pending = None
+        self.__time = None
+        self.__first = True
+        self.__schema = None
+        self.__writer = None
+        self.__started = False
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def extend(cls, recorder, includes=[], excludes=[]):
+        """Return a recorder writing in the same directory, with extended patterns."""
+        new = cls(
+            recorder.directory,
+            recorder.includes + make_wishlist(includes, "includes"),
+            recorder.excludes + make_wishlist(excludes, "excludes"),
+            recorder._numerical_only,
+            recorder.section,
+            recorder.precision,
+            recorder.hold,
+            recorder._raw_output,
+            recorder.buffer_size,
+            recorder.policy,
+        )
+        new.watched_object = recorder.watched_object
+        return new
+
+    def headers(self):
+        """Return the names of the recorded columns."""
+        headers = list(self.SPECIALS)
+        varlist = self.field_names()
+        if self._raw_output:
+            headers.extend(varlist)
+        else:
+            headers.extend(
+                f"{name} [{unit}]" for name, unit in zip(varlist, self._get_units(varlist))
+            )
+        return headers
+
+    def start(self):
+        """Initialize recording support."""
+        super().start()
+        if not self.hold or not self.__started:
+            self.__remove()
+        self.__started = True
+        names = self.field_names()
+        self.__time = names.index("time") if "time" in names else None
+        self.__first = True
+        self.policy.bind(names)
+
+    def formatted_data(self):
+        """Collect recorded data from watched object into a list."""
+        return [copy.deepcopy(value) for value in self.collected_data()]
+
+    def _record(self, line):
+        event = not line[3].startswith("t=")
+        if event and self.__pending is not None:
+            self.__keep(self.__pending)
+
+        values = line[4:]
+        time = None if self.__time is None else values[self.__time]
+        if event or self.__first or self.policy.keep(time, values):
+            self.__first = False
+            self.__keep(line)
+        else:
+            self.__pending = line
+
+    def __keep(self, line):
+        """Buffer a record kept, writing the buffer once full."""
+        self.__pending = None
+        self.__buffer.append(line)
+        values = line[4:]
+        self.policy.kept(None if self.__time is None else values[self.__time], values)
+        if len(self.__buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records as a row group."""
+        if not self.__buffer:
+            return
+
+        columns = [pa.array(column) for column in zip(*self.__buffer)]
+        # Section, status and error code take few distinct values
+        columns[:3] = [column.dictionary_encode() for column in columns[:3]]
+        table = pa.Table.from_arrays(columns, names=self.headers())
+        schema = table.schema
+        if self.__schema is not None:
+            schema = pa.unify_schemas([self.__schema, schema], promote_options="permissive")
+            if not schema.equals(self.__schema) and self.__writer is not None:
+                self.__writer.close()
+                self.__writer = None
+        self.__schema = schema
+        table = table.cast(schema)
+
+        if self.__writer is None:
+            index = len(self.files)
+            file = os.path.join(self.directory, f"part-{index:05d}.parquet")
+            # Files of other recorders or runs in the directory are left as they are
+            while os.path.exists(file):
+                index += 1
+                file = os.path.join(self.directory, f"part-{index:05d}.parquet")
+            self.__writer = pq.ParquetWriter(file, schema)
+            self.files.append(file)
+        self.__writer.write_table(table)
+        self.__buffer.clear()
+
+    def exit(self):
+        """Close recording session, keeping its last record."""
+        if self.__pending is not None:
+            self.__keep(self.__pending)
+        self.flush()
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+    def trajectory(self):
+        """Return a lazy reader of the records, closing the current file.
+
+        Outputs
+        ------
+        trajectory: Trajectory,
+            reader of the records
+        """
+        self.exit()
+        return Trajectory(self.files)
+
+    def export_data(self):
+        """Export recorded results into a pandas.DataFrame object."""
+        return self.trajectory().to_pandas()
+
+    @property
+    def _raw_data(self):
+        return self.export_data().values.tolist()
+
+    def clear(self):
+        """Clear all previously stored data."""
+        self.__remove()
+        super().clear()
+
+    def __remove(self):
+        """Remove the records held in memory and the files written by the recorder."""
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+        for file in self.files:
+            if os.path.exists(file):
+                os.remove(file)
+        self.files.clear()
+        self.__buffer.clear()
+        self.__pending = None
+        self.__schema = None
@@ -0,0 +1,153 @@
+import numpy as np
+
+
+class RecordingPolicy:
+    """Policy selecting the periodic records kept by a recorder, all of them by default.
+
+    The first and last records of a session, the records of the events and the records
+    preceding them are kept whatever the policy, so that the state may be interpolated
+    between the kept records and across the discontinuities. The decisions only depend on
+    the recorded values, so that a run always keeps the same records.
+    """
+
+    def bind(self, names):
+        """Start a recording session.
+
+        Inputs
+        ------
+        names: list[string],
+            recorded variables
+        """
+
+    def keep(self, time, values):
+        """Whether a periodic record is kept.
+
+        Inputs
+        ------
+        time [s]: float,
+            time of the record
+        values: list,
+            recorded values, in the order of the variables
+
+        Outputs
+        ------
+        keep: boolean,
+            whether the record is kept
+        """
+        return True
+
+    def kept(self, time, values):
+        """Notify the policy of a record kept, by the policy or not."""
+
+
+class Decimation(RecordingPolicy):
+    """Policy keeping every k-th periodic record.
+
+    Inputs
+    ------
+    k: int,
+        ratio between the number of periodic records and the number of kept ones
+    """
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError(f"Decimation ratio must be a positive integer, got {k!r}")
+        self.k = k
+        self.count = 0
+
+    def bind(self, names):
+        self.count = 0
+
+    def keep(self, time, values):
+        self.count += 1
+        return self.count % self.k == 0
+
+
+class EventsOnly(RecordingPolicy):
+    """Policy keeping the records of the events only, with their neighbours."""
+
+    def keep(self, time, values):
+        return False
+
+
+class OnChange(RecordingPolicy):
+    """Policy keeping a periodic record when a variable has moved from its last kept value.
+
+    Only the numerical variables are watched, the time aside.
+
+    Inputs
+    ------
+    atol: float or dictionary,
+        absolute tolerance on all the variables, or on each of the given variables
+    rtol: float,
+        relative tolerance on the variables
+    """
+
+    def __init__(self, atol, rtol=0.0):
+        self.atol = atol
+        self.rtol = rtol
+        self.tolerances = []
+        self.last = None
+
+    def bind(self, names):
+        if isinstance(self.atol, dict):
+            atol = self.atol
+        else:
+            atol = dict.fromkeys((name for name in names if name != "time"), self.atol)
+        unknown = set(atol) - set(names)
+        if unknown:
+            raise ValueError(f"Variables {sorted(unknown)} are not recorded")
+        self.tolerances = [(names.index(name), tol) for name, tol in atol.items()]
+        self.last = None
+
+    def keep(self, time, values):
+        for i, atol in self.tolerances:
+            value, last = values[i], self.last[i]
+            try:
+                moved = np.any(np.abs(value - last) > atol + self.rtol * np.abs(last))
+            except TypeError:
+                moved = False
+            if moved:
+                return True
+        return False
+
+    def kept(self, time, values):
+        self.last = [np.copy(value) if isinstance(value, np.ndarray) else value for value in values]
+
+
+class SamplingRates(RecordingPolicy):
+    """Policy keeping a periodic record when one of the variables is due, at its own period.
+
+    Each variable is due on a grid of its period from the start of the session, the kept
+    records holding all the variables.
+
+    Inputs
+    ------
+    periods [s]: dictionary,
+        sampling period of each of the given variables
+    """
+
+    def __init__(self, periods):
+        self.periods = dict(periods)
+        self.due = {}
+
+    def bind(self, names):
+        unknown = set(self.periods) - set(names)
+        if unknown:
+            raise ValueError(f"Variables {sorted(unknown)} are not recorded")
+        if "time" not in names:
+            raise ValueError("Sampling rates need the time to be recorded")
+        self.due = {}
+
+    def keep(self, time, values):
+        keep = False
+        for name, period in self.periods.items():
+            due = self.due[name]
+            if time >= due - 1e-9 * period:
+                self.due[name] = due + period * (np.floor((time - due) / period + 1e-9) + 1)
+                keep = True
+        return keep
+
+    def kept(self, time, values):
+        if not self.due:
+            self.due = {name: time + period for name, period in self.periods.items()}
@@ -1,55 +1,25 @@
-from cosapp.drivers import NonLinearSolver, RungeKutta
-from cosapp.recorders import DataFrameRecorder
+from rocket_twin.utils.sequence_plan import SequencePlan
 
 
-def run_sequences(sys, sequences, includes):
+def run_sequences(sys, sequences, includes, adaptive=False):
     """Run the command sequences over a system.
 
+    The sequences are compiled into a `SequencePlan`, which should be kept instead to run
+    them several times.
+
     Inputs
     ------
     sys: System,
         the system over which the commands are applied
     sequences: dictionary,
         the commands to be applied
-    """
-    rk = sys.add_driver(RungeKutta("rk"))
-    rk.add_recorder(DataFrameRecorder(includes=includes, hold=True))
-
-    for seq in sequences:
-        print("sequence ", seq["name"])
-
-        if seq["type"] == "transient":
-            sys.drivers.clear()
-            rk.children.clear()
-
-            sys.add_driver(rk)
-            run = rk.add_driver(NonLinearSolver("nls", tol=1e-6))
-            rk.time_interval = (rk.time, rk.time + 10000)
-
-            if "dt" in seq:
-                rk.dt = seq["dt"]
+    adaptive: boolean,
+        whether the transients use an adaptive time step, the tolerances and bounds of the
+        step being set by the "rtol", "atol", "dt_min" and "dt_max" keys of the sequences
 
-            if "stop" in seq:
-                rk.set_scenario(stop=seq["stop"])
-
-        if seq["type"] == "static":
-            sys.drivers.clear()
-            run = sys.add_driver(NonLinearSolver("nls", tol=1e-6))
-
-        if "init" in seq:
-            for key, val in seq["init"].items():
-                sys[key] = val
-        if "unknown" in seq:
-            for uk in seq["unknown"]:
-                run.add_unknown(uk, max_rel_step=0.9)
-        if "equation" in seq:
-            for eq in seq["equation"]:
-                run.add_equation(eq)
-        if "target" in seq:
-            for var, tar in seq["target"].items():
-                sys[var] = tar
-        if "design_method" in seq:
-            for dm in seq["design_method"]:
-                run.runner.design.extend(sys.design_methods[dm])
-
-        sys.run_drivers()
+    Outputs
+    ------
+    rk: Driver,
+        the time driver of the transients, whose recorder holds their results
+    """
+    return SequencePlan(sys, sequences, includes, adaptive=adaptive).run()
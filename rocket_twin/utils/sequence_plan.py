@@ -0,0 +1,229 @@
+import json
+import os
+import time
+
+import pandas as pd
+from cosapp.core.eval_str import EvalString
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from cosapp.multimode.zeroCrossing import ZeroCrossing
+
+from rocket_twin.utils.array_recorder import ArrayRecorder
+from rocket_twin.utils.dormand_prince import DormandPrince
+from rocket_twin.utils.lazy_solver import LazySolver
+
+#: Keys of a command sequence
+KEYS = (
+    "name",
+    "type",
+    "init",
+    "unknown",
+    "equation",
+    "target",
+    "design_method",
+    "dt",
+    "stop",
+    "rtol",
+    "atol",
+    "dt_min",
+    "dt_max",
+)
+
+#: Options of the time driver, kept from one transient to the next until they are given again
+OPTIONS = ("dt", "rtol", "atol", "dt_min", "dt_max")
+
+
+def read_sequences(path):
+    """Read command sequences from a JSON or YAML file.
+
+    Inputs
+    ------
+    path: string,
+        path of the file, read as YAML if its extension is ".yaml" or ".yml"
+
+    Outputs
+    ------
+    sequences: list[dictionary],
+        the commands of the file
+    """
+    with open(path) as file:
+        if str(path).endswith((".yaml", ".yml")):
+            import yaml
+
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+class SequencePlan:
+    """Command sequences compiled once for a system, and run any number of times.
+
+    The sequences are checked when the plan is built: the variables they set are resolved
+    into references of their ports, their stop conditions are parsed, and the drivers of
+    all the sequences are created and configured. A run then only sets the values and
+    switches the drivers, the time driver and its recorder being shared by the transients.
+    The options of the time driver and the stop condition of a transient are those of the
+    previous one, unless it gives its own. The wall time and the number of steps of each
+    sequence are kept in `statistics`.
+
+    Inputs
+    ------
+    sys: System,
+        the system over which the commands are applied
+    sequences: list[dictionary] or string,
+        the commands to be applied, or the JSON or YAML file holding them
+    includes: list[string],
+        variables or patterns recorded during the transients
+    adaptive: boolean,
+        whether the transients use an adaptive time step, the tolerances and bounds of the
+        step being set by the "rtol", "atol", "dt_min" and "dt_max" keys of the sequences
+
+    Outputs
+    ------
+    rk: Driver,
+        the time driver of the transients, whose recorder holds the results of the last run
+    """
+
+    def __init__(self, sys, sequences, includes, adaptive=False):
+        if isinstance(sequences, (str, os.PathLike)):
+            sequences = read_sequences(sequences)
+
+        self.sys = sys
+        self.adaptive = adaptive
+        if adaptive:
+            self.rk = DormandPrince("rk")
+        else:
+            self.rk = RungeKutta("rk")
+        self.rk.record_dt = True
+        sys.drivers.clear()
+        sys.add_driver(self.rk)
+        self.rk.set_scenario()
+        self.rk.add_recorder(ArrayRecorder(includes=includes, hold=True))
+
+        options = {
+            option: getattr(self.rk, option) for option in OPTIONS if hasattr(self.rk, option)
+        }
+        stop = None
+        self.sequences = []
+        for seq in sequences:
+            unknown = set(seq) - set(KEYS)
+            if unknown:
+                raise ValueError(f"Unknown keys {sorted(unknown)} in sequence {seq.get('name')!r}")
+            if seq.get("type") not in ("static", "transient"):
+                raise ValueError(
+                    f"Sequence {seq.get('name')!r} must be of type 'static' or 'transient'"
+                )
+
+            if seq["type"] == "transient":
+                self.rk.children.clear()
+                driver = self.rk.add_driver(LazySolver("nls", tol=1e-6))
+                options.update((option, seq[option]) for option in options if option in seq)
+                if "stop" in seq:
+                    stop = self.__condition(seq["stop"], seq["name"])
+            else:
+                sys.drivers.clear()
+                driver = sys.add_driver(NonLinearSolver("nls", tol=1e-6))
+
+            for uk in seq.get("unknown", []):
+                driver.add_unknown(uk, max_rel_step=0.9)
+            for eq in seq.get("equation", []):
+                driver.add_equation(eq)
+            for dm in seq.get("design_method", []):
+                if dm not in sys.design_methods:
+                    raise ValueError(f"Unknown design method {dm!r} in sequence {seq['name']!r}")
+                driver.runner.design.extend(sys.design_methods[dm])
+
+            self.sequences.append(
+                {
+                    "name": seq["name"],
+                    "type": seq["type"],
+                    "driver": driver,
+                    "init": self.__references(seq.get("init", {}), seq["name"]),
+                    "target": self.__references(seq.get("target", {}), seq["name"]),
+                    "options": {
+                        option: value for option, value in options.items() if value is not None
+                    },
+                    "stop": stop,
+                }
+            )
+
+        sys.drivers.clear()
+        self.__statistics = []
+        self.__runs = 0
+
+    def __references(self, values, name):
+        """Resolve the variables of a sequence into the ports holding them."""
+        references = []
+        for key, value in values.items():
+            reference = self.sys.name2variable.get(key)
+            if reference is None:
+                raise ValueError(f"Unknown variable {key!r} in sequence {name!r}")
+            references.append((key, reference.mapping, reference.key, value))
+        return references
+
+    def __condition(self, stop, name):
+        """Parse the stop condition of a sequence, checking its variables."""
+        try:
+            condition = ZeroCrossing.from_comparison(stop)
+            EvalString(condition.expression, self.sys).eval()
+        except Exception as error:
+            raise ValueError(f"Invalid stop condition {stop!r} in sequence {name!r}") from error
+        return condition
+
+    @property
+    def statistics(self):
+        """Wall time and number of steps of each sequence of the runs, as a DataFrame.
+
+        The steps are the time steps of the transients, and the residue evaluations of the
+        static sequences.
+        """
+        return pd.DataFrame(
+            self.__statistics, columns=["run", "sequence", "type", "wall_time", "steps"]
+        )
+
+    def run(self, values=None):
+        """Apply the command sequences to the system.
+
+        Inputs
+        ------
+        values: dictionary,
+            values overriding those given to the same variables by the "init" keys
+
+        Outputs
+        ------
+        rk: Driver,
+            the time driver of the transients, whose recorder holds their results
+        """
+        values = {} if values is None else values
+        sys, rk = self.sys, self.rk
+        rk.recorder.clear()
+
+        for seq in self.sequences:
+            start = time.perf_counter()
+            sys.drivers.clear()
+            if seq["type"] == "transient":
+                sys.add_driver(rk)
+                rk.children.clear()
+                rk.add_driver(seq["driver"])
+                rk.time_interval = (rk.time, rk.time + 10000)
+                for option, value in seq["options"].items():
+                    setattr(rk, option, value)
+                rk.scenario.stop.trigger = seq["stop"]
+            else:
+                sys.add_driver(seq["driver"])
+
+            for name, mapping, key, value in seq["init"]:
+                mapping[key] = values.get(name, value)
+            for name, mapping, key, value in seq["target"]:
+                mapping[key] = value
+
+            sys.run_drivers()
+
+            if seq["type"] == "transient":
+                steps = rk.n_accepted if self.adaptive else len(rk.recorded_dt)
+            else:
+                steps = seq["driver"].results.fres_calls
+            self.__statistics.append(
+                (self.__runs, seq["name"], seq["type"], time.perf_counter() - start, steps)
+            )
+
+        self.__runs += 1
+        return rk
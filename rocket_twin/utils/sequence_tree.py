@@ -0,0 +1,220 @@
+import os
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import pandas as pd
+from cosapp.core.time import UniversalClock
+
+from rocket_twin.utils.sequence_plan import OPTIONS, SequencePlan, read_sequences
+from rocket_twin.utils.snapshot import restore_snapshot, take_snapshot
+
+# State of a worker process, set once by the pool initializer
+_worker = {}
+
+
+def sequence_tree(nodes):
+    """Check the nodes of a sequence tree and group them into segments.
+
+    A segment is a chain of nodes run at once, from a root or a branch point up to the next
+    branch point or to a leaf. The transients get the options of the time driver and the
+    stop condition of the previous transient of their branch, unless they give their own.
+
+    Inputs
+    ------
+    nodes: list[dictionary],
+        command sequences with a unique "name", and the name of the sequence they follow
+        as "parent", the roots having none
+
+    Outputs
+    ------
+    segments: dictionary,
+        sequences of each segment, by name of its first node
+    branches: dictionary,
+        names of the segments following each segment
+    roots: list[string],
+        names of the segments starting from the initial state of the system
+    """
+    names = [node.get("name") for node in nodes]
+    if None in names or len(set(names)) < len(names):
+        raise ValueError("The nodes of a sequence tree must have unique names")
+
+    children = {name: [] for name in names}
+    roots = []
+    for node in nodes:
+        parent = node.get("parent")
+        if parent is None:
+            roots.append(node["name"])
+        elif parent not in children:
+            raise ValueError(f"Unknown parent {parent!r} of node {node['name']!r}")
+        else:
+            children[parent].append(node["name"])
+
+    sequences = {node["name"]: {k: v for k, v in node.items() if k != "parent"} for node in nodes}
+    inherited = dict.fromkeys(roots, {})
+    segments, branches = {}, {}
+    starts = list(roots)
+    while starts:
+        start = name = starts.pop(0)
+        segment, kept = [], inherited[start]
+        while True:
+            seq = sequences[name]
+            if seq.get("type") == "transient":
+                seq = {**kept, **seq}
+                kept = {key: seq[key] for key in OPTIONS + ("stop",) if key in seq}
+            segment.append(seq)
+            if len(children[name]) != 1:
+                break
+            name = children[name][0]
+        segments[start] = segment
+        branches[start] = children[name]
+        inherited.update(dict.fromkeys(children[name], kept))
+        starts.extend(children[name])
+
+    if sum(len(segment) for segment in segments.values()) < len(nodes):
+        raise ValueError("The parents of the nodes of a sequence tree must not form a cycle")
+    return segments, branches, roots
+
+
+class TreeResults:
+    """Results of the branches of a sequence tree, by name of their leaf.
+
+    Inputs
+    ------
+    data: dictionary,
+        records of the transients of each branch, from its root to its leaf
+    snapshots: dictionary,
+        final state of the system in each branch
+    errors: dictionary,
+        message of the error of each failed branch
+
+    Outputs
+    ------
+    """
+
+    def __init__(self, data, snapshots, errors):
+        self.data = data
+        self.snapshots = snapshots
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.data) + len(self.errors)
+
+    def __getitem__(self, leaf):
+        return self.data[leaf]
+
+
+class _InlineExecutor:
+    """Executor running the tasks in the calling process, as soon as they are submitted."""
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        _worker.clear()
+
+    def submit(self, function, *args):
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+def _initialize(factory, includes, adaptive):
+    """Set the options of the segments run by a worker process."""
+    _worker.update(factory=factory, includes=includes, adaptive=adaptive)
+
+
+def _run_segment(sequences, snapshot):
+    """Run a segment from a state of the system, returning its records and final state."""
+    if "sys" not in _worker:
+        UniversalClock().reset()
+        _worker["sys"] = sys = _worker["factory"]()
+        _worker["initial"] = take_snapshot(sys)
+    sys = _worker["sys"]
+    restore_snapshot(sys, _worker["initial"] if snapshot is None else snapshot)
+
+    rk = SequencePlan(sys, sequences, _worker["includes"], adaptive=_worker["adaptive"]).run()
+    return rk.recorder.export_data(), take_snapshot(sys)
+
+
+def run_tree(factory, nodes, includes, adaptive=False, processes=None):
+    """Run a tree of command sequences, each branch from the state where it starts.
+
+    The segments shared by several branches are run once, and the state of the system is
+    captured at their end, each following segment starting from it. The segments are run
+    on a pool of processes as soon as the one they follow is over, so that the sibling
+    branches run concurrently. Each worker builds its own system once.
+
+    Inputs
+    ------
+    factory: callable,
+        picklable function building the system, such as a partial of its class
+    nodes: list[dictionary] or string,
+        command sequences of `SequencePlan` with the name of the sequence they follow as
+        "parent", or the JSON or YAML file holding them
+    includes: list[string],
+        variables or patterns recorded during the transients
+    adaptive: boolean,
+        whether the transients use an adaptive time step
+    processes: int,
+        number of worker processes, the segments being run in this process if 1
+
+    Outputs
+    ------
+    results: TreeResults,
+        records and final state of each branch, by name of its leaf
+    """
+    if isinstance(nodes, (str, os.PathLike)):
+        nodes = read_sequences(nodes)
+    segments, branches, roots = sequence_tree(nodes)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(segments)))
+
+    initargs = (factory, includes, adaptive)
+    if processes == 1:
+        executor = _InlineExecutor(_initialize, initargs)
+    else:
+        executor = ProcessPoolExecutor(processes, initializer=_initialize, initargs=initargs)
+
+    records, snapshots, errors = {}, {}, {}
+    parents = {branch: start for start in segments for branch in branches[start]}
+    with executor:
+        pending = {executor.submit(_run_segment, segments[root], None): root for root in roots}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                try:
+                    records[start], snapshots[start] = future.result()
+                except Exception as error:
+                    errors[start] = f"{type(error).__name__}: {error}"
+                    continue
+                for branch in branches[start]:
+                    pending[
+                        executor.submit(_run_segment, segments[branch], snapshots[start])
+                    ] = branch
+
+    data, states, failures = {}, {}, {}
+    for start, segment in segments.items():
+        if branches[start]:
+            continue
+        leaf, path = segment[-1]["name"], [start]
+        while path[-1] in parents:
+            path.append(parents[path[-1]])
+        failed = [name for name in path if name in errors]
+        if failed:
+            failures[leaf] = errors[failed[0]]
+        else:
+            data[leaf] = pd.concat([records[name] for name in reversed(path)], ignore_index=True)
+            states[leaf] = snapshots[start]
+
+    results = TreeResults(data, states, failures)
+    if results.errors:
+        warnings.warn(f"{len(results.errors)} of the {len(results)} branches failed")
+    return results
@@ -0,0 +1,95 @@
+from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Fuse
+from OCC.Core.TopTools import TopTools_ListOfShape
+
+
+class LazyShape:
+    """Pyoccad model built on first access.
+
+    Inputs
+    ------
+    builder: callable,
+        function returning the pyoccad model
+    args: tuple,
+        arguments of the builder
+
+    Outputs
+    ------
+    shape: TopoDS_Shape,
+        pyoccad model, built once and then reused
+    """
+
+    def __init__(self, builder, *args):
+        self._builder = builder
+        self._args = args
+        self._shape = None
+
+    @property
+    def built(self):
+        """Whether the model has already been built."""
+        return self._shape is not None
+
+    @property
+    def shape(self):
+        """Pyoccad model, built on first call."""
+        if self._shape is None:
+            self._shape = self._builder(*self._args)
+            self._builder = None
+            self._args = None
+        return self._shape
+
+    def __copy__(self):
+        # The model is immutable once built: copies share the same build.
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def resolve_shape(shape):
+    """Return the pyoccad model behind a shape that may be lazy.
+
+    Inputs
+    ------
+    shape: TopoDS_Shape or LazyShape,
+        model or deferred model
+
+    Outputs
+    ------
+    shape: TopoDS_Shape,
+        pyoccad model
+    """
+    if isinstance(shape, LazyShape):
+        return shape.shape
+    return shape
+
+
+def fuse_shapes(shapes):
+    """Fuse pyoccad models in a single boolean operation run in parallel.
+
+    Inputs
+    ------
+    shapes: list[TopoDS_Shape or LazyShape],
+        models to be fused
+
+    Outputs
+    ------
+    fusion: TopoDS_Shape,
+        fusion of all models
+    """
+    shapes = [resolve_shape(shape) for shape in shapes]
+    if len(shapes) == 1:
+        return shapes[0]
+
+    arguments = TopTools_ListOfShape()
+    arguments.Append(shapes[0])
+    tools = TopTools_ListOfShape()
+    for shape in shapes[1:]:
+        tools.Append(shape)
+
+    fusion = BRepAlgoAPI_Fuse()
+    fusion.SetArguments(arguments)
+    fusion.SetTools(tools)
+    fusion.SetRunParallel(True)
+    fusion.Build()
+
+    return fusion.Shape()
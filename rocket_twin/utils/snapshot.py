@@ -0,0 +1,194 @@
+import copy
+import numbers
+
+import numpy as np
+from cosapp.core.time import UniversalClock
+from cosapp.multimode.event import ZeroCrossingEvent
+from cosapp.multimode.zeroCrossing import EventDirection, ZeroCrossing
+from cosapp.ports.port import BasePort
+from OCC.Core.TopoDS import TopoDS_Shape
+
+from rocket_twin.utils.mass_properties import MassProperties
+from rocket_twin.utils.shapes import LazyShape
+
+#: Private attributes of the cosapp events, and of their zero-crossing states, held by the
+#: snapshots as of cosapp 0.15
+EVENT_ATTRIBUTES = ("_state", "_present")
+ZEROXING_ATTRIBUTES = ("_prev", "_curr", "_locked")
+
+#: Types of the values shared between a system and its snapshots instead of being copied
+SHARED = (numbers.Number, str, bytes, type(None), MassProperties, LazyShape, TopoDS_Shape)
+
+
+def _check_event(event):
+    """Check that an event holds the private state captured by the snapshots."""
+    missing = [name for name in EVENT_ATTRIBUTES if not hasattr(event, name)]
+    if not missing and isinstance(event._state, ZeroCrossingEvent):
+        missing = [
+            f"_state.{name}" for name in ZEROXING_ATTRIBUTES if not hasattr(event._state, name)
+        ]
+    if missing:
+        raise TypeError(
+            f"Event {event.full_name()!r} has no attribute {', '.join(missing)}, "
+            "the installed cosapp version is not supported"
+        )
+
+
+def _copy(value):
+    """Copy a variable value, the immutable ones being shared."""
+    if isinstance(value, SHARED):
+        return value
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class Snapshot:
+    """State of a system tree at a given time.
+
+    The values of all the port variables are captured, with the state of the events and
+    the structure of the tree as described by its owner. The geometry models and the mass
+    properties are immutable, and shared with the system instead of being copied. Snapshots
+    may be pickled to be restored in another process, the geometry models that are not
+    built yet being left out.
+
+    Inputs
+    ------
+    time [s]: float,
+        time of the state
+    values: dictionary,
+        values of the variables, by path of their system, port name and variable name
+    events: dictionary,
+        trigger, presence and zero-crossing state of the events, by path
+    structure: dictionary,
+        description of the structural changes of the tree, as given by its owner
+
+    Outputs
+    ------
+    """
+
+    def __init__(self, time, values, events, structure=None):
+        self.time = time
+        self.values = values
+        self.events = events
+        self.structure = {} if structure is None else structure
+
+    @classmethod
+    def capture(cls, system, **structure):
+        """Capture the current state of a system tree.
+
+        Inputs
+        ------
+        system: System,
+            head of the system tree
+        structure: dictionary,
+            description of the structural changes of the tree
+
+        Outputs
+        ------
+        snapshot: Snapshot,
+            state of the system tree
+        """
+        values = {}
+        for child in system.tree():
+            path = child.full_name(trim_root=True)
+            for port in child.ports():
+                for name, value in port.items():
+                    values[path, port.name, name] = _copy(value)
+
+        events = {}
+        for event in system.all_events():
+            _check_event(event)
+            state = event._state
+            if isinstance(state, ZeroCrossingEvent):
+                zeroxing = (state._prev, state._curr, state._locked)
+            else:
+                zeroxing = None
+            trigger = event.trigger
+            if isinstance(trigger, ZeroCrossing):
+                trigger = (trigger.expression, trigger.direction.name)
+            else:
+                # Other triggers are built along with the system
+                trigger = None
+            events[event.full_name(trim_root=True)] = (trigger, event.present, zeroxing)
+
+        return cls(system.time, values, events, structure)
+
+    def __getstate__(self):
+        # Models not built yet hold their system, and are rebuilt by it on its next evaluation
+        state = self.__dict__.copy()
+        state["values"] = {
+            key: None if isinstance(value, LazyShape) and not value.built else value
+            for key, value in self.values.items()
+        }
+        return state
+
+    def apply(self, system):
+        """Set a system tree of the same structure to the captured state, and the clock to
+        the time of the snapshot.
+
+        Inputs
+        ------
+        system: System,
+            head of the system tree
+        """
+        systems = {child.full_name(trim_root=True): child for child in system.tree()}
+        # The values were those of the variables, whose types are checked by their transfers
+        BasePort.set_type_checking(False)
+        try:
+            for (path, port, name), value in self.values.items():
+                systems[path][port][name] = _copy(value)
+        finally:
+            BasePort.set_type_checking(True)
+        for child in systems.values():
+            child.touch()
+
+        events = {event.full_name(trim_root=True): event for event in system.all_events()}
+        for name, (trigger, present, zeroxing) in self.events.items():
+            event = events[name]
+            _check_event(event)
+            current = event.trigger
+            if trigger is not None and (
+                not isinstance(current, ZeroCrossing)
+                or (current.expression, current.direction.name) != trigger
+            ):
+                event.trigger = ZeroCrossing(trigger[0], EventDirection[trigger[1]])
+            event._present = present
+            if zeroxing is not None:
+                event._state._prev, event._state._curr, event._state._locked = zeroxing
+
+        UniversalClock().reset(self.time)
+
+
+def take_snapshot(system):
+    """Capture the state of a system, with its structure if it describes it.
+
+    Inputs
+    ------
+    system: System,
+        head of the system tree, such as a station
+
+    Outputs
+    ------
+    snapshot: Snapshot,
+        state of the system tree
+    """
+    if hasattr(system, "snapshot"):
+        return system.snapshot()
+    return Snapshot.capture(system)
+
+
+def restore_snapshot(system, snapshot):
+    """Set a system back to a captured state, with its structure if it describes it.
+
+    Inputs
+    ------
+    system: System,
+        head of the system tree, such as a station
+    snapshot: Snapshot,
+        state of the system tree
+    """
+    if hasattr(system, "restore"):
+        system.restore(snapshot)
+    else:
+        snapshot.apply(system)
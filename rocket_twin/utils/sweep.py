@@ -0,0 +1,394 @@
+import argparse
+import functools
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import warnings
+from multiprocessing.shared_memory import SharedMemory
+from numbers import Real
+
+import numpy as np
+import pandas as pd
+from cosapp.core.time import UniversalClock
+from cosapp.recorders import DataFrameRecorder
+
+from rocket_twin.utils.sequence_plan import SequencePlan, read_sequences
+from rocket_twin.utils.snapshot import restore_snapshot, take_snapshot
+
+# State of a worker process, set once by the pool initializer
+_worker = {}
+
+
+def parameter_grid(axes):
+    """Build the sample table of the full factorial grid of some parameters.
+
+    Inputs
+    ------
+    axes: dictionary,
+        values taken by each parameter
+
+    Outputs
+    ------
+    table: dictionary,
+        value of each parameter for every combination, the last parameter varying fastest
+    """
+    names = list(axes)
+    combinations = list(itertools.product(*(axes[name] for name in names)))
+    return {name: np.array([values[i] for values in combinations]) for i, name in enumerate(names)}
+
+
+def sample_table(table):
+    """Check a sample table and convert its columns to arrays.
+
+    Inputs
+    ------
+    table: dictionary or DataFrame,
+        value of each parameter for every run
+
+    Outputs
+    ------
+    table: dictionary,
+        value of each parameter for every run, as arrays
+    """
+    table = {name: np.asarray(values) for name, values in dict(table).items()}
+    lengths = {len(values) for values in table.values()}
+    if len(lengths) > 1:
+        raise ValueError("All the parameters of the sample table must have the same length")
+    return table
+
+
+class SweepResults:
+    """Recorded variables of the runs of a parameter sweep.
+
+    Inputs
+    ------
+    parameters: dictionary,
+        value of each swept parameter for every run
+    names: list[string],
+        recorded variables, time first
+    values: np.ndarray,
+        recorded values, of shape (runs, rows, variables), padded with NaN
+    lengths: np.ndarray,
+        number of rows recorded by each run, possibly above the size of the buffer
+    errors: dictionary,
+        message of the exception raised by each failed run
+
+    Outputs
+    ------
+    """
+
+    def __init__(self, parameters, names, values, lengths, errors=None):
+        self.parameters = parameters
+        self.names = list(names)
+        self.values = values
+        self.lengths = lengths
+        self.errors = {} if errors is None else dict(errors)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @property
+    def rows(self):
+        """Number of rows kept for each run."""
+        return self.values.shape[1]
+
+    @property
+    def truncated(self):
+        """Whether each run recorded more rows than kept."""
+        return self.lengths > self.rows
+
+    def data(self, run):
+        """Return the recorded variables of a run.
+
+        Inputs
+        ------
+        run: int,
+            index of the run
+
+        Outputs
+        ------
+        data: DataFrame,
+            recorded variables of the run
+        """
+        length = min(self.lengths[run], self.rows)
+        return pd.DataFrame(self.values[run, :length], columns=self.names)
+
+    @property
+    def final(self):
+        """Last kept value of each variable, NaN for the runs without records."""
+        last = np.minimum(self.lengths, self.rows) - 1
+        values = self.values[np.arange(len(self)), np.maximum(last, 0)]
+        values[last < 0] = np.nan
+        return {name: values[:, i] for i, name in enumerate(self.names)}
+
+    def save(self, path):
+        """Write the results to a NumPy archive.
+
+        Inputs
+        ------
+        path: string,
+            path of the archive
+        """
+        np.savez(
+            path,
+            names=np.array(self.names),
+            values=self.values,
+            lengths=self.lengths,
+            parameter_names=np.array(list(self.parameters)),
+            parameter_values=np.array([values for values in self.parameters.values()]),
+            error_runs=np.array(list(self.errors), dtype=int),
+            error_messages=np.array(list(self.errors.values()), dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read results written by `save`.
+
+        Inputs
+        ------
+        path: string,
+            path of the archive
+
+        Outputs
+        ------
+        results: SweepResults,
+            the results of the sweep
+        """
+        with np.load(path) as archive:
+            parameters = dict(zip(archive["parameter_names"], archive["parameter_values"]))
+            errors = dict(zip(archive["error_runs"].tolist(), archive["error_messages"].tolist()))
+            return cls(
+                parameters, archive["names"].tolist(), archive["values"], archive["lengths"], errors
+            )
+
+
+def recorded_names(sys, includes):
+    """Return the scalar variables of a system matching recorder patterns.
+
+    Inputs
+    ------
+    sys: System,
+        the recorded system
+    includes: list[string],
+        variables or patterns recorded
+
+    Outputs
+    ------
+    names: list[string],
+        recorded variables with a scalar numerical value, time first
+    """
+    recorder = DataFrameRecorder(includes=includes)
+    recorder.watched_object = sys
+    names = [
+        name
+        for name in recorder.field_names()
+        if name != "time" and isinstance(sys[name], Real) and np.ndim(sys[name]) == 0
+    ]
+    return ["time"] + names
+
+
+def _buffers(shm, runs, rows, columns):
+    """Views of the row counts and recorded values held by a shared-memory block."""
+    lengths = np.ndarray((runs,), dtype=np.int64, buffer=shm.buf)
+    values = np.ndarray((runs, rows, columns), dtype=float, buffer=shm.buf, offset=lengths.nbytes)
+    return lengths, values
+
+
+def _initialize(factory, sequences, parameters, names, includes, adaptive, shm_name, rows):
+    """Attach a worker process to the shared results of a sweep."""
+    shm = SharedMemory(name=shm_name)
+    runs = len(next(iter(parameters.values()), ()))
+    lengths, values = _buffers(shm, runs, rows, len(names))
+    _worker.update(
+        factory=factory,
+        sequences=sequences,
+        parameters=parameters,
+        names=names,
+        includes=includes,
+        adaptive=adaptive,
+        shm=shm,
+        lengths=lengths,
+        values=values,
+    )
+
+
+def _run(run):
+    """Run the mission of a sample and write its records in the shared buffers."""
+    overrides = {
+        name: value.item() if isinstance(value, np.generic) else value
+        for name, value in ((name, values[run]) for name, values in _worker["parameters"].items())
+    }
+
+    # The clock is shared by the successive runs of a worker
+    UniversalClock().reset()
+    if "plan" not in _worker:
+        sys = _worker["factory"]()
+        _worker["initial"] = take_snapshot(sys)
+        _worker["plan"] = SequencePlan(
+            sys, _worker["sequences"], _worker["includes"], adaptive=_worker["adaptive"]
+        )
+    plan = _worker["plan"]
+    sys = plan.sys
+    restore_snapshot(sys, _worker["initial"])
+    for name, value in overrides.items():
+        sys[name] = value
+
+    rk = plan.run(overrides)
+
+    data = rk.recorder.export_data()
+    values = _worker["values"][run]
+    length = min(len(data), len(values))
+    for i, name in enumerate(_worker["names"]):
+        if name in data:
+            values[:length, i] = np.asarray(data[name], dtype=float)[:length]
+    _worker["lengths"][run] = len(data)
+
+
+def _run_chunk(chunk):
+    """Run the samples of a chunk, returning the messages of the failed runs."""
+    errors = []
+    for run in chunk:
+        try:
+            _run(run)
+        except Exception as error:
+            errors.append((run, f"{type(error).__name__}: {error}"))
+    return errors
+
+
+def sweep(
+    factory,
+    sequences,
+    parameters,
+    includes,
+    adaptive=False,
+    processes=None,
+    chunksize=None,
+    rows=1000,
+):
+    """Run the command sequences over a system for every sample of a parameter table.
+
+    The runs are spread over a pool of processes by chunks of samples, each one starting at
+    time 0. Each worker builds its own system and compiles the sequences once, the system
+    being set back to its initial state before each run, and writes the recorded variables
+    in a shared-memory buffer, so that only the messages of the failed runs are sent back.
+
+    Inputs
+    ------
+    factory: callable,
+        picklable function building the system, such as a partial of its class
+    sequences: list[dictionary],
+        the commands applied by a `SequencePlan`
+    parameters: dictionary or DataFrame,
+        value of each parameter for every run, set before the sequences and overriding their
+        "init" values
+    includes: list[string],
+        variables or patterns recorded during the transients, only scalar numbers being kept
+    adaptive: boolean,
+        whether the transients use an adaptive time step
+    processes: int,
+        number of worker processes, the runs staying in this process if 1
+    chunksize: int,
+        number of runs sent at once to a worker, four chunks per process by default
+    rows: int,
+        number of rows kept for each run
+
+    Outputs
+    ------
+    results: SweepResults,
+        the recorded variables of every run
+    """
+    parameters = sample_table(parameters)
+    runs = len(next(iter(parameters.values()), ()))
+    names = recorded_names(factory(), includes)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, runs))
+    if chunksize is None:
+        chunksize = max(1, math.ceil(runs / (4 * processes)))
+
+    size = 8 * runs * (1 + rows * len(names))
+    shm = SharedMemory(create=True, size=max(size, 1))
+    try:
+        lengths, values = _buffers(shm, runs, rows, len(names))
+        lengths[:] = 0
+        values[:] = np.nan
+
+        initargs = (factory, sequences, parameters, names, includes, adaptive, shm.name, rows)
+        chunks = [range(i, min(i + chunksize, runs)) for i in range(0, runs, chunksize)]
+        errors = []
+        if processes == 1:
+            _initialize(*initargs)
+            try:
+                for chunk in chunks:
+                    errors.extend(_run_chunk(chunk))
+            finally:
+                _worker.pop("shm").close()
+                _worker.clear()
+        else:
+            with multiprocessing.Pool(processes, _initialize, initargs) as pool:
+                for chunk_errors in pool.imap_unordered(_run_chunk, chunks):
+                    errors.extend(chunk_errors)
+
+        results = SweepResults(parameters, names, values.copy(), lengths.copy(), sorted(errors))
+        del lengths, values
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if results.errors:
+        warnings.warn(f"{len(results.errors)} of the {runs} runs failed")
+    if results.truncated.any():
+        warnings.warn(f"{results.truncated.sum()} runs recorded more than {rows} rows")
+    return results
+
+
+def main(args=None):
+    """Command-line entry point of the sweeps of a station mission."""
+    parser = argparse.ArgumentParser(
+        description="Run a station mission for every sample of a parameter table."
+    )
+    parser.add_argument("mission", help="JSON or YAML file of the command sequences")
+    parser.add_argument(
+        "parameters",
+        help="CSV sample table, one column per parameter, or JSON grid of parameter values",
+    )
+    parser.add_argument("-i", "--includes", nargs="+", required=True, help="recorded variables")
+    parser.add_argument("-o", "--output", default="sweep.npz", help="NumPy archive of results")
+    parser.add_argument("--stages", type=int, default=1, help="number of rocket stages")
+    parser.add_argument(
+        "--environment", action="store_true", help="altitude-dependent gravity and pressure"
+    )
+    parser.add_argument("--adaptive", action="store_true", help="adaptive time step")
+    parser.add_argument("--processes", type=int, help="number of worker processes")
+    parser.add_argument("--chunksize", type=int, help="number of runs sent at once to a worker")
+    parser.add_argument("--rows", type=int, default=1000, help="number of rows kept per run")
+    args = parser.parse_args(args)
+
+    from rocket_twin.systems import Station
+
+    sequences = read_sequences(args.mission)
+    if args.parameters.endswith(".json"):
+        with open(args.parameters) as file:
+            parameters = parameter_grid(json.load(file))
+    else:
+        parameters = pd.read_csv(args.parameters)
+
+    factory = functools.partial(Station, "sys", n_stages=args.stages, environment=args.environment)
+    results = sweep(
+        factory,
+        sequences,
+        parameters,
+        args.includes,
+        adaptive=args.adaptive,
+        processes=args.processes,
+        chunksize=args.chunksize,
+        rows=args.rows,
+    )
+    results.save(args.output)
+    print(f"{len(results) - len(results.errors)} of {len(results)} runs written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+import json
+import struct
+from collections import OrderedDict
+
+import numpy as np
+from OCC.Core.BRep import BRep_Tool
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopoDS import topods
+
+from rocket_twin.utils.geometry_cache import model_key
+from rocket_twin.utils.shapes import resolve_shape
+
+# glTF constants
+GLB_MAGIC = 0x46546C67
+GLB_JSON = 0x4E4F534A
+GLB_BIN = 0x004E4942
+GL_FLOAT = 5126
+GL_UNSIGNED_INT = 5125
+GL_ARRAY_BUFFER = 34962
+GL_ELEMENT_ARRAY_BUFFER = 34963
+GL_TRIANGLES = 4
+
+# Rotation bringing the rocket axis (z) onto the glTF up axis (y)
+Z_UP_TO_Y_UP = [-np.sqrt(0.5), 0.0, 0.0, np.sqrt(0.5)]
+
+
+class Mesh:
+    """Triangle mesh of a pyoccad model.
+
+    Inputs
+    ------
+    vertices [m]: numpy.ndarray,
+        vertex coordinates, of shape (n, 3)
+    triangles: numpy.ndarray,
+        vertex indices of each triangle, of shape (m, 3)
+    """
+
+    __slots__ = ("vertices", "triangles")
+
+    def __init__(self, vertices, triangles):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.triangles = np.ascontiguousarray(triangles, dtype=np.uint32).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.triangles)
+
+    @property
+    def nbytes(self):
+        """Memory footprint of the mesh buffers."""
+        return self.vertices.nbytes + self.triangles.nbytes
+
+
+def tessellate(shape, deflection=0.01, angle=0.5):
+    """Triangulate a pyoccad model.
+
+    Inputs
+    ------
+    shape: TopoDS_Shape or LazyShape,
+        pyoccad model
+    deflection [m]: float,
+        maximum distance between the mesh and the surfaces
+    angle [rad]: float,
+        maximum angle between two adjacent triangles
+
+    Outputs
+    ------
+    mesh: Mesh,
+        triangle mesh of the model
+    """
+    shape = resolve_shape(shape)
+    BRepMesh_IncrementalMesh(shape, deflection, False, angle, True)
+
+    vertices = []
+    triangles = []
+    offset = 0
+
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        face = topods.Face(explorer.Current())
+        explorer.Next()
+
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation(face, location)
+        if triangulation is None:
+            continue
+
+        trsf = location.Transformation()
+        nodes = [
+            triangulation.Node(i).Transformed(trsf).Coord()
+            for i in range(1, triangulation.NbNodes() + 1)
+        ]
+        indices = np.array(
+            [triangulation.Triangle(i).Get() for i in range(1, triangulation.NbTriangles() + 1)],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        if face.Orientation() == TopAbs_REVERSED:
+            indices = indices[:, ::-1]
+
+        vertices.append(np.array(nodes, dtype=float).reshape(-1, 3))
+        triangles.append(indices - 1 + offset)
+        offset += len(nodes)
+
+    if not vertices:
+        return Mesh(np.empty((0, 3)), np.empty((0, 3)))
+    return Mesh(np.concatenate(vertices), np.concatenate(triangles))
+
+
+class TessellationCache:
+    """LRU cache of the triangle meshes of pyoccad models.
+
+    Models built by the geometry caches are keyed on the inputs of their component, so that
+    a model rebuilt from the same inputs, in another system, is only meshed once. Other
+    models are keyed on their identity.
+
+    Inputs
+    ------
+    deflection [m]: float,
+        default maximum distance between the meshes and the surfaces
+    angle [rad]: float,
+        default maximum angle between two adjacent triangles
+    max_size [B]: int,
+        memory budget of the mesh buffers
+
+    Outputs
+    ------
+    hits: int,
+        number of meshes found in the cache
+    misses: int,
+        number of meshes computed
+    """
+
+    def __init__(self, deflection=0.01, angle=0.5, max_size=64 * 2**20):
+        self.deflection = deflection
+        self.angle = angle
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, shape, deflection=None, angle=None):
+        """Return the mesh of a model, triangulating it if needed.
+
+        Inputs
+        ------
+        shape: TopoDS_Shape or LazyShape,
+            pyoccad model
+        deflection [m]: float,
+            maximum distance between the mesh and the surfaces, default of the cache if None
+        angle [rad]: float,
+            maximum angle between two adjacent triangles, default of the cache if None
+
+        Outputs
+        ------
+        mesh: Mesh,
+            triangle mesh of the model
+        """
+        deflection = self.deflection if deflection is None else deflection
+        angle = self.angle if angle is None else angle
+        shape = resolve_shape(shape)
+
+        model = model_key(shape)
+        key = (model or id(shape), deflection, angle)
+        try:
+            _, mesh = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return mesh
+
+        mesh = tessellate(shape, deflection, angle)
+        # Entries keyed on identity hold their model, so that the identity is not reused
+        self._entries[key] = (None if model else shape, mesh)
+        self.size += mesh.nbytes
+        while self.size > self.max_size and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted.nbytes
+
+        return mesh
+
+    def clear(self):
+        """Remove all meshes and reset the statistics."""
+        self._entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+tessellation_cache = TessellationCache()
+
+
+def to_glb(meshes):
+    """Pack triangle meshes into a binary glTF (GLB) file content.
+
+    Inputs
+    ------
+    meshes: dict[str, Mesh],
+        meshes by name, each one becoming a node of the scene
+
+    Outputs
+    ------
+    glb: bytes,
+        binary glTF content
+    """
+    buffer = bytearray()
+    views, accessors, nodes, gltf_meshes = [], [], [], []
+
+    def add_view(array, target):
+        views.append(
+            {
+                "buffer": 0,
+                "byteOffset": len(buffer),
+                "byteLength": array.nbytes,
+                "target": target,
+            }
+        )
+        buffer.extend(array.tobytes())
+        buffer.extend(b"\x00" * (-len(buffer) % 4))
+        return len(views) - 1
+
+    for name, mesh in meshes.items():
+        if len(mesh) == 0:
+            continue
+
+        position = len(accessors)
+        accessors.append(
+            {
+                "bufferView": add_view(mesh.vertices, GL_ARRAY_BUFFER),
+                "componentType": GL_FLOAT,
+                "count": len(mesh.vertices),
+                "type": "VEC3",
+                "min": mesh.vertices.min(axis=0).tolist(),
+                "max": mesh.vertices.max(axis=0).tolist(),
+            }
+        )
+        accessors.append(
+            {
+                "bufferView": add_view(mesh.triangles, GL_ELEMENT_ARRAY_BUFFER),
+                "componentType": GL_UNSIGNED_INT,
+                "count": mesh.triangles.size,
+                "type": "SCALAR",
+            }
+        )
+        gltf_meshes.append(
+            {
+                "name": name,
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": position},
+                        "indices": position + 1,
+                        "mode": GL_TRIANGLES,
+                    }
+                ],
+            }
+        )
+        nodes.append({"name": name, "mesh": len(gltf_meshes) - 1, "rotation": Z_UP_TO_Y_UP})
+
+    content = {
+        "asset": {"version": "2.0", "generator": "rocket_twin"},
+        "scene": 0,
+        "scenes": [{"nodes": list(range(len(nodes)))}],
+        "nodes": nodes,
+        "meshes": gltf_meshes,
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(buffer)}],
+    }
+    header = json.dumps(content, separators=(",", ":")).encode()
+    header += b" " * (-len(header) % 4)
+
+    length = 12 + 8 + len(header) + 8 + len(buffer)
+    return b"".join(
+        [
+            struct.pack("<III", GLB_MAGIC, 2, length),
+            struct.pack("<II", len(header), GLB_JSON),
+            header,
+            struct.pack("<II", len(buffer), GLB_BIN),
+            bytes(buffer),
+        ]
+    )
+
+
+def export_meshes(path, meshes):
+    """Write triangle meshes to a binary file.
+
+    The format is chosen from the extension of the path: `.glb` for binary glTF, loadable by
+    web viewers, or `.npz` for NumPy arrays named `<name>/vertices` and `<name>/triangles`.
+
+    Inputs
+    ------
+    path: str,
+        path of the file
+    meshes: dict[str, Mesh],
+        meshes by name
+    """
+    path = str(path)
+    if path.endswith(".glb"):
+        with open(path, "wb") as file:
+            file.write(to_glb(meshes))
+    elif path.endswith(".npz"):
+        arrays = {}
+        for name, mesh in meshes.items():
+            arrays[f"{name}/vertices"] = mesh.vertices
+            arrays[f"{name}/triangles"] = mesh.triangles
+        np.savez(path, **arrays)
+    else:
+        raise ValueError(f"Unknown mesh format for {path!r}, expected '.glb' or '.npz'")
+
+
+def mesh_system(system, deflection=None, angle=None, cache=None):
+    """Mesh the models of a system and of all its children.
+
+    Inputs
+    ------
+    system: System,
+        system whose `shape` variables are meshed, recursively
+    deflection [m]: float,
+        maximum distance between the meshes and the surfaces, default of the cache if None
+    angle [rad]: float,
+        maximum angle between two adjacent triangles, default of the cache if None
+    cache: TessellationCache,
+        cache of the meshes, the shared one if None
+
+    Outputs
+    ------
+    meshes: dict[str, Mesh],
+        meshes by path of the owner system
+    """
+    cache = tessellation_cache if cache is None else cache
+    meshes = {}
+
+    def visit(sys, path):
+        if "shape" in sys and sys.shape is not None:
+            meshes[path] = cache.get(sys.shape, deflection, angle)
+        for child in sys.children.values():
+            visit(child, f"{path}.{child.name}")
+
+    visit(system, system.name)
+    return meshes